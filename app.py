@@ -1,8 +1,9 @@
 import base64
+from datetime import timedelta
 from pathlib import Path
 
+import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
 
 # app.py — Allanray Teknologi Semesta • Cinema Production Command Center
 # v5: Lighter palette · Balanced 3+4 grid · Export PDF/Excel · Mobile responsive
@@ -10,14 +11,6 @@ import plotly.graph_objects as go
 # ─────────────────────────────────────────────────────────────
 # Streamlit compat helpers
 # ─────────────────────────────────────────────────────────────
-def _plotly(fig):
-    """Plotly chart width compatibility across Streamlit versions."""
-    try:
-        st.plotly_chart(fig, width="stretch")
-    except TypeError:
-        st.plotly_chart(fig, use_container_width=True)
-
-
 def _df(df, height=None):
     """Dataframe width compatibility across Streamlit versions."""
     try:
@@ -45,16 +38,20 @@ try:
 except Exception:
     st_autorefresh = None
 
-from config import BRAND, PROJECTS, EQUIP_CATEGORIES, PEOPLE_ROLES, WAREHOUSE, SITES
+from config import BRAND, PROJECTS, SITES, SCALE_FACTORS, DASHBOARD_MAX_SF
 from ui.theme import inject_theme, sidebar_toggle, header, panel_open, panel_close, alert_card
-from data.mock_data import (
-    seed_everything, make_people, make_trucks, make_inventory,
-    make_fuel_tanks, make_transactions, make_alerts,
+from ui.profiling import RenderProfiler, profiling_default
+from data.kpi import status_breakdown
+from data.filter_index import project_positions
+from data.provider import (
+    get_scheduler, get_alert_engine, get_geofence_tracker, get_store, get_audit_log,
 )
 from components.sections import (
-    radial_gauge, reset_gauge_counter,
+    gauge_grid,
     rental_duration_panel,
     fuel_forecast_chart,
+    fuel_history_chart,
+    fleet_status_donut,
     colored_inventory_table,
     colored_audit_table,
     colored_tank_table,
@@ -62,6 +59,7 @@ from components.sections import (
     export_pdf_button,
 )
 from components.maps import render_street_map, render_pydeck_map
+from components.tables import paged_view, paged_query
 
 
 # ─────────────────────────────────────────────────────────────
@@ -71,6 +69,15 @@ def _b64(path: Path) -> str | None:
     return base64.b64encode(path.read_bytes()).decode() if path.exists() else None
 
 
+def _session_id() -> str | None:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
 def _sb_section(label: str):
     st.sidebar.markdown(f'<div class="sb-section-label">{label}</div>', unsafe_allow_html=True)
 
@@ -186,7 +193,7 @@ def _render_company_info():
     )
 
 
-def _render_map_detail(trucks_df, site_obj, map_engine_choice):
+def _render_map_detail(trucks_df, site_obj, map_engine_choice, geofence=None):
     st.caption("Tampilan map ukuran besar + tabel detail armada.")
     cols = ["truck_id", "status", "driver_name", "lat", "lon", "speed_kmh", "fuel_liters"]
 
@@ -209,17 +216,123 @@ def _render_map_detail(trucks_df, site_obj, map_engine_choice):
         height=260,
     )
 
+    if geofence is not None:
+        g1, g2 = st.columns(2)
+        with g1:
+            st.markdown("#### Geofence — di dalam perimeter")
+            inside = geofence.inside()
+            _df(inside.groupby("fence").size().rename("trucks").reset_index() if not inside.empty else inside)
+        with g2:
+            st.markdown("#### Geofence Events")
+            _df(geofence.events_frame(50), height=220)
+
+
+# Paged tables — kolom yang bisa dicari / difilter / di-sort (server-side)
+INV_PAGING = dict(
+    search_cols=("asset_id", "category", "serial", "project", "assigned_to", "location"),
+    sort_cols=("asset_id", "category", "status", "project", "location", "due_return"),
+)
+TX_PAGING = dict(
+    search_cols=("asset_id", "person_id", "person_name", "category", "note"),
+    sort_cols=("time", "action", "asset_id", "person_id", "project"),
+    default_sort="time", default_desc=True,
+)
+
 
-def _render_inventory_detail(inv_df, tanks_df, tx_df, alerts_df):
-    st.caption("Tabel full inventory + fuel tanks + audit log + alerts.")
+def _store_page(store, table, key, page_size, filter_cols, project, paging):
+    """paged_view versi database: filter / sort / LIMIT-OFFSET dijalankan di storage layer."""
+    proj = None if project == "ALL" else project
+    unassigned = table == "inventory"
+
+    def fetch(search, filters, sort_by, descending, limit, offset):
+        return store.page(table, filters, search, paging["search_cols"], sort_by, descending, limit, offset,
+                          project=proj, include_unassigned=unassigned)
+
+    options = {col: store.distinct(table, col) for col in filter_cols}
+    n_total = store.count(table, project=proj, include_unassigned=unassigned)     # total dalam scope project
+    return paged_query(fetch, key, options, paging["sort_cols"], n_total, page_size=page_size,
+                       default_sort=paging.get("default_sort"), default_desc=paging.get("default_desc", False))
+
+
+def _render_audit_history(audit, project="ALL"):
+    """Rentang waktu dari AuditLog — hanya partisi hari yang overlap yang dibaca."""
+    parts = audit.partitions()
+    if parts.empty:
+        st.info("Audit log kosong.")
+        return
+    first, last = pd.Timestamp(parts["day"].iloc[0]).date(), pd.Timestamp(parts["day"].iloc[-1]).date()
+    picked = st.date_input("Range", (max(first, last - timedelta(days=1)), last), min_value=first,
+                           max_value=last, key="det_audit_range")
+    if not isinstance(picked, tuple) or len(picked) != 2:
+        return
+    hist = audit.read_range(pd.Timestamp(picked[0]), pd.Timestamp(picked[1]) + pd.Timedelta(days=1))
+    if project != "ALL":
+        hist = hist.take(project_positions(hist, project))
+    st.caption(f"{audit.rows:,} events · {len(parts)} partisi · {int(parts['segments'].sum())} segmen")
+    _df(paged_view(hist, "det_hist", page_size=DETAIL_PAGE, filter_cols=("action",), **TX_PAGING), height=280)
+
+
+def _render_inventory_detail(inv_df, tanks_df, tx_df, alerts_df, store=None, project="ALL", audit=None):
+    st.caption("Inventory + audit log: search / filter / sort di server, tampil per halaman.")
     st.markdown("#### Inventory")
-    _df(inv_df, height=320)
+    if store is not None:
+        _df(_store_page(store, "inventory", "det_inv", DETAIL_PAGE, ("status", "category", "location"),
+                        project, INV_PAGING), height=320)
+    else:
+        _df(paged_view(inv_df, "det_inv", page_size=DETAIL_PAGE,
+                       filter_cols=("status", "category", "location"), **INV_PAGING), height=320)
+    k1, k2 = st.columns(2)
+    proj = None if project == "ALL" else project
+    with k1:
+        st.markdown("#### Status per Project")
+        _df(store.status_counts("project", proj) if store is not None else status_breakdown(inv_df, "project"))
+    with k2:
+        st.markdown("#### Status per Location")
+        _df(store.status_counts("location", proj) if store is not None else status_breakdown(inv_df, "location"))
     st.markdown("#### Fuel Tanks")
     _df(tanks_df, height=220)
     st.markdown("#### Audit Log")
-    _df(tx_df, height=280)
+    if store is not None:
+        _df(_store_page(store, "transactions", "det_tx", DETAIL_PAGE, ("action",), project, TX_PAGING), height=280)
+    else:
+        _df(paged_view(tx_df, "det_tx", page_size=DETAIL_PAGE, filter_cols=("action",), **TX_PAGING), height=280)
+    if audit is not None:
+        st.markdown("#### Audit History")
+        _render_audit_history(audit, project)
     st.markdown("#### Alerts")
     _df(alerts_df, height=220)
+    if store is not None:
+        st.markdown("#### Alert History")
+        _df(store.alert_history(limit=DETAIL_PAGE), height=220)
+
+
+def _render_fuel_history(history, tanks_df, trucks_df):
+    """Riwayat fuel jangka panjang (FuelHistory) — titik dibatasi via rollup + downsampling."""
+    st.caption("Level fuel per tank / truck · rollup 5min / 1h / 1D · band = min/max.")
+    h1, h2 = st.columns([1, 2])
+    with h1:
+        kind = st.radio("Sumber", ["Tank", "Truck"], horizontal=True, key="fh_kind")
+        days = st.select_slider("Rentang", options=[1, 3, 7, 14, 30, 90], value=30, key="fh_days",
+                                format_func=lambda d: f"{d} hari")
+    store = history["tank" if kind == "Tank" else "truck"]
+    if kind == "Tank":
+        names = dict(zip(tanks_df["tank_id"].astype(str), tanks_df["tank_name"].astype(str)))
+    else:
+        names = dict(zip(trucks_df["truck_id"].astype(str), trucks_df["truck_id"].astype(str)))
+    ids = [e for e in store.entities() if e in names]
+    if not ids:
+        st.info("Belum ada riwayat — aktifkan Telemetry untuk merekam fuel truck." if kind == "Truck"
+                else "Belum ada riwayat tank.")
+        return
+    with h2:
+        picked = st.multiselect("Entity", ids, default=ids[:5], format_func=lambda e: names.get(e, e),
+                                key=f"fh_ids_{kind}")
+    if picked:
+        reorder = None
+        if kind == "Tank" and len(picked) == 1:
+            reorder = tanks_df.loc[tanks_df["tank_id"].astype(str) == picked[0], "reorder_point_l"].iloc[0]
+        fuel_history_chart(store, picked, names, days=days, height=300, reorder_l=reorder)
+    st.caption(" · ".join(f"{k}: {v:,}" for k, v in store.stats().items()))
 
 
 # ─────────────────────────────────────────────────────────────
@@ -252,8 +365,11 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 _sb_section("Simulation")
-seed = st.sidebar.number_input("Random seed", min_value=1, max_value=9999, value=42)
+seed = st.sidebar.number_input("Random seed", min_value=1, max_value=9999, value=42,
+                               help="Data deterministik per seed — ganti seed untuk dataset baru.")
 n_trucks = st.sidebar.slider("Jumlah Truck", 10, 15, 12)
+scale_label = st.sidebar.selectbox("Scale factor (load test)",
+                                   [k for k, v in SCALE_FACTORS.items() if v <= DASHBOARD_MAX_SF], index=0)
 
 _sb_section("Filtering")
 active_project = st.sidebar.selectbox("Filter Project", ["ALL"] + PROJECTS, index=0)
@@ -261,6 +377,12 @@ view_site = st.sidebar.selectbox("Target Set / Site", [s["name"] for s in SITES]
 
 _sb_section("Live Mode")
 auto_refresh = st.sidebar.toggle("Auto-refresh (live)", value=True)
+telemetry_on = st.sidebar.toggle("Telemetry stream (replay)", value=False, key="telemetry_on",
+                                 help="Posisi & fuel truck dari ping telemetry (ring buffer per truck).")
+
+_sb_section("Storage")
+storage_on = st.sidebar.toggle("Database storage (SQLite)", value=False, key="storage_on",
+                               help="Tabel Operations / Inventory Detail di-query dari database ber-index.")
 
 _sb_section("Map")
 map_engine = st.sidebar.selectbox("Map Engine", ["Street Map (Recommended)", "Deck (Fallback)"])
@@ -268,12 +390,15 @@ map_engine = st.sidebar.selectbox("Map Engine", ["Street Map (Recommended)", "De
 _sb_section("Detail")
 detail_choice = st.sidebar.radio(
     "Open Detail Panel",
-    ["None", "Map Detail", "Inventory Detail", "Company Info"],
+    ["None", "Map Detail", "Inventory Detail", "Fuel History", "Company Info"],
     index=0,
     key="detail_choice",
 )
 pin_below = st.sidebar.toggle("Pin detail below (open)", value=False, key="detail_pin")
 
+_sb_section("Debug")
+profile_render = st.sidebar.toggle("Render profiling", value=profiling_default(), key="profile_render")
+
 # Heights — tuned for 1366×768 laptop, scale up on larger screens
 MAP_H = 258
 GAUGE_H = 155
@@ -281,67 +406,64 @@ TABLE_H = 152
 FORECAST_H = 162
 RENT_N = 5    # rows in rental tracker
 ALERT_N = 5
+OPS_PAGE = 50      # rows per page, Operations tabs
+DETAIL_PAGE = 200  # rows per page, Inventory Detail
 
 if auto_refresh and st_autorefresh:
     st_autorefresh(interval=4_000, key="refresh")
 
-seed_everything(int(seed))
+prof = RenderProfiler(enabled=profile_render, session=_session_id()).start()
 
 # ─────────────────────────────────────────────────────────────
-# Data
+# Data — snapshot terakhir dari background scheduler (satu per seed /
+# n_trucks / scale factor / telemetry, dibagi semua session di proses).
+# Frames are shared across reruns/sessions: never mutate in place.
 # ─────────────────────────────────────────────────────────────
-people = make_people(35, roles=PEOPLE_ROLES)
-trucks = make_trucks(n_trucks=int(n_trucks), warehouse=WAREHOUSE, people=people)
-pmap = dict(zip(people["person_id"], people["name"]))
-trucks["driver_name"] = trucks["driver_id"].map(lambda x: pmap.get(x, x))
-
-inventory = make_inventory(EQUIP_CATEGORIES, PROJECTS)
-tanks = make_fuel_tanks()
-tx = make_transactions(inventory, people, n=160, projects=PROJECTS)
-alerts = make_alerts(trucks, inventory, tanks)
-
-if active_project != "ALL":
-    inventory_view = inventory[
-        (inventory["project"] == active_project) | (inventory["project"] == "-")
-    ].copy()
-    tx_view = tx[tx["project"] == active_project].copy()
-else:
-    inventory_view = inventory.copy()
-    tx_view = tx.copy()
+with prof.section("Data"):
+    scheduler = get_scheduler(int(seed), int(n_trucks), SCALE_FACTORS[scale_label], telemetry_on)
+    snap = scheduler.latest()
+    data = snap.data
+    people = data["people"]
+    trucks = data["trucks"]
+    inventory = data["inventory"]
+    tanks = data["tanks"]
+    tx = data["tx"]
+    alerts = data["alerts"]
+    trails = snap.trails
+    kpi = snap.kpis
+    fuel_history = snap.extras["fuel_history"]
+    geofence = get_geofence_tracker(int(seed), int(n_trucks), SCALE_FACTORS[scale_label], telemetry_on)
+    store = get_store(int(seed), int(n_trucks), SCALE_FACTORS[scale_label]) if storage_on else None
+
+    # Proyeksi per filter — dibagi antar session, bukan copy per session
+    view = snap.view(active_project)
+    inventory_view = view.inventory
+    tx_view = view.tx
+
+st.sidebar.caption(f"Snapshot v{snap.version} · {snap.age_s:.1f}s lalu · build {snap.build_ms:.0f} ms")
 
 site = next(s for s in SITES if s["name"] == view_site)
 
-# KPIs
-kpi_prods = len([p for p in PROJECTS if (inventory["project"] == p).any()])
-kpi_trucks = int((trucks["status"].isin(["MOVING", "ON-SITE"])).sum())
-kpi_fuel = int(tanks["level_l"].sum())
-kpi_onrent = int((inventory["status"] == "ON-RENT").sum())
-kpi_avail = int((inventory["status"] == "AVAILABLE").sum())
-kpi_maint = int((inventory["status"] == "MAINTENANCE").sum())
-kpi_lost = int((inventory["status"] == "LOST").sum())
-
 # ═══════════════════════════════════════════════════════════
 # TOP ROW — 3 columns: KPIs | Map | Alerts
 # ═══════════════════════════════════════════════════════════
-reset_gauge_counter()
 c1, c2, c3 = st.columns([1.05, 1.65, 1.0], gap="medium")
 
-with c1:
+with c1, prof.section("Executive Summary"):
     panel_open()
     st.markdown('<div class="kpi-flex">', unsafe_allow_html=True)
 
     st.subheader("Executive Summary")
     st.caption("Real-time KPI operasional.")
 
-    g1, g2, g3 = st.columns(3)
-    with g1: radial_gauge("Trucks", kpi_trucks, 0, 15, "", height=GAUGE_H)
-    with g2: radial_gauge("Fuel", kpi_fuel, 0, 3000, " L", height=GAUGE_H)
-    with g3: radial_gauge("Projects", kpi_prods, 0, len(PROJECTS), "", height=GAUGE_H)
-
-    g4, g5, g6 = st.columns(3)
-    with g4: radial_gauge("On Rent", kpi_onrent, 0, 300, "", height=GAUGE_H)
-    with g5: radial_gauge("Available", kpi_avail, 0, 500, "", height=GAUGE_H)
-    with g6: radial_gauge("Maint.", kpi_maint, 0, 120, "", height=GAUGE_H)
+    gauge_grid([
+        ("Trucks", kpi.trucks_active, 0, 15, ""),
+        ("Fuel", kpi.fuel_l, 0, 3000, " L"),
+        ("Projects", kpi.active_projects, 0, len(PROJECTS), ""),
+        ("On Rent", kpi.on_rent, 0, 300, ""),
+        ("Available", kpi.available, 0, 500, ""),
+        ("Maint.", kpi.maintenance, 0, 120, ""),
+    ], cols=3, height=GAUGE_H, key="kpi_gauges")
 
     st.markdown('<div class="kpi-spacer"></div>', unsafe_allow_html=True)
 
@@ -358,123 +480,116 @@ with c1:
 if st.session_state.get("detail_choice", "None") != "None":
     expanded = bool(st.session_state.get("detail_pin", False))
     title = st.session_state["detail_choice"]
-    with st.expander(f"DETAIL — {title}", expanded=expanded):
+    with st.expander(f"DETAIL — {title}", expanded=expanded), prof.section(f"Detail: {title}"):
         if title == "Map Detail":
-            _render_map_detail(trucks, site, map_engine)
+            _render_map_detail(trucks, site, map_engine, geofence)
         elif title == "Inventory Detail":
-            _render_inventory_detail(inventory_view, tanks, tx_view, alerts)
+            audit = get_audit_log(int(seed), int(n_trucks), SCALE_FACTORS[scale_label])
+            _render_inventory_detail(inventory_view, tanks, tx_view, alerts, store, active_project, audit)
+        elif title == "Fuel History":
+            _render_fuel_history(fuel_history, tanks, trucks)
         elif title == "Company Info":
             _render_company_info()
 
 with c2:
-    panel_open()
-    st.subheader("Live Fleet Map")
-    st.caption("Jakarta · CartoDB Dark Matter · Zoom untuk street detail.")
-    tc = ["truck_id", "status", "driver_name", "lat", "lon", "speed_kmh", "fuel_liters"]
-
-    if map_engine.startswith("Street"):
-        # ✅ FIX: give UNIQUE key for live map (different from detail map)
-        render_street_map(
-            trucks[tc],
-            site,
-            height=MAP_H,
-            zoom_start=12,
-            key=f"map_live_{map_engine}_{site['name']}",
-        )
-    else:
-        render_pydeck_map(trucks[tc], site)
-
-    panel_close()
-
-    panel_open()
-    st.subheader("Operations")
-    st.caption("Inventory &amp; Audit Log — warna per status.")
-    tab_inv, tab_aud = st.tabs(["📦 Inventory", "🧾 Audit Log"])
-    with tab_inv:
-        colored_inventory_table(inventory_view, max_rows=7, height_px=TABLE_H)
-    with tab_aud:
-        colored_audit_table(tx_view, max_rows=7, height_px=TABLE_H)
-    panel_close()
+    with prof.section("Live Fleet Map"):
+        panel_open()
+        st.subheader("Live Fleet Map")
+        st.caption("Jakarta · CartoDB Dark Matter · Zoom untuk street detail.")
+        tc = ["truck_id", "status", "driver_name", "lat", "lon", "speed_kmh", "fuel_liters"]
+
+        if map_engine.startswith("Street"):
+            # ✅ FIX: give UNIQUE key for live map (different from detail map)
+            render_street_map(
+                trucks[tc],
+                site,
+                height=MAP_H,
+                zoom_start=12,
+                key=f"map_live_{map_engine}_{site['name']}",
+                trails=trails,
+            )
+        else:
+            render_pydeck_map(trucks[tc], site)
+
+        panel_close()
+
+    with prof.section("Operations"):
+        panel_open()
+        st.subheader("Operations")
+        st.caption("Inventory &amp; Audit Log — warna per status.")
+        tab_inv, tab_aud = st.tabs(["📦 Inventory", "🧾 Audit Log"])
+        with tab_inv:
+            if store is not None:
+                page = _store_page(store, "inventory", "ops_inv", OPS_PAGE, ("status",), active_project, INV_PAGING)
+            else:
+                page = paged_view(inventory_view, "ops_inv", page_size=OPS_PAGE, filter_cols=("status",), **INV_PAGING)
+            colored_inventory_table(page, max_rows=OPS_PAGE, height_px=TABLE_H)
+        with tab_aud:
+            if store is not None:
+                page = _store_page(store, "transactions", "ops_tx", OPS_PAGE, ("action",), active_project, TX_PAGING)
+            else:
+                page = paged_view(tx_view, "ops_tx", page_size=OPS_PAGE, filter_cols=("action",), **TX_PAGING)
+            colored_audit_table(page, max_rows=OPS_PAGE, height_px=TABLE_H)
+        panel_close()
 
 with c3:
-    panel_open()
-    st.subheader("Alerts Feed")
-    st.caption("Overdue · Fuel Low · Geofence · Lost")
-    if alerts.empty:
-        st.info("No alerts (demo).")
-    else:
-        for _, r in alerts.head(ALERT_N).iterrows():
-            alert_card(r["severity"], r["message"], r["time"].strftime("%m-%d %H:%M"))
-    panel_close()
-
-    panel_open()
-    st.subheader("Export Report")
-    st.caption("Download data ke Excel atau cetak PDF.")
-    export_excel_button(inventory_view, tanks, tx_view, alerts)
-    export_pdf_button()
-    panel_close()
+    with prof.section("Alerts Feed"):
+        panel_open()
+        st.subheader("Alerts Feed")
+        st.caption("Overdue · Fuel Low · Geofence · Lost")
+        if not alerts.empty and _btn("✓ Acknowledge shown", key="btn_ack_alerts"):
+            engine = get_alert_engine(int(seed), int(n_trucks), SCALE_FACTORS[scale_label], telemetry_on)
+            engine.acknowledge(list(zip(alerts["rule"].head(ALERT_N), alerts["entity"].head(ALERT_N))))
+            alerts = engine.frame()
+            scheduler.refresh()
+        if alerts.empty:
+            st.info("No alerts (demo).")
+        else:
+            for _, r in alerts.head(ALERT_N).iterrows():
+                alert_card(r["severity"], r["message"], r["time"].strftime("%m-%d %H:%M"))
+        panel_close()
+
+    with prof.section("Export"):
+        panel_open()
+        st.subheader("Export Report")
+        st.caption("Download data ke Excel atau cetak PDF.")
+        export_excel_button(inventory_view, tanks, tx_view, alerts)
+        export_pdf_button(kpi, tanks, inventory_view, alerts, active_project)
+        panel_close()
 
 # ═══════════════════════════════════════════════════════════
 # BOTTOM ROW — 4 equal columns
 # ═══════════════════════════════════════════════════════════
 b1, b2, b3, b4 = st.columns([1, 1, 1, 1], gap="medium")
 
-with b1:
+with b1, prof.section("Rental Duration"):
     panel_open()
     st.subheader("Rental Duration")
     st.caption("Masa sewa aktif · Progress urgency.")
     rental_duration_panel(inventory_view, n=RENT_N)
     panel_close()
 
-with b2:
+with b2, prof.section("Fuel Tanks"):
     panel_open()
     st.subheader("Fuel Tanks")
     st.caption("Level · Kapasitas · Burn-rate · Reorder")
     colored_tank_table(tanks, height_px=TABLE_H)
     panel_close()
 
-with b3:
+with b3, prof.section("Fuel Forecast"):
     panel_open()
     st.subheader("Fuel Forecast")
     st.caption("Proyeksi 7 hari · ⚠ garis reorder")
-    fuel_forecast_chart(tanks, height=FORECAST_H)
+    fuel_forecast_chart(tanks, height=FORECAST_H, fc=snap.extras.get("forecast"),
+                        readings=snap.extras.get("tank_readings"),
+                        history=fuel_history["tank"])
     panel_close()
 
-with b4:
+with b4, prof.section("Fleet Status"):
     panel_open()
     st.subheader("Fleet Status")
     st.caption("Distribusi status armada saat ini.")
-    status_counts = trucks["status"].value_counts()
-    status_colors = {
-        "MOVING": "#18e8ff", "ON-SITE": "#2deca0",
-        "IDLE": "#bb6fff", "PARKED": "#ffc107",
-    }
-    fig_donut = go.Figure(go.Pie(
-        labels=status_counts.index.tolist(),
-        values=status_counts.values.tolist(),
-        hole=0.60,
-        marker=dict(
-            colors=[status_colors.get(s, "#5599ff") for s in status_counts.index],
-            line=dict(color="rgba(14,24,48,0.90)", width=2),
-        ),
-        textfont=dict(family="JetBrains Mono", size=10, color="#eef3ff"),
-        hovertemplate="<b>%{label}</b><br>%{value} trucks (%{percent})<extra></extra>",
-    ))
-    fig_donut.update_layout(
-        height=FORECAST_H + 10,
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        margin=dict(l=4, r=4, t=4, b=4),
-        showlegend=True,
-        legend=dict(
-            font=dict(color="rgba(210,225,255,0.72)", size=9, family="JetBrains Mono"),
-            bgcolor="rgba(0,0,0,0)", orientation="v", x=1.0, y=0.5,
-        ),
-        annotations=[dict(
-            text=f"<b>{int(status_counts.sum())}</b><br><span style='font-size:9px'>Trucks</span>",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=18, family="Rajdhani", color="#eef3ff"),
-        )],
-    )
-    _plotly(fig_donut)
-    panel_close()
\ No newline at end of file
+    fleet_status_donut(trucks, height=FORECAST_H + 10)
+    panel_close()
+
+prof.render_sidebar()
@@ -0,0 +1,247 @@
+"""Headless benchmark for one dashboard rerun and each panel in isolation.
+
+Usage (dari root repo):
+    python -m bench.run --sf 1 10 100 --out bench_results.json
+    python -m bench.run --sf 1 --apptest --compare bench_results.json
+
+Per stage dicatat wall time (ms, min/median/mean), peak memory (tracemalloc,
+pass terpisah supaya timing tidak terdistorsi) dan payload bytes ke browser.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import PROJECTS, SITES, SCALE_FACTORS, DASHBOARD_MAX_SF  # noqa: E402
+from data import scale  # noqa: E402
+from data.mock_data import make_fuel_tanks, make_alerts, seed_everything  # noqa: E402
+from data.kpi import compute_kpis  # noqa: E402
+from data.provider import load_dashboard_data, build_snapshot, get_fuel_history  # noqa: E402
+from components import sections, maps, export, report  # noqa: E402
+from ui.profiling import PayloadMeter  # noqa: E402
+
+# Heights sama dengan app.py supaya payload sebanding
+MAP_H, GAUGE_H, TABLE_H, FORECAST_H, RENT_N, OPS_ROWS = 258, 155, 152, 162, 5, 200
+TRUCK_COLS = ["truck_id", "status", "driver_name", "lat", "lon", "speed_kmh", "fuel_liters"]
+
+
+def _gauges(k):
+    sections.reset_gauge_counter()
+    sections.radial_gauge("Trucks", k.trucks_active, 0, 15, "", height=GAUGE_H)
+    sections.radial_gauge("Fuel", k.fuel_l, 0, 3000, " L", height=GAUGE_H)
+    sections.radial_gauge("Projects", k.active_projects, 0, len(PROJECTS), "", height=GAUGE_H)
+    sections.radial_gauge("On Rent", k.on_rent, 0, 300, "", height=GAUGE_H)
+    sections.radial_gauge("Available", k.available, 0, 500, "", height=GAUGE_H)
+    sections.radial_gauge("Maint.", k.maintenance, 0, 120, "", height=GAUGE_H)
+
+
+def _gauge_grid(k):
+    sections.gauge_grid([
+        ("Trucks", k.trucks_active, 0, 15, ""),
+        ("Fuel", k.fuel_l, 0, 3000, " L"),
+        ("Projects", k.active_projects, 0, len(PROJECTS), ""),
+        ("On Rent", k.on_rent, 0, 300, ""),
+        ("Available", k.available, 0, 500, ""),
+        ("Maint.", k.maintenance, 0, 120, ""),
+    ], cols=3, height=GAUGE_H, key="bench_gauges")
+
+
+def _generate(sf, seed):
+    d = scale.materialize(sf, seed=seed)
+    seed_everything(seed)
+    d["tanks"] = make_fuel_tanks()
+    return d
+
+
+def build_stages(sf: int, seed: int):
+    """List of (name, fn) — data dibangun sekali, tiap stage dipanggil berulang."""
+    d = _generate(sf, seed)
+    inv, trucks, tanks, tx = d["inventory"], d["trucks"], d["tanks"], d["tx"]
+    alerts = make_alerts(trucks, inv, tanks)
+    kpis = compute_kpis(inv, trucks, tanks)
+    site = SITES[0]
+    tank_hist = get_fuel_history(seed, 12, min(sf, DASHBOARD_MAX_SF))["tank"]
+    # provider hanya melayani SF dashboard; SF di atasnya diukur lewat stage lain saja
+    provider = [
+        ("data.provider_hit", lambda: load_dashboard_data(seed, 12, sf=sf)),
+        ("data.snapshot_build", lambda: build_snapshot(seed, 12, sf=sf)),
+    ] if sf <= DASHBOARD_MAX_SF else []
+
+    return [
+        ("data.generate", lambda: _generate(sf, seed)),
+        *provider,
+        ("kpi", lambda: compute_kpis(inv, trucks, tanks)),
+        ("make_alerts", lambda: make_alerts(trucks, inv, tanks)),
+        ("sections.radial_gauge_x6", lambda: _gauges(kpis)),
+        ("sections.gauge_grid", lambda: _gauge_grid(kpis)),
+        ("sections.rental_duration_panel", lambda: sections.rental_duration_panel(inv, n=RENT_N)),
+        ("sections.fuel_forecast_chart", lambda: sections.fuel_forecast_chart(tanks, height=FORECAST_H)),
+        ("sections.fuel_history_chart_90d",
+         lambda: sections.fuel_history_chart(tank_hist, tank_hist.entities(), days=90, height=FORECAST_H)),
+        ("sections.fleet_status_donut", lambda: sections.fleet_status_donut(trucks, height=FORECAST_H + 10)),
+        ("sections.colored_inventory_table",
+         lambda: sections.colored_inventory_table(inv, max_rows=OPS_ROWS, height_px=TABLE_H)),
+        ("sections.colored_audit_table", lambda: sections.colored_audit_table(tx, max_rows=OPS_ROWS, height_px=TABLE_H)),
+        ("sections.colored_tank_table", lambda: sections.colored_tank_table(tanks, height_px=TABLE_H)),
+        ("sections.export_excel_button", lambda: sections.export_excel_button(inv, tanks, tx, alerts)),
+        ("sections.export_pdf_button", lambda: sections.export_pdf_button(kpis, tanks, inv, alerts)),
+        ("export.write_excel", lambda: export.write_excel({"Inventory": inv, "Fuel Tanks": tanks,
+                                                           "Audit Log": tx, "Alerts": alerts})),
+        ("report.build_report", lambda: report.build_report(kpis, tanks, inv, alerts)),
+        ("maps.render_street_map",
+         lambda: maps.render_street_map(trucks[TRUCK_COLS], site, height=MAP_H, key="bench_map")),
+        ("maps.render_pydeck_map", lambda: maps.render_pydeck_map(trucks[TRUCK_COLS], site)),
+    ]
+
+
+def measure(fn, repeat: int, meter: PayloadMeter) -> dict:
+    times = []
+    for i in range(repeat):
+        meter.reset()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0 - meter.sizer_s) * 1000)     # tanpa waktu sizer
+        if i == 0:
+            payload, calls = meter.bytes, dict(meter.calls)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "wall_ms": {
+            "min": round(min(times), 3),
+            "median": round(statistics.median(times), 3),
+            "mean": round(statistics.fmean(times), 3),
+        },
+        "peak_kb": round(peak / 1024, 1),
+        "payload_bytes": payload,
+        "st_calls": calls,
+    }
+
+
+def measure_apptest(sf_label: str, repeat: int) -> dict:
+    """Full rerun of app.py via Streamlit AppTest (payload tidak terukur di mode ini)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=600)
+    at.run()
+    sel = next(s for s in at.selectbox if s.label.startswith("Scale factor"))
+    sel.set_value(sf_label)
+    at.run()                                   # warm cache
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - t0) * 1000)
+    errors = [str(e.value) for e in at.exception]
+    return {
+        "wall_ms": {
+            "min": round(min(times), 3),
+            "median": round(statistics.median(times), 3),
+            "mean": round(statistics.fmean(times), 3),
+        },
+        "peak_kb": None,
+        "payload_bytes": None,
+        "errors": errors,
+    }
+
+
+def _meta() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        commit = None
+    import numpy, pandas, plotly, streamlit
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {
+            "streamlit": streamlit.__version__, "pandas": pandas.__version__,
+            "numpy": numpy.__version__, "plotly": plotly.__version__,
+        },
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Stages whose median wall time regressed by more than ``threshold`` (fraction)."""
+    base = {(r["sf"], r["stage"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in current["results"]:
+        b = base.get((r["sf"], r["stage"]))
+        if not b or not b["wall_ms"]["median"]:
+            continue
+        ratio = r["wall_ms"]["median"] / b["wall_ms"]["median"]
+        print(f"  SF{r['sf']:<6} {r['stage']:<36} {b['wall_ms']['median']:>10.2f} → "
+              f"{r['wall_ms']['median']:>10.2f} ms  ({ratio:5.2f}x)")
+        if ratio > 1 + threshold:
+            regressions.append((r["sf"], r["stage"], ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Allanray Command Center benchmark")
+    ap.add_argument("--sf", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--stage", nargs="*", help="hanya jalankan stage yang namanya mengandung teks ini")
+    ap.add_argument("--apptest", action="store_true", help="ukur juga full rerun app.py via AppTest")
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--compare", help="file hasil sebelumnya untuk deteksi regresi")
+    ap.add_argument("--threshold", type=float, default=0.20)
+    args = ap.parse_args(argv)
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    labels = {v: k for k, v in SCALE_FACTORS.items()}
+    results = []
+    meter = PayloadMeter(passthrough=False)
+
+    with meter.patch():
+        for sf in args.sf:
+            for name, fn in build_stages(sf, args.seed):
+                if args.stage and not any(s in name for s in args.stage):
+                    continue
+                r = {"sf": sf, "stage": name, **measure(fn, args.repeat, meter)}
+                results.append(r)
+                print(f"SF{sf:<6} {name:<36} {r['wall_ms']['median']:>10.2f} ms  "
+                      f"{r['peak_kb']:>10.1f} KB peak  {r['payload_bytes']:>10,} B")
+
+    if args.apptest:
+        for sf in args.sf:
+            if sf not in labels or sf > DASHBOARD_MAX_SF:
+                print(f"SF{sf}: bukan SF dashboard (DASHBOARD_MAX_SF={DASHBOARD_MAX_SF}), skip AppTest")
+                continue
+            r = {"sf": sf, "stage": "app.full_rerun", **measure_apptest(labels[sf], args.repeat)}
+            results.append(r)
+            print(f"SF{sf:<6} {'app.full_rerun':<36} {r['wall_ms']['median']:>10.2f} ms  errors={r['errors']}")
+
+    out = {"meta": _meta(), "params": vars(args), "results": results}
+    Path(args.out).write_text(json.dumps(out, indent=2), encoding="utf-8")
+    print(f"→ {args.out}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(out, baseline, args.threshold)
+        if regressions:
+            print(f"REGRESSION (> {args.threshold:.0%}): {regressions}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from components.export import data_key
+
+# ─────────────────────────────────────────────────────────────
+# Chart factory — template Plotly terdaftar + figure cache
+# Styling (font, warna, margin, hoverlabel) ada di pio.templates, bukan
+# di-rebuild per chart. go.Figure yang sudah jadi di-cache per fingerprint
+# data → rerun dengan data sama tidak membangun / memvalidasi trace lagi.
+# Serialisasi (to_dict + JSON) tetap dilakukan st.plotly_chart tiap rerun.
+# ─────────────────────────────────────────────────────────────
+FONT = "JetBrains Mono"
+TEXT = "rgba(210,225,255,0.72)"
+TICK = "rgba(180,200,240,0.50)"
+LINES = ["#ff6666", "#40eeff", "#cc88ff", "#ffd740", "#50ffb8"]
+FILLS = ["rgba(255,68,68,0.14)", "rgba(24,232,255,0.14)", "rgba(187,111,255,0.14)",
+         "rgba(255,193,7,0.14)", "rgba(45,236,160,0.14)"]
+STATUS_COLORS = {"MOVING": "#18e8ff", "ON-SITE": "#2deca0", "IDLE": "#bb6fff", "PARKED": "#ffc107"}
+REORDER_LINE = dict(line_dash="dot", line_color="rgba(255,193,7,0.55)", line_width=1,
+                    annotation_text="⚠ Reorder", annotation_font_color="rgba(255,193,7,0.85)",
+                    annotation_font_size=9)
+_CACHE_MAX = 64
+
+
+def _rgba(hex_color: str, alpha: float) -> str:
+    h = hex_color.lstrip("#")
+    return f"rgba({int(h[0:2], 16)},{int(h[2:4], 16)},{int(h[4:6], 16)},{alpha})"
+
+
+# ─────────────────────────────────────────────────────────────
+# Templates — didaftarkan sekali saat import
+# ─────────────────────────────────────────────────────────────
+def _register_templates():
+    base = dict(
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(family=FONT, color=TEXT, size=10), colorway=LINES,
+        legend=dict(font=dict(color="rgba(210,225,255,0.70)", size=9, family=FONT), bgcolor="rgba(0,0,0,0)"),
+        hoverlabel=dict(bgcolor="rgba(14,24,48,0.95)", font=dict(color="#eef3ff", size=10),
+                        bordercolor="rgba(255,255,255,0.14)"),
+    )
+    pio.templates["allanray"] = go.layout.Template(layout=base)
+    pio.templates["allanray_ts"] = go.layout.Template(layout=dict(
+        base, margin=dict(l=2, r=6, t=8, b=2), hovermode="x unified",
+        legend=dict(base["legend"], x=0, y=1.08, orientation="h"),
+        xaxis=dict(showgrid=False, tickfont=dict(color=TICK, size=8), linecolor="rgba(255,255,255,0.08)"),
+        yaxis=dict(showgrid=True, gridcolor="rgba(255,255,255,0.06)", tickfont=dict(color=TICK, size=8),
+                   title=dict(text="L", font=dict(color="rgba(160,185,230,0.40)", size=8))),
+    ))
+    pio.templates["allanray_gauge"] = go.layout.Template(layout=dict(base, margin=dict(l=4, r=4, t=48, b=4)))
+    pio.templates["allanray_donut"] = go.layout.Template(
+        layout=dict(base, margin=dict(l=4, r=4, t=4, b=4), showlegend=True,
+                    legend=dict(base["legend"], font=dict(color=TEXT, size=9, family=FONT),
+                                orientation="v", x=1.0, y=0.5)),
+        data=dict(pie=[go.Pie(hole=0.60, marker=dict(line=dict(color="rgba(14,24,48,0.90)", width=2)),
+                              textfont=dict(family=FONT, size=10, color="#eef3ff"))]),
+    )
+
+
+_register_templates()
+
+
+# ─────────────────────────────────────────────────────────────
+# Figure cache
+# ─────────────────────────────────────────────────────────────
+def _part_key(part):
+    if isinstance(part, pd.DataFrame):
+        return data_key(part)
+    if isinstance(part, pd.Index):
+        part = part.asi8 if isinstance(part, pd.DatetimeIndex) else part.to_numpy()
+    if isinstance(part, np.ndarray):
+        if part.dtype == object:
+            part = part.astype(str)
+        return part.shape, str(part.dtype), zlib.crc32(np.ascontiguousarray(part).tobytes())
+    return part
+
+
+def fingerprint(*parts) -> tuple:
+    """Key cache dari frame / array / scalar (frame: content fingerprint, memoized per objek)."""
+    return tuple(_part_key(p) for p in parts)
+
+
+class FigureCache:
+    """LRU of built go.Figure keyed on (chart name, data fingerprint).
+
+    Figure yang dikembalikan dipakai bersama antar rerun — caller tidak boleh memutasinya.
+    """
+
+    def __init__(self, maxsize: int = _CACHE_MAX):
+        self.maxsize = maxsize
+        self._figs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, name: str, key, build):
+        """Cached figure for ``key``; ``build()`` (go.Figure / None) hanya dipanggil saat miss."""
+        with self._lock:
+            if (name, key) in self._figs:
+                self._figs.move_to_end((name, key))
+                self.hits += 1
+                return self._figs[(name, key)]
+        fig = build()
+        with self._lock:
+            self.misses += 1
+            self._figs[(name, key)] = fig
+            while len(self._figs) > self.maxsize:
+                self._figs.popitem(last=False)
+        return fig
+
+    def stats(self) -> dict:
+        return {"figures": len(self._figs), "hits": self.hits, "misses": self.misses}
+
+
+figures = FigureCache()
+
+
+def show(fig, key: str | None = None, config: dict | None = None):
+    """st.plotly_chart dengan template sendiri (theme=None) + width compat lintas versi Streamlit."""
+    kwargs = {"key": key, "config": config, "theme": None}
+    try:
+        st.plotly_chart(fig, width="stretch", **kwargs)
+    except TypeError:
+        st.plotly_chart(fig, use_container_width=True, **kwargs)
+
+
+# ─────────────────────────────────────────────────────────────
+# Builders — dipanggil hanya saat cache miss
+# ─────────────────────────────────────────────────────────────
+def _gauge_trace(title, value, vmin, vmax, suffix, color, domain=None):
+    return go.Indicator(
+        mode="gauge+number",
+        value=value,
+        domain=domain,
+        number={"suffix": suffix, "font": {"size": 34, "family": "Rajdhani", "color": color}},
+        title={"text": f"<span style='font-family:Rajdhani,sans-serif;font-size:12px;font-weight:700;letter-spacing:0.10em;text-transform:uppercase;color:rgba(210,225,255,0.85)'>{title}</span>"},
+        gauge={
+            "axis": {"range": [vmin, vmax], "tickwidth": 0,
+                     "tickcolor": "rgba(0,0,0,0)",
+                     "tickfont": {"color": "rgba(0,0,0,0)", "size": 1}},
+            "bar": {"thickness": 0.28, "color": color, "line": {"width": 0}},
+            "bgcolor": "rgba(0,0,0,0)", "borderwidth": 0,
+            "steps": [{"range": [vmin, vmax], "color": "rgba(255,255,255,0.05)"}],
+            "threshold": {"line": {"color": color, "width": 2}, "thickness": 0.82, "value": value},
+        },
+    )
+
+
+def gauge_figure(title, value, vmin, vmax, suffix="", height=158, color="#5599ff") -> go.Figure:
+    v = max(vmin, min(value, vmax))
+    fig = go.Figure(_gauge_trace(title, v, vmin, vmax, suffix, color))
+    fig.update_layout(template="allanray_gauge", height=height, font_color=color)
+    return fig
+
+
+def gauge_grid_figure(specs: tuple, values, cols: int, height: int) -> go.Figure:
+    """specs: ((title, vmin, vmax, suffix, color), ...) + value per gauge → satu figure grid."""
+    rows = -(-len(specs) // cols)
+    traces = []
+    for i, ((title, vmin, vmax, suffix, color), v) in enumerate(zip(specs, values)):
+        r, c = divmod(i, cols)
+        traces.append(_gauge_trace(title, v, vmin, vmax, suffix, color,
+                                   domain={"x": [c / cols + 0.01, (c + 1) / cols - 0.01],
+                                           "y": [1 - (r + 1) / rows + 0.02, 1 - r / rows - 0.16 / rows]}))
+    fig = go.Figure(traces)
+    fig.update_layout(template="allanray_gauge", margin=dict(t=36), height=height * rows)
+    return fig
+
+
+def forecast_figure(tanks: pd.DataFrame, fc, height: int, shown, t_hist=None, hist=None, past=None,
+                    step_h: int = 3) -> go.Figure:
+    """Riwayat + proyeksi per tank (urut ``shown``), garis reorder tank pertama, penanda TODAY."""
+    now = fc.times[0].to_pydatetime()
+    names = tanks["tank_name"].astype(str).to_numpy()
+    t_fc = fc.times[::step_h]
+    past = past or {}
+    fig = go.Figure()
+    for idx, k in enumerate(shown):
+        x, y = t_fc, fc.levels[k, ::step_h]
+        if str(fc.ids[k]) in past:
+            t_past, y_past = past[str(fc.ids[k])]
+            x, y = t_past.append(t_fc), np.concatenate([y_past, y])
+        elif hist is not None:
+            x, y = t_hist.append(t_fc[1:]), np.concatenate([hist[k], y[1:]])
+        fig.add_trace(go.Scatter(
+            x=x, y=np.round(y, 0), name=names[k], mode="lines",
+            line=dict(color=LINES[idx % len(LINES)], width=2),
+            fill="tozeroy", fillcolor=FILLS[idx % len(FILLS)],
+            hovertemplate=f"<b>{names[k]}</b><br>%{{x|%d/%m %H:%M}}: %{{y:.0f}} L<extra></extra>",
+        ))
+        if idx == 0:
+            fig.add_hline(y=float(tanks["reorder_point_l"].iloc[k]), **REORDER_LINE)
+
+    fig.add_vline(x=now, line_dash="dash", line_color="rgba(255,255,255,0.22)", line_width=1)
+    fig.add_annotation(x=now, y=1, yref="paper", text="TODAY", showarrow=False,
+                       font=dict(color="rgba(210,225,255,0.45)", size=8, family=FONT),
+                       yanchor="top", xanchor="left", xshift=4)
+    fig.update_layout(template="allanray_ts", height=height, xaxis_tickformat="%d/%m")
+    return fig
+
+
+def history_figure(rows: pd.DataFrame, names: dict, height: int, reorder_l=None) -> go.Figure | None:
+    """Mean (LTTB) + band min/max per entity; layout.meta = resolusi + jumlah titik."""
+    if rows.empty:
+        return None
+    fig = go.Figure()
+    for idx, (ent, g) in enumerate(rows.groupby("entity", sort=False)):
+        color, name = LINES[idx % len(LINES)], names.get(ent, ent)
+        fig.add_trace(go.Scatter(x=g["time"], y=g["max"].round(0), mode="lines", line=dict(width=0),
+                                 showlegend=False, hoverinfo="skip", legendgroup=ent))
+        fig.add_trace(go.Scatter(x=g["time"], y=g["min"].round(0), mode="lines", line=dict(width=0),
+                                 fill="tonexty", fillcolor=_rgba(color, 0.16),
+                                 showlegend=False, hoverinfo="skip", legendgroup=ent))
+        fig.add_trace(go.Scatter(
+            x=g["time"], y=g["mean"].round(0), name=name, mode="lines", legendgroup=ent,
+            line=dict(color=color, width=1.6),
+            hovertemplate=f"<b>{name}</b><br>%{{x|%d/%m %H:%M}}: %{{y:.0f}} L<extra></extra>",
+        ))
+    if reorder_l is not None:
+        fig.add_hline(y=float(reorder_l), **REORDER_LINE)
+    fig.update_layout(template="allanray_ts", height=height,
+                      meta={"resolution": rows.attrs.get("resolution", "-"), "points": len(rows)})
+    return fig
+
+
+def donut_figure(labels, values, height: int, colors: dict | None = None, unit: str = "Trucks") -> go.Figure:
+    colors = colors or STATUS_COLORS
+    fig = go.Figure(go.Pie(
+        labels=list(labels), values=list(values),
+        marker=dict(colors=[colors.get(s, "#5599ff") for s in labels]),
+        hovertemplate=f"<b>%{{label}}</b><br>%{{value}} {unit.lower()} (%{{percent}})<extra></extra>",
+    ))
+    fig.update_layout(
+        template="allanray_donut", height=height,
+        annotations=[dict(
+            text=f"<b>{int(sum(values))}</b><br><span style='font-size:9px'>{unit}</span>",
+            x=0.5, y=0.5, showarrow=False,
+            font=dict(size=18, family="Rajdhani", color="#eef3ff"),
+        )],
+    )
+    return fig
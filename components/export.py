@@ -0,0 +1,135 @@
+import io
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from components.tables import frame_fingerprint
+
+# ─────────────────────────────────────────────────────────────
+# Export jobs — file laporan dibangun on-demand di worker thread,
+# di-cache per data snapshot (fingerprint frame). Rerun Streamlit
+# hanya membaca status job; tidak ada workbook yang dibangun ulang
+# tiap autorefresh.
+# ─────────────────────────────────────────────────────────────
+CHUNK_ROWS = 5_000
+_RESULTS_MAX = 8
+_FP_MAX = 64
+
+
+@dataclass
+class ExportJob:
+    kind: str
+    key: tuple
+    status: str = "running"            # running → done / error
+    data: bytes | None = None
+    error: str | None = None
+    rows: int = 0                      # progress: baris yang sudah ditulis
+    started: float = field(default_factory=time.monotonic)
+    elapsed_s: float | None = None
+
+
+class ExportJobs:
+    """One worker pool + LRU of finished exports keyed on (kind, data key)."""
+
+    def __init__(self, max_workers: int = 2, max_results: int = _RESULTS_MAX):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_results = max_results
+
+    def get(self, kind: str, key: tuple) -> ExportJob | None:
+        with self._lock:
+            job = self._jobs.get((kind, key))
+            if job is not None:
+                self._jobs.move_to_end((kind, key))
+            return job
+
+    def submit(self, kind: str, key: tuple, build) -> ExportJob:
+        """Start ``build(job) -> bytes`` unless the same export is already running / done."""
+        with self._lock:
+            job = self._jobs.get((kind, key))
+            if job is not None and job.status != "error":
+                return job
+            job = ExportJob(kind, key)
+            self._jobs[(kind, key)] = job
+            while len(self._jobs) > self.max_results:
+                self._jobs.popitem(last=False)
+        self._pool.submit(self._run, job, build)
+        return job
+
+    @staticmethod
+    def _run(job: ExportJob, build):
+        try:
+            job.data = build(job)
+            job.status = "done"
+        except Exception as e:
+            job.error = repr(e)
+            job.status = "error"
+        job.elapsed_s = round(time.monotonic() - job.started, 2)
+
+
+jobs = ExportJobs()
+
+_fingerprints = OrderedDict()          # id(df) -> (df, fingerprint); frame snapshot dipakai bersama
+_fp_lock = threading.Lock()
+
+
+def data_key(*frames) -> tuple:
+    """Snapshot key for a set of frames: content fingerprint, memoized per frame object."""
+    out = []
+    for df in frames:
+        if df is None:
+            out.append(None)
+            continue
+        with _fp_lock:
+            hit = _fingerprints.get(id(df))
+        if hit is None or hit[0] is not df:
+            hit = (df, frame_fingerprint(df))
+            with _fp_lock:
+                _fingerprints[id(df)] = hit
+                while len(_fingerprints) > _FP_MAX:
+                    _fingerprints.popitem(last=False)
+        out.append(hit[1])
+    return tuple(out)
+
+
+# ─────────────────────────────────────────────────────────────
+# Excel — openpyxl write-only (constant memory), per chunk
+# ─────────────────────────────────────────────────────────────
+def _excel_values(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Kolom → nilai yang bisa ditulis openpyxl: categorical → object, NaN/NaT → None."""
+    out = {}
+    for col in chunk.columns:
+        s = chunk[col]
+        if pd.api.types.is_datetime64_any_dtype(s):
+            s = s.dt.tz_localize(None) if s.dt.tz is not None else s
+            out[col] = np.where(s.notna(), s.dt.to_pydatetime(), None)
+        else:
+            s = s.astype(object)
+            out[col] = s.where(s.notna(), None).to_numpy()
+    return pd.DataFrame(out, columns=chunk.columns)
+
+
+def write_excel(sheets: dict, job: ExportJob | None = None, chunk_rows: int = CHUNK_ROWS) -> bytes:
+    """{sheet name: frame} → .xlsx bytes; baris di-stream per chunk ke write-only workbook."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, df in sheets.items():
+        if df is None:
+            continue
+        ws = wb.create_sheet(title=name[:31])
+        ws.append([str(c) for c in df.columns])
+        for lo in range(0, len(df), chunk_rows):
+            for row in _excel_values(df.iloc[lo:lo + chunk_rows]).itertuples(index=False, name=None):
+                ws.append(row)
+            if job is not None:
+                job.rows += min(chunk_rows, len(df) - lo)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
@@ -1,3 +1,7 @@
+import json
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -11,67 +15,118 @@ except Exception:
     pdk = None
 
 
+# ─────────────────────────────────────────────────────────────
+# Street map — base map (tiles saja) terpisah dari layer truck.
+# st_folium menormalkan id element, jadi script base map identik antar
+# tick untuk site/zoom yang sama → komponen tidak di-remount, peta di
+# client tidak reset; truck dikirim via feature_group_to_add dan hanya
+# layer itu yang diganti di browser.
+# ─────────────────────────────────────────────────────────────
+TILES_URL = "https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png"
+_LAYER_CACHE_MAX = 32
+
+_truck_layers = OrderedDict()   # fingerprint posisi/status -> FeatureGroup
+
+
+def _status_color(status: str) -> str:
+    s = (status or "").upper()
+    if "RENT" in s or "ON" in s:
+        return "#2deca0"
+    if "MAINT" in s:
+        return "#4aa3ff"
+    if "LOST" in s or "ALERT" in s:
+        return "#ff3b6b"
+    if "AVAIL" in s:
+        return "#ffd166"
+    return "#7a8aa6"
+
+
+def _base_map(lat0: float, lon0: float, zoom_start: int) -> folium.Map:
+    """Tiles-only map. Dibuat baru tiap call (murah, tanpa marker): folium menambah
+    script ke root figure setiap render, jadi objek Map yang sama tidak bisa dipakai ulang."""
+    m = folium.Map(location=[lat0, lon0], zoom_start=zoom_start, control_scale=True, tiles=None)
+    folium.TileLayer(tiles=TILES_URL, attr="CartoDB Dark Matter", name="Dark Matter", control=False).add_to(m)
+    return m
+
+
+def _str_hash(values: np.ndarray) -> bytes:
+    """Content hash of a string array (tobytes() pada object dtype = pointer, bukan isi)."""
+    return pd.util.hash_array(values.astype(object)).tobytes()
+
+
+def _truck_layer(trucks_df: pd.DataFrame, lat0: float, lon0: float, trails=None) -> folium.FeatureGroup:
+    """Truck markers (+ optional telemetry trails) as one FeatureGroup, reused while unchanged."""
+    n = len(trucks_df)
+    ids = trucks_df["truck_id"].astype(str).to_numpy() if "truck_id" in trucks_df else np.full(n, "TRK")
+    status = (trucks_df["status"].astype(str).to_numpy() if "status" in trucks_df
+              else np.full(n, "UNKNOWN"))
+    lat = (pd.to_numeric(trucks_df["lat"], errors="coerce").fillna(lat0).to_numpy(dtype=float)
+           if "lat" in trucks_df else np.full(n, lat0))
+    lon = (pd.to_numeric(trucks_df["lon"], errors="coerce").fillna(lon0).to_numpy(dtype=float)
+           if "lon" in trucks_df else np.full(n, lon0))
+
+    trail_xy = None
+    if trails is not None and not trails.empty:
+        trail_xy = np.round(trails[["lat", "lon"]].to_numpy(dtype=float), 6)
+        trail_ids = trails["truck_id"].astype(str).to_numpy()
+    # string (object dtype) → hash isi; tobytes() hanya untuk array float
+    key = hash((_str_hash(ids), _str_hash(status), np.round(lat, 6).tobytes(), np.round(lon, 6).tobytes(),
+                None if trail_xy is None else (trail_xy.tobytes(), _str_hash(trail_ids))))
+    fg = _truck_layers.get(key)
+    if fg is not None:
+        _truck_layers.move_to_end(key)
+        return fg
+
+    fg = folium.FeatureGroup(name="Trucks", control=False)
+    if trail_xy is not None:
+        # trail sudah urut per truck (oldest → newest) → potong di batas truck_id
+        cuts = np.flatnonzero(trail_ids[1:] != trail_ids[:-1]) + 1
+        for seg in np.split(trail_xy, cuts):
+            seg = seg[~np.isnan(seg).any(axis=1)]
+            if len(seg) > 1:
+                folium.PolyLine(seg.tolist(), color="#18e8ff", weight=2, opacity=0.45).add_to(fg)
+    cluster = MarkerCluster().add_to(fg)
+    colors = {s: _status_color(s) for s in set(status)}
+    for tid, st_, la, lo in zip(ids, status, lat, lon):
+        folium.CircleMarker(
+            location=[la, lo], radius=7, color=colors[st_], fill=True, fill_opacity=0.85,
+            tooltip=f"{tid} · {st_}",
+        ).add_to(cluster)
+
+    _truck_layers[key] = fg
+    while len(_truck_layers) > _LAYER_CACHE_MAX:
+        _truck_layers.popitem(last=False)
+    return fg
+
+
 def render_street_map(
     trucks_df: pd.DataFrame,
     site: dict,
     height: int = 380,
     zoom_start: int = 12,
     key: str | None = None,   # ✅ IMPORTANT
+    trails: pd.DataFrame | None = None,
+    large_threshold: int | None = None,
 ):
     """
     Folium street map (CartoDB Dark Matter).
     Key param is REQUIRED to avoid StreamlitDuplicateElementKey when map rendered twice.
+    Base map stabil per site/zoom; tiap tick hanya layer truck yang berubah.
+    trails: frame telemetry (truck_id, lat, lon, urut per truck) → polyline jejak.
+    Di atas ``large_threshold`` truck (default LARGE_FLEET_THRESHOLD) → layer agregasi deck,
+    karena folium membangun satu marker per truck dan st_folium me-render ulang semuanya tiap tick.
     """
+    threshold = LARGE_FLEET_THRESHOLD if large_threshold is None else large_threshold
+    if len(trucks_df) > threshold:
+        st.caption(f"{len(trucks_df):,} truck > {threshold:,} → peta agregasi (deck), bukan marker per truck.")
+        render_pydeck_map(trucks_df, site, large_threshold=threshold)
+        return
+
     lat0 = float(site.get("lat", -6.2))
     lon0 = float(site.get("lon", 106.8))
 
-    m = folium.Map(
-        location=[lat0, lon0],
-        zoom_start=zoom_start,
-        control_scale=True,
-        tiles=None,
-    )
-
-    folium.TileLayer(
-        tiles="https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png",
-        attr="CartoDB Dark Matter",
-        name="Dark Matter",
-        control=False,
-    ).add_to(m)
-
-    cluster = MarkerCluster().add_to(m)
-
-    # Basic status color mapping (safe fallback)
-    def _status_color(status: str) -> str:
-        s = (status or "").upper()
-        if "RENT" in s or "ON" in s:
-            return "#2deca0"
-        if "MAINT" in s:
-            return "#4aa3ff"
-        if "LOST" in s or "ALERT" in s:
-            return "#ff3b6b"
-        if "AVAIL" in s:
-            return "#ffd166"
-        return "#7a8aa6"
-
-    for _, r in trucks_df.iterrows():
-        try:
-            lat = float(r.get("lat", lat0))
-            lon = float(r.get("lon", lon0))
-        except Exception:
-            lat, lon = lat0, lon0
-
-        status = str(r.get("status", "UNKNOWN"))
-        color = _status_color(status)
-
-        folium.CircleMarker(
-            location=[lat, lon],
-            radius=7,
-            color=color,
-            fill=True,
-            fill_opacity=0.85,
-            tooltip=f"{r.get('truck_id','TRK')} · {status}",
-        ).add_to(cluster)
+    m = _base_map(lat0, lon0, zoom_start)
+    fg = _truck_layer(trucks_df, lat0, lon0, trails)
 
     # ✅ FIX: unique key per map instance
     st_folium(
@@ -79,41 +134,131 @@ def render_street_map(
         width=None,
         height=height,
         returned_objects=["zoom"],
+        feature_group_to_add=fg,
         key=key or f"folium_{site.get('name','site')}_{height}_{zoom_start}",
     )
 
 
-def render_pydeck_map(trucks_df: pd.DataFrame, site: dict):
-    """Fast GPU map via pydeck (fallback)."""
+# ─────────────────────────────────────────────────────────────
+# Deck map — scatter per truck untuk fleet kecil; di atas threshold
+# (ping rental gear, 50k+ titik) pindah ke agregasi GPU (Hexagon /
+# ScreenGrid). Data dikirim sebagai kolom ringkas (key pendek, koordinat
+# dibulatkan) dan di-bin di server kalau melewati payload budget.
+# ─────────────────────────────────────────────────────────────
+LARGE_FLEET_THRESHOLD = 2_000
+PAYLOAD_BUDGET_BYTES = 1_500_000
+COORD_DECIMALS = 5               # ~1 m
+_BIN_SIZES_DEG = (0.0001, 0.0003, 0.001, 0.003, 0.01, 0.03, 0.1, 0.3)   # ~11 m … ~33 km
+
+# Bobot "perlu perhatian" per status → warna agregat (jumlah bobot per cell/hexagon)
+STATUS_SEVERITY = {"LOST": 1.0, "ALERT": 1.0, "MAINTENANCE": 0.7, "IDLE": 0.4, "MOVING": 0.15}
+_SEVERITY_RANGE = [[45, 236, 160], [150, 230, 120], [255, 209, 102], [255, 160, 60], [255, 95, 80], [255, 59, 107]]
+
+
+def _rgb(hex_color: str) -> list:
+    h = hex_color.lstrip("#")
+    return [int(h[i:i + 2], 16) for i in (0, 2, 4)]
+
+
+def _points(df: pd.DataFrame, lat0: float, lon0: float) -> pd.DataFrame:
+    """Compact columnar frame: x, y (rounded), s = status severity."""
+    n = len(df)
+    lat = pd.to_numeric(df["lat"], errors="coerce").fillna(lat0).to_numpy(dtype=float) if "lat" in df else np.full(n, lat0)
+    lon = pd.to_numeric(df["lon"], errors="coerce").fillna(lon0).to_numpy(dtype=float) if "lon" in df else np.full(n, lon0)
+    if "status" in df:
+        status = df["status"].astype(str).str.upper()
+        sev = status.map(STATUS_SEVERITY).fillna(0.0).to_numpy(dtype=float)
+    else:
+        sev = np.zeros(n)
+    return pd.DataFrame({"x": lon.round(COORD_DECIMALS), "y": lat.round(COORD_DECIMALS), "s": sev})
+
+
+def _row_bytes(df: pd.DataFrame, sample: int = 256) -> float:
+    """Bytes per row seperti yang dikirim Deck.to_json (records di layers[i].data, indent=2), dari sampel."""
+    head = df.head(sample)
+    return len(json.dumps({"layers": [{"data": head.to_dict("records")}]}, indent=2)) / max(1, len(head))
+
+
+def _bin_to_budget(pts: pd.DataFrame, budget_bytes: int) -> pd.DataFrame:
+    """Pre-aggregate ke grid (w = count, s = mean severity) sampai muat di budget."""
+    pts = pts.assign(w=1)
+    max_rows = max(1, int(budget_bytes // _row_bytes(pts)))
+    if len(pts) <= max_rows:
+        return pts
+    x, y, s = pts["x"].to_numpy(), pts["y"].to_numpy(), pts["s"].to_numpy()
+    for cell_deg in _BIN_SIZES_DEG:
+        gx = np.floor(x / cell_deg).astype(np.int64)
+        gy = np.floor(y / cell_deg).astype(np.int64)
+        cells, inv, w = np.unique(gx * 4_000_000 + gy, return_inverse=True, return_counts=True)
+        if len(cells) <= max_rows:
+            break
+    ssum = np.bincount(inv, weights=s, minlength=len(cells))
+    cx = np.bincount(inv, weights=x, minlength=len(cells)) / w
+    cy = np.bincount(inv, weights=y, minlength=len(cells)) / w
+    return pd.DataFrame({"x": cx.round(COORD_DECIMALS), "y": cy.round(COORD_DECIMALS),
+                         "s": (ssum / w).round(3), "w": w})
+
+
+def _large_fleet_layer(pts: pd.DataFrame, aggregation: str):
+    if aggregation == "grid":
+        return pdk.Layer(
+            "ScreenGridLayer", id="fleet-agg", data=pts,
+            get_position="[x, y]", get_weight="w", cell_size_pixels=18,
+            color_range=[c + [170] for c in _SEVERITY_RANGE], pickable=False,
+        )
+    return pdk.Layer(
+        "HexagonLayer", id="fleet-agg", data=pts,
+        get_position="[x, y]", radius=250, extruded=True, elevation_scale=6, coverage=0.9,
+        get_elevation_weight="w", elevation_aggregation='"SUM"',     # quoted → literal, bukan accessor
+        get_color_weight="s * w", color_aggregation='"SUM"',
+        color_range=_SEVERITY_RANGE, pickable=True, auto_highlight=True,
+    )
+
+
+def render_pydeck_map(
+    trucks_df: pd.DataFrame,
+    site: dict,
+    large_threshold: int = LARGE_FLEET_THRESHOLD,
+    aggregation: str = "hexagon",           # "hexagon" | "grid" (mode large-fleet)
+    payload_budget: int = PAYLOAD_BUDGET_BYTES,
+):
+    """Fast GPU map via pydeck (fallback). Di atas ``large_threshold`` titik → agregasi."""
     if pdk is None:
         st.warning("pydeck tidak tersedia. Install: pip install pydeck")
         return
 
-    df = trucks_df.copy()
-
     lat0 = float(site.get("lat", -6.2))
     lon0 = float(site.get("lon", 106.8))
+    pts = _points(trucks_df, lat0, lon0)
 
-    layer = pdk.Layer(
-        "ScatterplotLayer",
-        data=df,
-        get_position="[lon, lat]",
-        get_radius=80,
-        get_fill_color="[45, 236, 160, 160]",
-        pickable=True,
-        auto_highlight=True,
-    )
-
-    view_state = pdk.ViewState(latitude=lat0, longitude=lon0, zoom=11, pitch=30)
+    if len(pts) > large_threshold:
+        agg = _bin_to_budget(pts, payload_budget)
+        layer = _large_fleet_layer(agg, aggregation)
+        tooltip = {"text": "{elevationValue} unit"} if aggregation != "grid" else None
+        view_state = pdk.ViewState(latitude=lat0, longitude=lon0, zoom=10, pitch=40)
+    else:
+        status = trucks_df["status"].astype(str) if "status" in trucks_df else pd.Series("UNKNOWN", index=trucks_df.index)
+        colors = {v: _rgb(_status_color(v)) + [190] for v in status.unique()}
+        data = pts.drop(columns="s").assign(
+            c=status.map(colors).to_numpy(),
+            **{c: trucks_df[c].astype(str).to_numpy() for c in ("truck_id", "status", "driver_name") if c in trucks_df},
+        )
+        layer = pdk.Layer(
+            "ScatterplotLayer", id="fleet-points", data=data,
+            get_position="[x, y]", get_radius=80, get_fill_color="c",
+            pickable=True, auto_highlight=True,
+        )
+        tooltip = {"text": "{truck_id}\n{status}\n{driver_name}"}
+        view_state = pdk.ViewState(latitude=lat0, longitude=lon0, zoom=11, pitch=30)
 
     deck = pdk.Deck(
         layers=[layer],
         initial_view_state=view_state,
-        tooltip={"text": "{truck_id}\n{status}\n{driver_name}"},
+        tooltip=tooltip,
         map_style="mapbox://styles/mapbox/dark-v11",
     )
 
     try:
         st.pydeck_chart(deck, width="stretch")
     except TypeError:
-        st.pydeck_chart(deck, use_container_width=True)
\ No newline at end of file
+        st.pydeck_chart(deck, use_container_width=True)
@@ -0,0 +1,260 @@
+import io
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+from config import BRAND
+from data import forecast
+from data.kpi import status_breakdown
+
+# ─────────────────────────────────────────────────────────────
+# PDF report engine — reportlab canvas, tanpa flowable Table
+# Tabel besar diformat per chunk (vectorized) lalu digambar baris demi
+# baris; page break + header kolom diulang otomatis. Dipanggil dari
+# export job (worker thread), hasil di-cache per data snapshot.
+# ─────────────────────────────────────────────────────────────
+PAGE = landscape(A4)
+MARGIN = 28
+ROW_H = 12
+CHUNK_ROWS = 2_000
+FORECAST_DAYS = 7
+
+INK = colors.HexColor("#1b2233")
+MUTED = colors.HexColor("#6b7590")
+ACCENT = colors.HexColor("#5599ff")
+GRID = colors.HexColor("#d5dbe8")
+SEVERITY_COLORS = {"DANGER": colors.HexColor("#d63333"), "WARN": colors.HexColor("#c98a00"),
+                   "INFO": colors.HexColor("#2a7fd4")}
+TANK_COLORS = [colors.HexColor(c) for c in ("#d64545", "#1aa7c4", "#8a55d6", "#c99a00", "#1fae7a")]
+
+
+class _Pdf:
+    """Canvas + cursor; new_page() menggambar header/footer."""
+
+    def __init__(self, title: str, subtitle: str):
+        self.buf = io.BytesIO()
+        self.c = canvas.Canvas(self.buf, pagesize=PAGE, pageCompression=1)
+        self.title, self.subtitle = title, subtitle
+        self.page = 0
+        self.new_page()
+
+    def new_page(self):
+        if self.page:
+            self.c.showPage()
+        self.page += 1
+        w, h = PAGE
+        self.c.setFillColor(INK)
+        self.c.setFont("Helvetica-Bold", 13)
+        self.c.drawString(MARGIN, h - MARGIN, self.title)
+        self.c.setFont("Helvetica", 8)
+        self.c.setFillColor(MUTED)
+        self.c.drawRightString(w - MARGIN, h - MARGIN, self.subtitle)
+        self.c.drawRightString(w - MARGIN, MARGIN / 2, f"page {self.page}")
+        self.c.setStrokeColor(ACCENT)
+        self.c.line(MARGIN, h - MARGIN - 5, w - MARGIN, h - MARGIN - 5)
+        self.y = h - MARGIN - 22
+
+    def ensure(self, height: float):
+        if self.y - height < MARGIN:
+            self.new_page()
+
+    def heading(self, text: str):
+        self.ensure(40)
+        self.c.setFont("Helvetica-Bold", 11)
+        self.c.setFillColor(INK)
+        self.c.drawString(MARGIN, self.y, text)
+        self.y -= 16
+
+    def note(self, text: str):
+        self.c.setFont("Helvetica", 8)
+        self.c.setFillColor(MUTED)
+        self.c.drawString(MARGIN, self.y, text)
+        self.y -= 12
+
+    def bytes(self) -> bytes:
+        self.c.save()
+        return self.buf.getvalue()
+
+
+# ─────────────────────────────────────────────────────────────
+# Blocks
+# ─────────────────────────────────────────────────────────────
+def _kpi_block(pdf: _Pdf, kpi):
+    items = [("Trucks active", f"{kpi.trucks_active}/{kpi.trucks_total}"), ("Fuel", f"{kpi.fuel_l:,} L"),
+             ("Active projects", kpi.active_projects), ("Assets", f"{kpi.assets_total:,}"),
+             ("On rent", f"{kpi.on_rent:,}"), ("Available", f"{kpi.available:,}"),
+             ("Maintenance", f"{kpi.maintenance:,}"), ("Lost", f"{kpi.lost:,}")]
+    pdf.heading("Executive Summary")
+    box_w = (PAGE[0] - 2 * MARGIN) / len(items)
+    pdf.ensure(44)
+    for i, (label, value) in enumerate(items):
+        x = MARGIN + i * box_w
+        pdf.c.setStrokeColor(GRID)
+        pdf.c.roundRect(x + 2, pdf.y - 34, box_w - 4, 40, 4)
+        pdf.c.setFont("Helvetica", 7)
+        pdf.c.setFillColor(MUTED)
+        pdf.c.drawString(x + 8, pdf.y - 4, label.upper())
+        pdf.c.setFont("Helvetica-Bold", 14)
+        pdf.c.setFillColor(INK)
+        pdf.c.drawString(x + 8, pdf.y - 24, str(value))
+    pdf.y -= 52
+
+
+def _forecast_block(pdf: _Pdf, tanks: pd.DataFrame):
+    pdf.heading(f"Fuel Forecast ({FORECAST_DAYS} hari)")
+    if tanks.empty:
+        pdf.note("Tidak ada tank.")
+        return
+    fc = forecast.forecast(tanks, tanks["burn_l_per_h"] if "burn_l_per_h" in tanks else None,
+                           horizon_h=FORECAST_DAYS * 24, step_h=24)
+    days, levels = [t.to_pydatetime() for t in fc.times], fc.levels
+    to_reorder, to_empty = fc.hours_to_reorder / 24, fc.hours_to_empty / 24
+    chart_w, chart_h = 430, 130
+    pdf.ensure(chart_h + 30)
+    x0, y0 = MARGIN + 30, pdf.y - chart_h
+    top = float(tanks["capacity_l"].max())
+    c = pdf.c
+    c.setStrokeColor(GRID)
+    c.setFont("Helvetica", 7)
+    c.setFillColor(MUTED)
+    for frac in (0, 0.25, 0.5, 0.75, 1.0):
+        y = y0 + frac * chart_h
+        c.line(x0, y, x0 + chart_w, y)
+        c.drawRightString(x0 - 4, y - 2, f"{top * frac:,.0f}")
+    for i, d in enumerate(days):
+        c.drawCentredString(x0 + i * chart_w / (len(days) - 1), y0 - 10, d.strftime("%d/%m"))
+    for k in range(len(tanks)):
+        c.setStrokeColor(TANK_COLORS[k % len(TANK_COLORS)])
+        c.setLineWidth(1.6)
+        pts = [(x0 + i * chart_w / (len(days) - 1), y0 + levels[k, i] / top * chart_h) for i in range(len(days))]
+        path = c.beginPath()
+        path.moveTo(*pts[0])
+        for p in pts[1:]:
+            path.lineTo(*p)
+        c.drawPath(path)
+        ry = y0 + float(tanks["reorder_point_l"].iloc[k]) / top * chart_h
+        c.setDash(2, 2)
+        c.setLineWidth(0.6)
+        c.line(x0, ry, x0 + chart_w, ry)
+        c.setDash()
+    c.setLineWidth(1)
+
+    # ringkasan per tank di kanan chart
+    tx0, ty = x0 + chart_w + 30, pdf.y
+    c.setFont("Helvetica-Bold", 8)
+    c.setFillColor(INK)
+    for x, h in zip((0, 170, 230, 290, 350), ("Tank", "Level", "Reorder", "Days to reorder", "Days to empty")):
+        c.drawString(tx0 + x, ty, h)
+    c.setFont("Helvetica", 8)
+    for k, (_, r) in enumerate(tanks.iterrows()):
+        ty -= ROW_H
+        c.setFillColor(TANK_COLORS[k % len(TANK_COLORS)])
+        c.rect(tx0, ty, 6, 6, stroke=0, fill=1)
+        c.setFillColor(colors.HexColor("#d63333") if to_reorder[k] < 2 else INK)
+        c.drawString(tx0 + 10, ty, str(r["tank_name"])[:32])
+        c.drawString(tx0 + 170, ty, f"{r['level_l']:,} L")
+        c.drawString(tx0 + 230, ty, f"{r['reorder_point_l']:,} L")
+        c.drawString(tx0 + 290, ty, f"{to_reorder[k]:.1f} d")
+        c.drawString(tx0 + 350, ty, f"{to_empty[k]:.1f} d")
+    pdf.y = y0 - 26
+
+
+def _fmt(s: pd.Series) -> np.ndarray:
+    """Column → display strings (vectorized, satu chunk)."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        out = s.dt.strftime("%Y-%m-%d %H:%M")
+    elif pd.api.types.is_float_dtype(s):
+        out = s.map("{:,.1f}".format)
+    else:
+        out = s.astype(str)
+    return out.where(s.notna(), "-").to_numpy()
+
+
+def _table(pdf: _Pdf, title: str, chunks, columns: list, widths: list, total: int | None = None,
+           color_col: str | None = None):
+    """Stream rows from an iterable of frames; header diulang di tiap halaman."""
+    pdf.heading(title + (f" ({total:,} rows)" if total is not None else ""))
+    c = pdf.c
+
+    def header():
+        c.setFont("Helvetica-Bold", 7.5)
+        c.setFillColor(INK)
+        x = MARGIN
+        for col, w in zip(columns, widths):
+            c.drawString(x, pdf.y, col)
+            x += w
+        c.setStrokeColor(GRID)
+        c.line(MARGIN, pdf.y - 3, PAGE[0] - MARGIN, pdf.y - 3)
+        pdf.y -= ROW_H
+        c.setFont("Helvetica", 7.5)
+
+    pdf.ensure(3 * ROW_H)
+    header()
+    n = 0
+    for chunk in chunks:
+        cells = [_fmt(chunk[col]) for col in columns]
+        tint = chunk[color_col].astype(str).to_numpy() if color_col else None
+        for i in range(len(chunk)):
+            if pdf.y < MARGIN + ROW_H:
+                pdf.new_page()
+                header()
+            c.setFillColor(SEVERITY_COLORS.get(tint[i], INK) if tint is not None else INK)
+            x = MARGIN
+            for col_cells, w in zip(cells, widths):
+                c.drawString(x, pdf.y, col_cells[i][: int(w / 4)])
+                x += w
+            pdf.y -= ROW_H
+            n += 1
+    if n == 0:
+        pdf.note("— tidak ada data —")
+    pdf.y -= 8
+
+
+def _chunks(df: pd.DataFrame, rows: int = CHUNK_ROWS):
+    for lo in range(0, len(df), rows):
+        yield df.iloc[lo:lo + rows]
+
+
+def overdue(inventory: pd.DataFrame, now=None) -> pd.DataFrame:
+    """ON-RENT assets past due_return, paling lama telat dulu."""
+    now = pd.Timestamp(now or datetime.now())
+    due = pd.to_datetime(inventory["due_return"], errors="coerce")
+    mask = (inventory["status"].astype(str) == "ON-RENT").to_numpy() & (due < now).to_numpy()
+    out = inventory.loc[mask, ["asset_id", "category", "project", "assigned_to", "location"]].copy()
+    out["due_return"] = due[mask]
+    out["late_h"] = ((now - out["due_return"]).dt.total_seconds() / 3600).round(1)
+    return out.sort_values("due_return", kind="stable")
+
+
+def build_report(kpi, tanks: pd.DataFrame, inventory: pd.DataFrame, alerts: pd.DataFrame,
+                 project: str = "ALL", job=None) -> bytes:
+    """KPIs · fuel forecast · inventory summary · overdue list · alerts → PDF bytes."""
+    now = datetime.now()
+    pdf = _Pdf(f"{BRAND} — Command Center Report",
+               f"project {project} · dibuat {now.strftime('%Y-%m-%d %H:%M')}")
+    _kpi_block(pdf, kpi)
+    _forecast_block(pdf, tanks)
+
+    for by in ("project", "location"):
+        summary = status_breakdown(inventory, by).reset_index()
+        summary.columns = [str(c) for c in summary.columns]
+        _table(pdf, f"Inventory per {by}", [summary], list(summary.columns), [120] + [80] * (summary.shape[1] - 1))
+
+    late = overdue(inventory, now)
+    _table(pdf, "Overdue Returns", _chunks(late), list(late.columns),
+           [70, 80, 70, 70, 80, 110, 60], total=len(late))
+    if job is not None:
+        job.rows += len(late)
+
+    if alerts is not None and not alerts.empty:
+        cols = [c for c in ("time", "severity", "rule", "entity", "message") if c in alerts.columns]
+        widths = {"time": 90, "severity": 60, "rule": 70, "entity": 70, "message": 450}
+        _table(pdf, "Alerts", _chunks(alerts), cols, [widths[c] for c in cols], total=len(alerts),
+               color_col="severity" if "severity" in cols else None)
+        if job is not None:
+            job.rows += len(alerts)
+    return pdf.bytes()
@@ -0,0 +1,297 @@
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+
+from data.filter_index import index_for
+
+# ─────────────────────────────────────────────────────────────
+# Table renderer — column-wise HTML, CSS classes, cached output
+# Tiap kolom diformat sebagai satu operasi string vectorized, style
+# didefinisikan sekali per tabel (iframe components.html terisolasi),
+# hasil HTML di-cache per fingerprint frame yang ditampilkan.
+# ─────────────────────────────────────────────────────────────
+TABLE_CSS = """
+.at-wrap{overflow-x:auto;border-radius:13px;border:1px solid rgba(255,255,255,0.12);
+  background:rgba(14,22,44,0.85);overflow-y:auto;}
+.at{width:100%;border-collapse:collapse;min-width:420px;font-family:DM Sans,sans-serif;}
+.at thead tr{position:sticky;top:0;background:rgba(12,20,42,0.98);z-index:1;}
+.at th{padding:6px 10px;text-align:left;font-family:Rajdhani,sans-serif;font-size:11px;font-weight:700;
+  letter-spacing:0.12em;text-transform:uppercase;color:rgba(180,205,255,0.70);
+  border-bottom:1px solid rgba(255,255,255,0.10);white-space:nowrap;}
+.at td{padding:5px 10px;border-bottom:1px solid rgba(255,255,255,0.05);}
+.at tbody tr:nth-child(odd){background:rgba(255,255,255,0.03);}
+.mono{font-family:JetBrains Mono,monospace;}
+.c-id{font-family:JetBrains Mono,monospace;font-size:10px;color:#18e8ff;font-weight:700;}
+.c-id2{font-family:JetBrains Mono,monospace;font-size:9.5px;color:#18e8ff;}
+.c-proj{font-family:JetBrains Mono,monospace;font-size:9.5px;color:#bb6fff;font-weight:600;}
+.c-txt{font-size:10.5px;color:rgba(210,225,255,0.78);}
+.c-ts{font-family:JetBrains Mono,monospace;font-size:9px;color:rgba(160,185,230,0.50);}
+.c-name{font-size:11px;color:rgba(210,225,255,0.88);}
+.c-small{font-family:JetBrains Mono,monospace;font-size:9.5px;color:rgba(180,200,240,0.60);}
+.c-reord{font-family:JetBrains Mono,monospace;font-size:9.5px;color:rgba(255,193,7,0.80);}
+.badge{display:inline-flex;align-items:center;gap:4px;padding:2px 9px;border-radius:100px;
+  background:var(--bg);border:1px solid var(--c);font-family:JetBrains Mono,monospace;font-size:9.5px;
+  font-weight:700;letter-spacing:0.06em;color:var(--c);}
+.badge i{width:5px;height:5px;border-radius:50%;background:var(--c);box-shadow:0 0 5px var(--c);}
+.act{font-family:JetBrains Mono,monospace;font-size:9.5px;font-weight:700;letter-spacing:0.06em;color:var(--c);}
+.lvl{display:flex;align-items:center;gap:7px;min-width:100px;}
+.lvl .track{flex:1;height:6px;border-radius:99px;background:rgba(255,255,255,0.09);overflow:hidden;}
+.lvl .fill{height:100%;border-radius:99px;background:var(--c);box-shadow:0 0 7px var(--c);}
+.lvl .pct{font-family:Rajdhani,sans-serif;font-size:11px;font-weight:700;color:var(--t);min-width:34px;}
+.lvl-num{font-family:JetBrains Mono,monospace;font-size:10px;font-weight:700;color:var(--t);}
+.tone-low{--c:#ff4444;--t:#ff6666;} .tone-mid{--c:#ffc107;--t:#ffd740;} .tone-ok{--c:#2deca0;--t:#50ffb8;}
+"""
+
+# status / action → (text color, background) — satu class per nilai, bukan inline per cell
+STATUS_COLORS = {
+    "AVAILABLE":   ("#2deca0", "rgba(45,236,160,0.14)"),
+    "ON-RENT":     ("#18e8ff", "rgba(24,232,255,0.14)"),
+    "MAINTENANCE": ("#ffc107", "rgba(255,193,7,0.14)"),
+    "LOST":        ("#ff4444", "rgba(255,68,68,0.16)"),
+    "MOVING":      ("#18e8ff", "rgba(24,232,255,0.14)"),
+    "ON-SITE":     ("#2deca0", "rgba(45,236,160,0.14)"),
+    "IDLE":        ("#bb6fff", "rgba(187,111,255,0.14)"),
+}
+ACTION_COLORS = {
+    "RENT_OUT": "#18e8ff", "CHECKOUT": "#18e8ff", "RETURN": "#2deca0", "INSPECT": "#ffc107",
+    "LOST": "#ff4444", "MAINTENANCE": "#bb6fff", "TRANSFER": "#5599ff",
+}
+_DEFAULT_C, _DEFAULT_BG = "#aabbdd", "rgba(170,187,221,0.12)"
+
+
+def _slug(v: str) -> str:
+    return v.lower().replace("_", "-")
+
+
+def _palette_css() -> str:
+    rules = [f".s-{_slug(k)}{{--c:{c};--bg:{bg};}}" for k, (c, bg) in STATUS_COLORS.items()]
+    rules += [f".a-{_slug(k)}{{--c:{c};}}" for k, c in ACTION_COLORS.items()]
+    rules.append(f".s-x{{--c:{_DEFAULT_C};--bg:{_DEFAULT_BG};}} .a-x{{--c:{_DEFAULT_C};}}")
+    return "\n".join(rules)
+
+
+_CSS = "<style>" + TABLE_CSS + _palette_css() + "</style>"
+
+
+# ─────────────────────────────────────────────────────────────
+# Vectorized cell formatters (Series → Series of "<td>…</td>")
+# ─────────────────────────────────────────────────────────────
+def cell_text(s: pd.Series, empty: str = "—") -> pd.Series:
+    """Display text, HTML-escaped; None / NaN / NaT / "" → ``empty``."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        out = s.dt.strftime("%m-%d %H:%M")
+    else:
+        out = s.astype(str)
+    out = out.str.replace("&", "&amp;").str.replace("<", "&lt;").str.replace(">", "&gt;")
+    return out.where(s.notna() & (out != ""), empty)
+
+
+def cell_span(s: pd.Series, cls: str) -> pd.Series:
+    return f'<td><span class="{cls}">' + cell_text(s) + "</span></td>"
+
+
+_STATUS_CLS = {k: f"s-{_slug(k)}" for k in STATUS_COLORS}
+_ACTION_CLS = {k: f"a-{_slug(k)}" for k in ACTION_COLORS}
+
+
+def cell_badge(s: pd.Series) -> pd.Series:
+    txt = cell_text(s)
+    cls = txt.str.upper().map(_STATUS_CLS).fillna("s-x")
+    return '<td><span class="badge ' + cls + '"><i></i>' + txt + "</span></td>"
+
+
+def cell_action(s: pd.Series) -> pd.Series:
+    txt = cell_text(s)
+    cls = txt.str.upper().map(_ACTION_CLS).fillna("a-x")
+    return '<td><span class="act ' + cls + '">' + txt + "</span></td>"
+
+
+def cell_project(s: pd.Series) -> pd.Series:
+    txt = cell_text(s)
+    cls = np.where(txt.isin(["-", "—", ""]).to_numpy(), "c-txt", "c-proj")
+    return '<td><span class="' + pd.Series(cls, index=s.index) + '">' + txt + "</span></td>"
+
+
+def build_rows(cells) -> str:
+    """Gabungkan kolom-kolom cell menjadi <tr> (satu join, tanpa += per row)."""
+    cells = list(cells)
+    if not cells or len(cells[0]) == 0:
+        return ""
+    row = cells[0]
+    for c in cells[1:]:
+        row = row + c
+    return "<tr>" + "</tr><tr>".join(row.tolist()) + "</tr>"
+
+
+def wrap_table(headers, body_html: str, height_px: int) -> str:
+    ths = "".join(f"<th>{h}</th>" for h in headers)
+    return (
+        f'{_CSS}<div class="at-wrap" style="max-height:{height_px}px;">'
+        f'<table class="at"><thead><tr>{ths}</tr></thead><tbody>{body_html}</tbody></table></div>'
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# Output cache — key = (kind, params, fingerprint frame yang ditampilkan)
+# ─────────────────────────────────────────────────────────────
+_CACHE_MAX = 64
+_cache = OrderedDict()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> int:
+    if df.empty:
+        return hash(tuple(df.columns))
+    # urutan baris ikut di-hash: sort berbeda atas rows yang sama → HTML berbeda
+    h = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hash((tuple(df.columns), len(df), zlib.crc32(h.tobytes())))
+
+
+def cached_html(kind: str, view: pd.DataFrame, params: tuple, build) -> str:
+    key = (kind, params, frame_fingerprint(view))
+    html = _cache.get(key)
+    if html is None:
+        html = build()
+        _cache[key] = html
+        while len(_cache) > _CACHE_MAX:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return html
+
+
+def show(html: str, height_px: int):
+    components.html(html, height=height_px + 48, scrolling=False)
+
+
+# ─────────────────────────────────────────────────────────────
+# Paged view — filter / search / sort di server, hanya satu halaman
+# yang dirender & dikirim ke browser (audit trail 1M row tetap ringan).
+# ─────────────────────────────────────────────────────────────
+_QUERY_MAX = 16
+_queries = OrderedDict()      # (id(df), len, query) -> (df, positions); df ditahan supaya id tidak dipakai ulang
+
+
+def _contains(s: pd.Series, q: str) -> np.ndarray:
+    """Case-insensitive substring match; categorical → match categories sekali, lalu take by code."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        hit = np.asarray(s.cat.categories.astype(str).str.contains(q, case=False, regex=False), dtype=bool)
+        codes = s.cat.codes.to_numpy()
+        return (codes >= 0) & hit[np.maximum(codes, 0)]
+    if pd.api.types.is_datetime64_any_dtype(s) or pd.api.types.is_numeric_dtype(s):
+        return np.zeros(len(s), dtype=bool)
+    return s.str.contains(q, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+
+def query_positions(df: pd.DataFrame, search: str = "", filters=None, search_cols=(),
+                    sort_by: str | None = None, descending: bool = False) -> np.ndarray:
+    """Row positions of ``df`` matching filters {col: value} + search, in sort order."""
+    key = (id(df), len(df), search, tuple(sorted((filters or {}).items())), tuple(search_cols), sort_by, descending)
+    hit = _queries.get(key)
+    if hit is not None and hit[0] is df:
+        _queries.move_to_end(key)
+        return hit[1]
+
+    # filter → lookup FilterIndex (O(hasil)); search hanya di atas baris yang lolos filter
+    pos = index_for(df).select(filters)
+    if search and len(pos):
+        sub = df.iloc[pos] if len(pos) < len(df) else df
+        found = np.zeros(len(pos), dtype=bool)
+        for col in search_cols:
+            found |= _contains(sub[col], search)
+        pos = pos[found]
+
+    if sort_by and len(pos):
+        col = df[sort_by].iloc[pos].reset_index(drop=True)
+        order = col.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+        pos = pos[order]
+
+    _queries[key] = (df, pos)
+    while len(_queries) > _QUERY_MAX:
+        _queries.popitem(last=False)
+    return pos
+
+
+def _filter_options(s: pd.Series) -> list:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return [str(c) for c in s.cat.categories]
+    return sorted(str(v) for v in s.dropna().unique() if v != "-")
+
+
+def _query_controls(key: str, options: dict, sort_opts: list, default_sort, default_desc: bool) -> tuple:
+    """Search / filter / sort widgets → (search, filters, sort_by, descending, page column)."""
+    ALL = "ALL"
+    cols = st.columns([2.2] + [1.3] * len(options) + [1.3, 0.7, 0.9])
+    search = cols[0].text_input("Search", key=f"{key}_q", placeholder="Search…",
+                                label_visibility="collapsed").strip()
+    filters = {}
+    for box, (col, opts) in zip(cols[1:], options.items()):
+        choice = box.selectbox(col, [ALL] + list(opts), key=f"{key}_f_{col}",
+                               label_visibility="collapsed", format_func=lambda v, c=col: f"{c}: {v}")
+        if choice != ALL:
+            filters[col] = choice
+    sort_by = cols[-3].selectbox("Sort", sort_opts, key=f"{key}_sort", label_visibility="collapsed",
+                                 index=sort_opts.index(default_sort) if default_sort in sort_opts else 0,
+                                 format_func=lambda v: f"↕ {v}")
+    descending = cols[-2].toggle("↓", value=default_desc, key=f"{key}_desc")
+    return search, filters, sort_by, descending, cols[-1]
+
+
+def _page_number(key: str, box, sig: tuple, n_match: int, page_size: int) -> int:
+    n_pages = max(1, -(-n_match // page_size))
+    # query berubah → balik ke halaman 1 (harus di-set sebelum widget dibuat)
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_sig") != sig:
+        st.session_state[f"{key}_sig"] = sig
+        st.session_state[page_key] = 1
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    return int(box.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key,
+                                label_visibility="collapsed"))
+
+
+def _page_caption(lo: int, shown: int, n_match: int, n_total: int, page: int, page_size: int):
+    n_pages = max(1, -(-n_match // page_size))
+    st.caption(f"{lo + 1 if shown else 0:,}–{lo + shown:,} dari {n_match:,} rows "
+               f"(total {n_total:,}) · page {page}/{n_pages}")
+
+
+def paged_view(df: pd.DataFrame, key: str, page_size: int = 50, search_cols=(), filter_cols=(),
+               sort_cols=(), default_sort: str | None = None, default_desc: bool = False) -> pd.DataFrame:
+    """Render search / filter / sort / page controls and return only the visible page of ``df``."""
+    options = {col: _filter_options(df[col]) for col in filter_cols}
+    sort_opts = list(sort_cols) or list(df.columns)
+    search, filters, sort_by, descending, box = _query_controls(key, options, sort_opts, default_sort, default_desc)
+
+    pos = query_positions(df, search, filters, search_cols, sort_by, descending)
+    sig = (search, tuple(sorted(filters.items())), sort_by, descending)
+    page = _page_number(key, box, sig, len(pos), page_size)
+
+    lo = (page - 1) * page_size
+    window = pos[lo:lo + page_size]
+    _page_caption(lo, len(window), len(pos), len(df), page, page_size)
+    return df.iloc[window]
+
+
+def paged_query(fetch, key: str, options: dict, sort_cols, n_total: int, page_size: int = 50,
+                default_sort: str | None = None, default_desc: bool = False) -> pd.DataFrame:
+    """Same controls as paged_view, tapi halaman diambil dari database.
+
+    fetch(search, filters, sort_by, descending, limit, offset) → (page frame, n_match).
+    Halaman di-fetch ulang hanya kalau nomor halaman perlu di-clamp (hasil query menyusut).
+    """
+    sort_opts = list(sort_cols)
+    search, filters, sort_by, descending, box = _query_controls(key, options, sort_opts, default_sort, default_desc)
+    sig = (search, tuple(sorted(filters.items())), sort_by, descending)
+
+    page = st.session_state.get(f"{key}_page", 1) if st.session_state.get(f"{key}_sig") == sig else 1
+    out, n_match = fetch(search, filters, sort_by, descending, page_size, (page - 1) * page_size)
+    clamped = _page_number(key, box, sig, n_match, page_size)
+    if clamped != page:
+        out, n_match = fetch(search, filters, sort_by, descending, page_size, (clamped - 1) * page_size)
+    lo = (clamped - 1) * page_size
+    _page_caption(lo, len(out), n_match, n_total, clamped, page_size)
+    return out
@@ -1,3 +1,5 @@
+import os
+
 BRAND = "Allanray Teknologi Semesta"
 
 PROJECTS = ["FILM-A", "FILM-B", "ADS-X", "DOCU-Z"]
@@ -14,10 +16,20 @@ EQUIP_CATEGORIES = [
 
 PEOPLE_ROLES = ["Driver", "DP", "Gaffer", "Sound", "Grip", "Producer", "Runner", "Warehouse", "Tech"]
 
-WAREHOUSE = {"name": "Allanray Warehouse", "lat": -6.200, "lon": 106.816}
+# Geofence: radius_km per lokasi; opsional "polygon": [(lat, lon), ...] menggantikan radius
+WAREHOUSE = {"name": "Allanray Warehouse", "lat": -6.200, "lon": 106.816, "radius_km": 6.0}
 
 SITES = [
-    {"name": "Set Site 01", "lat": -6.170, "lon": 106.830},
-    {"name": "Set Site 02", "lat": -6.230, "lon": 106.790},
-    {"name": "Set Site 03", "lat": -6.260, "lon": 106.850},
+    {"name": "Set Site 01", "lat": -6.170, "lon": 106.830, "radius_km": 6.0},
+    {"name": "Set Site 02", "lat": -6.230, "lon": 106.790, "radius_km": 6.0},
+    {"name": "Set Site 03", "lat": -6.260, "lon": 106.850, "radius_km": 6.0},
 ]
+
+# Load-test scale factors: SF1 = ukuran demo (35 orang, n_trucks, 50 aset/kategori, 160 transaksi)
+SCALE_FACTORS = {"SF1": 1, "SF10": 10, "SF100": 100, "SF1000": 1000, "SF10000": 10000}
+# Dashboard live me-materialize dataset di memory → dibatasi; SF di atasnya hanya lewat
+# iterator chunked di bench (python -m bench.run --sf 1000)
+DASHBOARD_MAX_SF = 100
+
+# Storage: SQLite; STORAGE_DIR kosong → database in-memory per proses
+STORAGE_DIR = os.environ.get("ALLANRAY_STORAGE_DIR", "")
@@ -0,0 +1,237 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+from data.geofence import FenceIndex
+
+# ─────────────────────────────────────────────────────────────
+# Rule-based alert engine
+# State disimpan antar-rerun: tiap source (tanks / inventory / trucks)
+# di-fingerprint per entity, rule hanya men-derive row yang berubah,
+# alert di-dedup per (rule, entity) dan "time" = first seen → feed stabil.
+# ─────────────────────────────────────────────────────────────
+SEVERITY_RANK = {"DANGER": 0, "WARN": 1, "INFO": 2}
+ALERT_COLUMNS = ["time", "severity", "message", "rule", "entity"]
+DUE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def due_as_datetime(due: pd.Series) -> pd.Series:
+    """due_return → datetime64 (string "-" / invalid → NaT)."""
+    if pd.api.types.is_datetime64_any_dtype(due):
+        return due
+    return pd.to_datetime(due, format=DUE_FORMAT, errors="coerce")
+
+
+class Rule(ABC):
+    """One alert rule over one source frame.
+
+    derive(rows) → candidate rows (indexed by entity id) with a "message" column,
+    dijalankan hanya untuk row yang berubah. when(state, now) → mask yang firing
+    (default: semua kandidat); override untuk rule berbasis waktu.
+    """
+
+    name = ""
+    source = ""
+    severity = "WARN"
+    columns = ()
+
+    @abstractmethod
+    def derive(self, rows: pd.DataFrame) -> pd.DataFrame:
+        ...
+
+    def when(self, state: pd.DataFrame, now) -> pd.Series:
+        return pd.Series(True, index=state.index)
+
+
+class FuelLowRule(Rule):
+    name, source, severity = "fuel_low", "tanks", "WARN"
+    columns = ("tank_name", "level_l", "reorder_point_l")
+
+    def derive(self, rows):
+        hit = rows[rows["level_l"] <= rows["reorder_point_l"]]
+        msg = ("Fuel low: " + hit["tank_name"].astype(str) + " ("
+               + hit["level_l"].astype(int).astype(str) + "L) below reorder point.")
+        return pd.DataFrame({"message": msg}, index=hit.index)
+
+
+class FuelForecastRule(Rule):
+    """Tank yang diproyeksikan menyentuh reorder point dalam ``horizon_h`` jam (data.forecast)."""
+
+    name, source, severity = "fuel_forecast", "tanks", "INFO"
+    columns = ("tank_name", "hours_to_reorder")
+
+    def __init__(self, horizon_h: float = 48.0):
+        self.horizon_h = horizon_h
+
+    def derive(self, rows):
+        if "hours_to_reorder" not in rows:
+            return pd.DataFrame({"message": pd.Series(dtype=str)})
+        h = rows["hours_to_reorder"]
+        hit = rows[(h > 0) & (h <= self.horizon_h)]
+        msg = ("Fuel forecast: " + hit["tank_name"].astype(str) + " reaches reorder point in ~"
+               + hit["hours_to_reorder"].round(0).astype(int).astype(str) + "h.")
+        return pd.DataFrame({"message": msg}, index=hit.index)
+
+
+class OverdueRule(Rule):
+    name, source, severity = "overdue", "inventory", "DANGER"
+    columns = ("status", "due_return", "category", "project")
+
+    def derive(self, rows):
+        cand = rows[rows["status"] == "ON-RENT"]
+        due = due_as_datetime(cand["due_return"])
+        cand, due = cand[due.notna()], due[due.notna()]
+        msg = ("Overdue return: " + cand.index.to_series().astype(str) + " (" + cand["category"].astype(str)
+               + ") due " + due.dt.strftime(DUE_FORMAT) + " (Project " + cand["project"].astype(str) + ").")
+        return pd.DataFrame({"message": msg, "due_dt": due}, index=cand.index)
+
+    def when(self, state, now):
+        return state["due_dt"] < pd.Timestamp(now)
+
+
+class TruckLowFuelRule(Rule):
+    name, source, severity = "truck_low_fuel", "trucks", "WARN"
+    columns = ("status", "fuel_liters")
+
+    def derive(self, rows):
+        hit = rows[(rows["status"] == "MOVING") & (rows["fuel_liters"] < 45)]
+        msg = (hit.index.to_series().astype(str) + " moving with low fuel ("
+               + hit["fuel_liters"].astype(str) + "L). Suggest refuel plan.")
+        return pd.DataFrame({"message": msg}, index=hit.index)
+
+
+class GeofenceRule(Rule):
+    """Truck di luar semua perimeter (warehouse + set sites, lihat data.geofence)."""
+
+    name, source, severity = "geofence", "trucks", "DANGER"
+    columns = ("lat", "lon")
+
+    def __init__(self, index: FenceIndex | None = None):
+        self.index = index or FenceIndex()
+
+    def derive(self, rows):
+        outside = ~self.index.inside_any(rows["lat"].to_numpy(dtype=float), rows["lon"].to_numpy(dtype=float))
+        hit = rows[outside]
+        msg = ("Geofence alert: " + hit.index.to_series().astype(str)
+               + " exited Set perimeter. Verify route / authorization.")
+        return pd.DataFrame({"message": msg}, index=hit.index)
+
+
+class LostAssetRule(Rule):
+    name, source, severity = "lost", "inventory", "DANGER"
+    columns = ("status", "category")
+
+    def derive(self, rows):
+        hit = rows[rows["status"] == "LOST"]
+        msg = ("Asset flagged LOST: " + hit.index.to_series().astype(str) + " (" + hit["category"].astype(str)
+               + "). Initiate audit log + last handler lookup.")
+        return pd.DataFrame({"message": msg}, index=hit.index)
+
+
+def default_rules():
+    return [FuelLowRule(), FuelForecastRule(), OverdueRule(), TruckLowFuelRule(), GeofenceRule(), LostAssetRule()]
+
+
+SOURCE_IDS = {"tanks": "tank_id", "inventory": "asset_id", "trucks": "truck_id"}
+
+
+class AlertEngine:
+    """Incremental, deduplicated alert evaluation with acknowledgement and bounded history."""
+
+    def __init__(self, rules=None, history_size: int = 500):
+        self.rules = rules or default_rules()
+        self.active = {}                       # (rule, entity) -> alert dict
+        self.acked = set()
+        self.history = deque(maxlen=history_size)
+        self._frames = {}                      # source -> last frame (identity shortcut)
+        self._hashes = {}                      # source -> Series(hash, index=entity)
+        self._state = {r.name: pd.DataFrame() for r in self.rules}
+        self._lock = threading.RLock()
+
+    def _changes(self, source: str, frame: pd.DataFrame):
+        """(rows berubah/baru indexed by id, id yang hilang) — None kalau frame identik."""
+        if self._frames.get(source) is frame:
+            return None
+        id_col = SOURCE_IDS[source]
+        cols = sorted({c for r in self.rules if r.source == source for c in r.columns} & set(frame.columns))
+        rows = frame.set_index(id_col)
+        h = pd.util.hash_pandas_object(rows[cols], index=False)
+        prev = self._hashes.get(source, pd.Series(dtype="uint64"))
+        if prev.index.equals(h.index):
+            mask, removed = prev.to_numpy() != h.to_numpy(), prev.index[:0]
+        else:
+            pos = prev.index.get_indexer(h.index)
+            mask = pos < 0
+            mask[~mask] = prev.to_numpy()[pos[~mask]] != h.to_numpy()[~mask]
+            removed = prev.index.difference(h.index)
+        changed = rows[mask]
+        self._frames[source], self._hashes[source] = frame, h
+        return changed, removed
+
+    def evaluate(self, trucks=None, inventory=None, tanks=None, now=None) -> pd.DataFrame:
+        now = now or datetime.now()
+        frames = {"trucks": trucks, "inventory": inventory, "tanks": tanks}
+        with self._lock:
+            for source, frame in frames.items():
+                if frame is None:
+                    continue
+                delta = self._changes(source, frame)
+                if delta is None:
+                    continue
+                changed, removed = delta
+                for rule in (r for r in self.rules if r.source == source):
+                    state = self._state[rule.name]
+                    drop = changed.index.union(removed)
+                    state = state.drop(index=state.index.intersection(drop))
+                    fresh = rule.derive(changed)
+                    self._state[rule.name] = fresh if state.empty else pd.concat([state, fresh])
+
+            firing = {}
+            for rule in self.rules:
+                state = self._state[rule.name]
+                if state.empty:
+                    continue
+                hit = state[rule.when(state, now).to_numpy()]
+                for entity, msg in zip(hit.index, hit["message"]):
+                    firing[(rule.name, entity)] = (rule.severity, msg)
+
+            for key in list(self.active):
+                if key not in firing:
+                    self._resolve(key, now)
+            for key, (sev, msg) in firing.items():
+                cur = self.active.get(key)
+                if cur is None:
+                    self.active[key] = {"time": now, "severity": sev, "message": msg,
+                                        "rule": key[0], "entity": key[1], "last_seen": now}
+                else:
+                    cur["message"], cur["last_seen"] = msg, now
+            return self.frame()
+
+    def _resolve(self, key, now):
+        alert = self.active.pop(key)
+        self.acked.discard(key)
+        self.history.append({**alert, "resolved": now})
+
+    def acknowledge(self, keys=None) -> int:
+        """Ack (rule, entity) keys — None = semua alert aktif."""
+        with self._lock:
+            keys = list(self.active) if keys is None else [k for k in keys if k in self.active]
+            self.acked.update(keys)
+            return len(keys)
+
+    def frame(self, include_acked: bool = False) -> pd.DataFrame:
+        with self._lock:
+            rows = [a for k, a in self.active.items() if include_acked or k not in self.acked]
+        if not rows:
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+        df = pd.DataFrame(rows, columns=ALERT_COLUMNS)
+        df["_rank"] = df["severity"].map(SEVERITY_RANK).fillna(9)
+        df = df.sort_values(["_rank", "time", "message"], ascending=[True, False, True], kind="stable")
+        return df.drop(columns="_rank").reset_index(drop=True)
+
+    def history_frame(self) -> pd.DataFrame:
+        with self._lock:
+            return pd.DataFrame(list(self.history), columns=ALERT_COLUMNS + ["last_seen", "resolved"])
@@ -0,0 +1,179 @@
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# ─────────────────────────────────────────────────────────────
+# Audit log — append-only, dipartisi per hari sebagai segmen Parquet
+#   root/date=YYYY-MM-DD/part-000001.parquet  (segmen immutable)
+# Manifest (min/max time + rows per segmen) di memory → query time range
+# hanya membuka segmen yang overlap. "Latest N" tail dijaga saat append
+# (newest first), jadi tab Audit Log tidak pernah memuat / sort seluruh history.
+# ─────────────────────────────────────────────────────────────
+TX_COLUMNS = ["time", "action", "asset_id", "category", "person_id", "person_name", "project", "note"]
+DEFAULT_TAIL = 5_000
+_RANGE_CACHE_MAX = 8
+
+
+@dataclass(frozen=True)
+class Segment:
+    path: Path
+    day: str
+    rows: int
+    t_min: pd.Timestamp
+    t_max: pd.Timestamp
+
+
+def _day_dir(day: str) -> str:
+    return f"date={day}"
+
+
+class AuditLog:
+    """Append-only time-partitioned Parquet audit log with a maintained newest-first tail."""
+
+    def __init__(self, root=None, tail_n: int = DEFAULT_TAIL):
+        self._owned = not root                       # temp dir milik log → dihapus saat close()
+        self.root = Path(root) if root else Path(tempfile.mkdtemp(prefix="allanray-audit-"))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.tail_n = tail_n
+        self._lock = threading.Lock()
+        self._segments = []                          # urut append
+        self._seq = 0
+        self._tail = pd.DataFrame(columns=TX_COLUMNS)
+        self._ranges = OrderedDict()                 # (start, end, version) -> frame
+        self.version = 0
+        self._scan()
+
+    # ── manifest ─────────────────────────────────────────────
+    def _scan(self):
+        """Rebuild manifest + tail from segment files already on disk."""
+        for path in sorted(self.root.glob("date=*/part-*.parquet")):
+            t = pq.read_table(path, columns=["time"]).column("time")
+            self._segments.append(Segment(path, path.parent.name[5:], len(t),
+                                          pd.Timestamp(pc.min(t).as_py()),
+                                          pd.Timestamp(pc.max(t).as_py())))
+            self._seq = max(self._seq, int(path.stem.split("-")[1]))
+        if self._segments:
+            self._tail = self.latest(self.tail_n, _from_disk=True)
+            self.version = 1
+
+    @property
+    def rows(self) -> int:
+        return sum(s.rows for s in self._segments)
+
+    def partitions(self) -> pd.DataFrame:
+        df = pd.DataFrame([(s.day, s.rows, s.t_min, s.t_max) for s in self._segments],
+                          columns=["day", "rows", "t_min", "t_max"])
+        return df.groupby("day", as_index=False).agg(segments=("rows", "size"), rows=("rows", "sum"),
+                                                     t_min=("t_min", "min"), t_max=("t_max", "max"))
+
+    # ── write ────────────────────────────────────────────────
+    def append(self, batch: pd.DataFrame) -> int:
+        """Write ``batch`` as one new segment per day it touches; update the tail. Returns rows."""
+        if batch is None or batch.empty:
+            return 0
+        batch = batch.reindex(columns=TX_COLUMNS)
+        days = batch["time"].dt.strftime("%Y-%m-%d")
+        with self._lock:
+            for day, part in batch.groupby(days.to_numpy(), sort=True):
+                self._seq += 1
+                d = self.root / _day_dir(day)
+                d.mkdir(exist_ok=True)
+                path = d / f"part-{self._seq:06d}.parquet"
+                pq.write_table(pa.Table.from_pandas(part, preserve_index=False), path)
+                self._segments.append(Segment(path, day, len(part), part["time"].min(), part["time"].max()))
+            # tail: hanya batch baru yang di-sort, lalu digabung dengan tail (≤ tail_n + len(batch) rows)
+            fresh = batch.sort_values("time", ascending=False, kind="stable")
+            tail = fresh if self._tail.empty else pd.concat([fresh, self._tail], ignore_index=True)
+            if len(self._tail) and fresh["time"].iloc[-1] < self._tail["time"].iloc[0]:
+                tail = tail.sort_values("time", ascending=False, kind="stable")
+            self._tail = tail.head(self.tail_n).reset_index(drop=True)
+            self.version += 1
+            self._ranges.clear()
+        return len(batch)
+
+    def extend(self, batches) -> int:
+        """Append an iterable of chunks (mis. scale.iter_transactions) tanpa materialisasi penuh."""
+        return sum(self.append(b) for b in batches)
+
+    # ── read ─────────────────────────────────────────────────
+    def tail(self) -> pd.DataFrame:
+        """Newest-first latest ``tail_n`` rows; frame yang sama sampai ada append berikutnya."""
+        return self._tail
+
+    def _read(self, segments, start=None, end=None, columns=None) -> pd.DataFrame:
+        filters = []
+        if start is not None:
+            filters.append(("time", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("time", "<", pd.Timestamp(end)))
+        parts = [pq.read_table(s.path, columns=columns, filters=filters or None) for s in segments]
+        if not parts:
+            return pd.DataFrame(columns=columns or TX_COLUMNS)
+        return pa.concat_tables(parts).to_pandas()
+
+    def latest(self, n: int, _from_disk: bool = False) -> pd.DataFrame:
+        """Newest ``n`` rows; dari tail kalau cukup, selain itu segmen terbaru saja yang dibaca."""
+        if not _from_disk and n <= len(self._tail):
+            return self._tail.head(n)
+        picked, total = [], 0
+        for s in sorted(self._segments, key=lambda s: s.t_max, reverse=True):
+            if total >= n and picked and s.t_max < min(p.t_min for p in picked):
+                break
+            picked.append(s)
+            total += s.rows
+        df = self._read(picked)
+        return df.sort_values("time", ascending=False, kind="stable").head(n).reset_index(drop=True)
+
+    def read_range(self, start=None, end=None, columns=None) -> pd.DataFrame:
+        """Rows with start <= time < end, newest first; hanya segmen yang overlap yang dibuka."""
+        key = (start, end, tuple(columns or ()), self.version)
+        hit = self._ranges.get(key)
+        if hit is not None:
+            self._ranges.move_to_end(key)
+            return hit
+        lo = pd.Timestamp(start) if start is not None else None
+        hi = pd.Timestamp(end) if end is not None else None
+        segs = [s for s in self._segments if (lo is None or s.t_max >= lo) and (hi is None or s.t_min < hi)]
+        cols = None if columns is None else list(dict.fromkeys(["time"] + list(columns)))
+        df = self._read(segs, lo, hi, cols)
+        df = df.sort_values("time", ascending=False, kind="stable").reset_index(drop=True)
+        self._ranges[key] = df
+        while len(self._ranges) > _RANGE_CACHE_MAX:
+            self._ranges.popitem(last=False)
+        return df
+
+    def compact(self, day: str) -> int:
+        """Merge segmen kecil satu partisi (hari yang sudah lewat) jadi satu file. Returns segmen dibuang."""
+        with self._lock:
+            segs = [s for s in self._segments if s.day == day]
+            if len(segs) < 2:
+                return 0
+            table = pa.concat_tables([pq.read_table(s.path) for s in segs])
+            self._seq += 1
+            path = self.root / _day_dir(day) / f"part-{self._seq:06d}.parquet"
+            pq.write_table(table, path)
+            t = table.column("time")
+            merged = Segment(path, day, table.num_rows, pd.Timestamp(pc.min(t).as_py()),
+                             pd.Timestamp(pc.max(t).as_py()))
+            self._segments = [s for s in self._segments if s.day != day] + [merged]
+            for s in segs:
+                s.path.unlink(missing_ok=True)
+            self._ranges.clear()
+            return len(segs)
+
+    def close(self):
+        if self._owned:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def stats(self) -> dict:
+        return {"root": str(self.root), "rows": self.rows, "segments": len(self._segments),
+                "partitions": len({s.day for s in self._segments}), "tail": len(self._tail),
+                "version": self.version}
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# Filter index — value → row positions per kolom (project, status,
+# category, location, action, …). Dibangun sekali per frame kanonik
+# (lazy per kolom: satu stable argsort atas codes), lookup berikutnya
+# O(hasil) tanpa scan / copy frame penuh.
+# ─────────────────────────────────────────────────────────────
+UNASSIGNED = "-"            # placeholder project/assigned_to di schema legacy (string)
+_INDEX_CACHE_MAX = 32
+
+
+class FilterIndex:
+    """Row positions grouped by value for low-cardinality columns of one frame."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self.n = len(df)
+        self._groups = {}          # col -> (values Index, offsets, order)
+        self._lock = threading.Lock()
+
+    def _group(self, col: str):
+        g = self._groups.get(col)
+        if g is not None:
+            return g
+        with self._lock:
+            g = self._groups.get(col)
+            if g is None:
+                s = self._df[col]
+                if isinstance(s.dtype, pd.CategoricalDtype):
+                    codes, values = s.cat.codes.to_numpy().astype(np.int64), s.cat.categories
+                else:
+                    codes, values = pd.factorize(s, use_na_sentinel=True)
+                    values = pd.Index(values)
+                # slot 0 = NA, slot k+1 = values[k]; order = posisi urut per slot (ascending dalam slot)
+                order = np.argsort(codes, kind="stable")
+                counts = np.bincount(codes + 1, minlength=len(values) + 1)
+                g = (values, np.concatenate([[0], np.cumsum(counts)]), order)
+                self._groups[col] = g
+            return g
+
+    def positions(self, col: str, value) -> np.ndarray:
+        """Sorted row positions where ``col == value`` (None → NA rows)."""
+        values, offsets, order = self._group(col)
+        if value is None:
+            slot = 0
+        else:
+            code = values.get_indexer([value])[0]
+            if code < 0:
+                return np.empty(0, dtype=np.int64)
+            slot = code + 1
+        return order[offsets[slot]:offsets[slot + 1]]
+
+    def unassigned(self, col: str) -> np.ndarray:
+        """NA rows (compact schema) plus legacy "-" placeholder rows."""
+        return np.union1d(self.positions(col, None), self.positions(col, UNASSIGNED))
+
+    def any_of(self, col: str, values) -> np.ndarray:
+        parts = [self.positions(col, v) for v in values]
+        return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+    def select(self, filters: dict | None = None) -> np.ndarray:
+        """Positions matching all {col: value} filters (intersection, smallest group first)."""
+        if not filters:
+            return np.arange(self.n)
+        parts = sorted((self.positions(c, v) for c, v in filters.items()), key=len)
+        out = parts[0]
+        for p in parts[1:]:
+            if not len(out):
+                break
+            out = np.intersect1d(out, p, assume_unique=True)
+        return out
+
+    def counts(self, col: str) -> dict:
+        values, offsets, _ = self._group(col)
+        return dict(zip(values, np.diff(offsets)[1:].tolist()))
+
+
+_indexes = OrderedDict()    # id(df) -> FilterIndex (index menahan df → id tidak dipakai ulang)
+_cache_lock = threading.Lock()
+
+
+def index_for(df: pd.DataFrame) -> FilterIndex:
+    """Shared FilterIndex for this frame object (process-wide, LRU)."""
+    key = id(df)
+    with _cache_lock:
+        idx = _indexes.get(key)
+        if idx is not None and idx._df is df:
+            _indexes.move_to_end(key)
+            return idx
+        idx = FilterIndex(df)
+        _indexes[key] = idx
+        while len(_indexes) > _INDEX_CACHE_MAX:
+            _indexes.popitem(last=False)
+        return idx
+
+
+def project_positions(df: pd.DataFrame, project: str, include_unassigned: bool = False) -> np.ndarray:
+    idx = index_for(df)
+    pos = idx.positions("project", project)
+    return np.union1d(pos, idx.unassigned("project")) if include_unassigned else pos
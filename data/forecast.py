@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# Fuel forecast — semua tank × horizon sebagai satu array NumPy
+# Burn rate di-fit dari riwayat level (EWMA atas konsumsi per jam,
+# refill di-mask), lalu diproyeksikan linear per step. Time-to-reorder /
+# time-to-empty dihitung analitik (bukan scan array), siap dipakai alert.
+# ─────────────────────────────────────────────────────────────
+STEP_H = 1.0
+HORIZON_H = 7 * 24
+HALFLIFE_H = 12.0
+FORECAST_COLUMNS = ["burn_l_per_h", "hours_to_reorder", "hours_to_empty"]
+
+
+def readings_matrix(readings: pd.DataFrame, ids, value: str = "level_l") -> tuple:
+    """Long readings (tank_id, time, level_l) → (times, levels[n_tanks, n_times]) aligned to ``ids``.
+
+    Jam tanpa reading = NaN (diabaikan oleh fit_burn_rates).
+    """
+    wide = readings.pivot_table(index="tank_id", columns="time", values=value, aggfunc="last")
+    wide = wide.reindex(index=pd.Index(ids)).sort_index(axis=1)
+    return wide.columns, wide.to_numpy(dtype=float)
+
+
+def fit_burn_rates(levels: np.ndarray, step_h: float = STEP_H, halflife_h: float = HALFLIFE_H,
+                   fallback=None) -> np.ndarray:
+    """EWMA of hourly consumption per row (oldest → newest columns), vectorized over all tanks.
+
+    Kenaikan level (refill) dan gap NaN tidak ikut dihitung; tank tanpa data valid
+    memakai ``fallback`` (L/jam, scalar atau array) kalau ada, selain itu NaN.
+    """
+    levels = np.atleast_2d(np.asarray(levels, dtype=float))
+    use = -np.diff(levels, axis=1) / step_h                      # konsumsi L/jam per interval
+    valid = np.isfinite(use) & (use >= 0)
+    if use.shape[1] == 0:
+        rate = np.full(levels.shape[0], np.nan)
+    else:
+        age = (use.shape[1] - 1 - np.arange(use.shape[1])) * step_h
+        w = np.where(valid, 0.5 ** (age / halflife_h)[None, :], 0.0)
+        wsum = w.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(wsum > 0, (w * np.where(valid, use, 0.0)).sum(axis=1) / wsum, np.nan)
+    if fallback is not None:
+        rate = np.where(np.isfinite(rate), rate, np.broadcast_to(np.asarray(fallback, dtype=float), rate.shape))
+    return rate
+
+
+@dataclass(frozen=True)
+class Forecast:
+    ids: np.ndarray
+    times: pd.DatetimeIndex
+    levels: np.ndarray              # (n_tanks, n_steps), L
+    burn_l_per_h: np.ndarray
+    hours_to_reorder: np.ndarray    # 0 = sudah di bawah reorder point, inf = tidak pernah (burn 0)
+    hours_to_empty: np.ndarray
+
+    def summary(self, now=None) -> pd.DataFrame:
+        now = pd.Timestamp(now or self.times[0])
+
+        def to_ts(h):                    # inf (tidak pernah) → NaT
+            return now + pd.to_timedelta(np.where(np.isfinite(h), h, np.nan), unit="h")
+
+        return pd.DataFrame({
+            "tank_id": self.ids,
+            "burn_l_per_h": self.burn_l_per_h.round(2),
+            "burn_l_per_day": (self.burn_l_per_h * 24).round(1),
+            "hours_to_reorder": self.hours_to_reorder.round(1),
+            "hours_to_empty": self.hours_to_empty.round(1),
+            "reorder_at": to_ts(self.hours_to_reorder),
+            "empty_at": to_ts(self.hours_to_empty),
+        })
+
+    def frame(self, step_every: int = 1) -> pd.DataFrame:
+        """Long frame (tank_id, time, level_l) — mis. untuk chart; step_every=24 → harian."""
+        lv = self.levels[:, ::step_every]
+        return pd.DataFrame({
+            "tank_id": np.repeat(self.ids, lv.shape[1]),
+            "time": np.tile(self.times[::step_every], len(self.ids)),
+            "level_l": lv.ravel(),
+        })
+
+
+def forecast(tanks: pd.DataFrame, burn_l_per_h=None, horizon_h: float = HORIZON_H, step_h: float = STEP_H,
+             now=None) -> Forecast:
+    """Project every tank over ``horizon_h`` at ``step_h`` resolution in one broadcast.
+
+    burn_l_per_h: array per tank (mis. dari fit_burn_rates); None → burn_l_per_day / 24.
+    """
+    now = pd.Timestamp(now or datetime.now()).floor("min")
+    level = tanks["level_l"].to_numpy(dtype=float)
+    cap = tanks["capacity_l"].to_numpy(dtype=float)
+    reorder = tanks["reorder_point_l"].to_numpy(dtype=float)
+    burn = (tanks["burn_l_per_day"].to_numpy(dtype=float) / 24.0 if burn_l_per_h is None
+            else np.asarray(burn_l_per_h, dtype=float))
+    burn = np.maximum(np.nan_to_num(burn, nan=0.0), 0.0)
+
+    t = np.arange(0.0, horizon_h + step_h / 2, step_h)
+    levels = np.clip(level[:, None] - burn[:, None] * t[None, :], 0.0, cap[:, None])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_reorder = np.where(level <= reorder, 0.0, np.where(burn > 0, (level - reorder) / burn, np.inf))
+        to_empty = np.where(level <= 0, 0.0, np.where(burn > 0, level / burn, np.inf))
+    return Forecast(
+        ids=tanks["tank_id"].to_numpy(),
+        times=now + pd.to_timedelta(t, unit="h"),
+        levels=levels,
+        burn_l_per_h=burn,
+        hours_to_reorder=to_reorder,
+        hours_to_empty=to_empty,
+    )
+
+
+def with_forecast(tanks: pd.DataFrame, readings: pd.DataFrame | None = None, halflife_h: float = HALFLIFE_H,
+                  now=None) -> tuple:
+    """tanks + kolom FORECAST_COLUMNS (burn di-fit dari readings kalau ada) dan Forecast-nya."""
+    fallback = tanks["burn_l_per_day"].to_numpy(dtype=float) / 24.0
+    burn = None
+    if readings is not None and not readings.empty:
+        _, levels = readings_matrix(readings, tanks["tank_id"])
+        burn = fit_burn_rates(levels, halflife_h=halflife_h, fallback=fallback)
+    fc = forecast(tanks, burn, now=now)
+    out = tanks.assign(burn_l_per_h=fc.burn_l_per_h.round(2),
+                       hours_to_reorder=fc.hours_to_reorder.round(1),
+                       hours_to_empty=fc.hours_to_empty.round(1))
+    return out, fc
@@ -0,0 +1,180 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import WAREHOUSE, SITES
+
+# ─────────────────────────────────────────────────────────────
+# Geofence — perimeter radius / polygon per lokasi (WAREHOUSE + SITES),
+# grid index di atas bounding box fence: tiap titik hanya dicek exact
+# terhadap fence di cell-nya (vectorized, tanpa loop titik × fence).
+# ─────────────────────────────────────────────────────────────
+DEFAULT_RADIUS_KM = 6.0
+KM_PER_DEG_LAT = 111.32
+EVENT_COLUMNS = ["time", "entity", "fence", "event"]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))
+
+
+def points_in_polygon(lat: np.ndarray, lon: np.ndarray, polygon) -> np.ndarray:
+    """Even-odd ray casting; loop per edge, vectorized over points."""
+    poly = np.asarray(polygon, dtype=float)
+    inside = np.zeros(len(lat), dtype=bool)
+    y0, x0 = poly[-1]
+    for y1, x1 in poly:
+        crosses = (y1 > lat) != (y0 > lat)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_at = x1 + (lat - y1) * (x0 - x1) / (y0 - y1)
+        inside ^= crosses & (lon < x_at)
+        y0, x0 = y1, x1
+    return inside
+
+
+@dataclass(frozen=True)
+class Fence:
+    name: str
+    lat: float
+    lon: float
+    radius_km: float = DEFAULT_RADIUS_KM
+    polygon: tuple | None = None        # ((lat, lon), ...) → dipakai menggantikan radius
+
+    def bbox(self):
+        """(lat_min, lat_max, lon_min, lon_max)."""
+        if self.polygon:
+            p = np.asarray(self.polygon, dtype=float)
+            return p[:, 0].min(), p[:, 0].max(), p[:, 1].min(), p[:, 1].max()
+        dlat = self.radius_km / KM_PER_DEG_LAT
+        dlon = self.radius_km / (KM_PER_DEG_LAT * max(np.cos(np.radians(self.lat)), 1e-6))
+        return self.lat - dlat, self.lat + dlat, self.lon - dlon, self.lon + dlon
+
+
+def fences_from_config(warehouse=None, sites=None) -> list:
+    locs = [warehouse or WAREHOUSE] + list(sites or SITES)
+    return [
+        Fence(name=l["name"], lat=float(l["lat"]), lon=float(l["lon"]),
+              radius_km=float(l.get("radius_km", DEFAULT_RADIUS_KM)),
+              polygon=tuple(map(tuple, l["polygon"])) if l.get("polygon") else None)
+        for l in locs
+    ]
+
+
+class FenceIndex:
+    """Uniform grid over fence bounding boxes, stored CSR-style (sorted cell keys → fence ids)."""
+
+    def __init__(self, fences=None, cell_deg: float = 0.02):
+        self.fences = list(fences or fences_from_config())
+        self.names = np.array([f.name for f in self.fences], dtype=object)
+        self.cell_deg = cell_deg
+        self._flat = np.array([f.lat for f in self.fences], dtype=float)
+        self._flon = np.array([f.lon for f in self.fences], dtype=float)
+        self._radius = np.array([f.radius_km for f in self.fences], dtype=float)
+        self._is_poly = np.array([f.polygon is not None for f in self.fences], dtype=bool)
+
+        keys, ids = [], []
+        for i, f in enumerate(self.fences):
+            la0, la1, lo0, lo1 = f.bbox()
+            gy = np.arange(np.floor(la0 / cell_deg), np.floor(la1 / cell_deg) + 1, dtype=np.int64)
+            gx = np.arange(np.floor(lo0 / cell_deg), np.floor(lo1 / cell_deg) + 1, dtype=np.int64)
+            cell = (gy[:, None] * 4_000_000 + gx[None, :]).ravel()
+            keys.append(cell)
+            ids.append(np.full(len(cell), i, dtype=np.int64))
+        keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+        ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        self._cells, start = np.unique(keys[order], return_index=True)
+        self._offsets = np.append(start, len(keys))
+        self._fence_ids = ids[order]
+
+    def _cell_keys(self, lat, lon):
+        return (np.floor(lat / self.cell_deg).astype(np.int64) * 4_000_000
+                + np.floor(lon / self.cell_deg).astype(np.int64))
+
+    def candidates(self, lat: np.ndarray, lon: np.ndarray):
+        """(point_idx, fence_idx) pairs whose fence bbox shares the point's grid cell."""
+        pk = self._cell_keys(lat, lon)
+        pos = np.searchsorted(self._cells, pk)
+        pos_c = np.minimum(pos, max(len(self._cells) - 1, 0))
+        hit = (pos < len(self._cells)) & (self._cells[pos_c] == pk) if len(self._cells) else np.zeros(len(pk), bool)
+        pts = np.flatnonzero(hit)
+        start, stop = self._offsets[pos_c[pts]], self._offsets[pos_c[pts] + 1]
+        counts = stop - start
+        point_idx = np.repeat(pts, counts)
+        # range(start, stop) per titik, digabung tanpa loop
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        fence_idx = self._fence_ids[np.repeat(start, counts) + within]
+        return point_idx, fence_idx
+
+    def contains(self, lat, lon):
+        """(point_idx, fence_idx) pairs where the point is inside the fence."""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        pi, fi = self.candidates(lat, lon)
+        ok = np.zeros(len(pi), dtype=bool)
+        rad = ~self._is_poly[fi]
+        ok[rad] = haversine_km(lat[pi[rad]], lon[pi[rad]], self._flat[fi[rad]], self._flon[fi[rad]]) <= self._radius[fi[rad]]
+        for f in np.flatnonzero(self._is_poly):          # loop per polygon fence, bukan per titik
+            sel = np.flatnonzero(fi == f)
+            if len(sel):
+                ok[sel] = points_in_polygon(lat[pi[sel]], lon[pi[sel]], self.fences[f].polygon)
+        return pi[ok], fi[ok]
+
+    def inside_any(self, lat, lon) -> np.ndarray:
+        lat = np.asarray(lat, dtype=float)
+        out = np.zeros(len(lat), dtype=bool)
+        out[self.contains(lat, lon)[0]] = True
+        return out
+
+    def membership(self, lat, lon) -> np.ndarray:
+        """Boolean (n_points, n_fences) matrix."""
+        lat = np.asarray(lat, dtype=float)
+        out = np.zeros((len(lat), len(self.fences)), dtype=bool)
+        pi, fi = self.contains(lat, lon)
+        out[pi, fi] = True
+        return out
+
+
+class GeofenceTracker:
+    """Per-entity fence membership across ticks → ENTER / EXIT events (bounded log)."""
+
+    def __init__(self, index: FenceIndex | None = None, id_col: str = "truck_id", max_events: int = 1000):
+        self.index = index or FenceIndex()
+        self.id_col = id_col
+        self.events = deque(maxlen=max_events)
+        self._inside = pd.MultiIndex.from_arrays([[], []], names=["entity", "fence"])
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def update(self, positions: pd.DataFrame, now=None) -> pd.DataFrame:
+        """Evaluate one tick; returns the events emitted by this tick."""
+        with self._lock:
+            if positions is self._frame:
+                return pd.DataFrame(columns=EVENT_COLUMNS)
+            now = now or datetime.now()
+            pi, fi = self.index.contains(positions["lat"].to_numpy(dtype=float),
+                                         positions["lon"].to_numpy(dtype=float))
+            ids = positions[self.id_col].to_numpy()
+            cur = pd.MultiIndex.from_arrays([ids[pi], self.index.names[fi]], names=["entity", "fence"])
+            entered, exited = cur.difference(self._inside), self._inside.difference(cur)
+            rows = ([(now, e, f, "ENTER") for e, f in entered] + [(now, e, f, "EXIT") for e, f in exited])
+            self.events.extend(rows)
+            self._inside, self._frame = cur, positions
+            return pd.DataFrame(rows, columns=EVENT_COLUMNS)
+
+    def inside(self) -> pd.DataFrame:
+        """Current (entity, fence) memberships."""
+        with self._lock:
+            return self._inside.to_frame(index=False)
+
+    def events_frame(self, n: int | None = None) -> pd.DataFrame:
+        with self._lock:
+            rows = list(self.events)
+        df = pd.DataFrame(rows[::-1], columns=EVENT_COLUMNS)
+        return df if n is None else df.head(n)
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from config import PROJECTS, SITES, WAREHOUSE
+from data.geofence import haversine_km
+from data.mock_data import INVENTORY_STATUSES, is_unassigned
+
+# ─────────────────────────────────────────────────────────────
+# KPI engine — semua metrik Executive Summary dalam satu pass
+# Categorical (compact schema) → np.bincount atas integer codes;
+# string (legacy) → satu value_counts per kolom.
+# ─────────────────────────────────────────────────────────────
+ACTIVE_TRUCK_STATUSES = ("MOVING", "ON-SITE")
+
+
+@dataclass(frozen=True)
+class KpiSummary:
+    active_projects: int
+    trucks_active: int
+    trucks_total: int
+    fuel_l: int
+    assets_total: int
+    on_rent: int
+    available: int
+    maintenance: int
+    lost: int
+
+
+def _counts(s: pd.Series) -> dict:
+    """{value: count} in one pass over the column."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes = s.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(s.cat.categories))
+        return dict(zip(s.cat.categories, counts.tolist()))
+    return s.value_counts().to_dict()
+
+
+def compute_kpis(inventory: pd.DataFrame, trucks: pd.DataFrame, tanks: pd.DataFrame,
+                 projects=None) -> KpiSummary:
+    projects = projects or PROJECTS
+    status = _counts(inventory["status"])
+    used = _counts(inventory["project"])
+    tstatus = _counts(trucks["status"])
+    return KpiSummary(
+        active_projects=sum(1 for p in projects if used.get(p, 0) > 0),
+        trucks_active=int(sum(tstatus.get(s, 0) for s in ACTIVE_TRUCK_STATUSES)),
+        trucks_total=len(trucks),
+        fuel_l=int(tanks["level_l"].sum()),
+        assets_total=len(inventory),
+        on_rent=int(status.get("ON-RENT", 0)),
+        available=int(status.get("AVAILABLE", 0)),
+        maintenance=int(status.get("MAINTENANCE", 0)),
+        lost=int(status.get("LOST", 0)),
+    )
+
+
+def status_breakdown(inventory: pd.DataFrame, by: str = "project") -> pd.DataFrame:
+    """Asset counts per ``by`` value (rows) × status (columns), one grouped pass.
+
+    by="project" → per project, by="location" → per site type (WAREHOUSE/TRUCK/SITE).
+    """
+    key, status = inventory[by], inventory["status"]
+    if isinstance(key.dtype, pd.CategoricalDtype) and isinstance(status.dtype, pd.CategoricalDtype):
+        kc, sc = key.cat.codes.to_numpy(), status.cat.codes.to_numpy()
+        ok = (kc >= 0) & (sc >= 0)
+        n_s = len(status.cat.categories)
+        grid = np.bincount(kc[ok] * n_s + sc[ok], minlength=len(key.cat.categories) * n_s)
+        out = pd.DataFrame(grid.reshape(-1, n_s), index=key.cat.categories, columns=status.cat.categories)
+    else:
+        rows = inventory[~is_unassigned(key)]
+        out = rows.groupby([by, "status"], observed=True).size().unstack(fill_value=0)
+    out = out.reindex(columns=[s for s in INVENTORY_STATUSES if s in out.columns] or out.columns)
+    out.index.name, out.columns.name = by, "status"
+    return out
+
+
+def truck_site_breakdown(trucks: pd.DataFrame, sites=None) -> pd.DataFrame:
+    """Truck counts per nearest site (warehouse + set sites) × status."""
+    sites = sites or [WAREHOUSE] + list(SITES)
+    d = haversine_km(trucks["lat"].to_numpy()[:, None], trucks["lon"].to_numpy()[:, None],
+                     np.array([s["lat"] for s in sites])[None, :], np.array([s["lon"] for s in sites])[None, :])
+    nearest = pd.Categorical.from_codes(d.argmin(axis=1), [s["name"] for s in sites])
+    out = pd.crosstab(nearest, trucks["status"].to_numpy())
+    out.index.name, out.columns.name = "site", None
+    return out
@@ -4,73 +4,161 @@ from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 
+from data.alerts import AlertEngine
+
+
+TRUCK_STATUSES = ["MOVING", "IDLE", "ON-SITE"]
+INVENTORY_STATUSES = ["AVAILABLE", "ON-RENT", "MAINTENANCE", "LOST"]
+INVENTORY_STATUS_WEIGHTS = [0.62, 0.28, 0.08, 0.02]
+LOCATIONS = ["WAREHOUSE", "TRUCK", "SITE"]
+TX_ACTIONS = ["CHECKOUT", "RETURN", "TRANSFER"]
+TX_ACTION_WEIGHTS = [0.45, 0.35, 0.20]
+TX_NOTES = ["OK condition", "Needs inspection", "Battery set included", "Packed in hardcase", "Cable count verified"]
+
 
 def seed_everything(seed: int = 42):
     random.seed(seed)
     np.random.seed(seed)
 
 
+def _as_rng(rng=None) -> np.random.Generator:
+    """Generator dari seed/Generator; kalau None diturunkan dari global state (seed_everything).
+
+    Seed yang sama → output identik (kecuali kolom waktu yang relatif ke now).
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if rng is None:
+        rng = np.random.randint(0, 2**31 - 1)
+    return np.random.default_rng(int(rng))
+
+
+# ─────────────────────────────────────────────────────────────
+# Vectorized string helpers (column-wise, no per-row formatting)
+# ─────────────────────────────────────────────────────────────
+def _zfill(nums, width: int) -> np.ndarray:
+    # format tiap angka unik sekali (lookup table), lalu index — ID selalu bernomor kecil
+    nums = np.asarray(nums)
+    table = pd.Series(np.arange(int(nums.max(initial=0)) + 1)).astype(str).str.zfill(width).to_numpy()
+    return table[nums]
+
+
+def _concat(*parts) -> np.ndarray:
+    out = ""
+    for p in parts:
+        out = out + (p if isinstance(p, str) else pd.Series(np.asarray(p)).astype(str))
+    return out.to_numpy()
+
+
+def _ids(prefix: str, nums, width: int) -> np.ndarray:
+    return _concat(prefix, _zfill(nums, width))
+
+
+def is_unassigned(s: pd.Series) -> pd.Series:
+    """Kosong di kedua schema: NaN (compact) atau sentinel "-" (legacy)."""
+    return s.isna() | (s.astype(object) == "-")
+
+
 def now_local():
     return datetime.now()
 
 
-def make_people(n=35, roles=None):
+def make_people(n=35, roles=None, rng=None):
+    rng = _as_rng(rng)
     roles = roles or ["Driver", "DP", "Gaffer", "Sound", "Grip", "Producer", "Runner", "Warehouse", "Tech"]
     first = ["Adit", "Bima", "Citra", "Dimas", "Eka", "Farah", "Gilang", "Hana", "Intan", "Jaka", "Kiki", "Laras",
              "Mira", "Nanda", "Omar", "Putra", "Raka", "Sari", "Tomi", "Vina", "Wawan", "Yusuf", "Zahra"]
     last = ["Santoso", "Pratama", "Wijaya", "Putri", "Saputra", "Maulana", "Hidayat", "Lestari", "Nugroho", "Ramadhan",
             "Siregar", "Wibowo", "Fauzi", "Kusuma"]
 
-    rows = []
-    for i in range(n):
-        rows.append((f"AR-{i+1:03d}", f"{random.choice(first)} {random.choice(last)}", random.choice(roles)))
-    return pd.DataFrame(rows, columns=["person_id", "name", "role"])
+    return pd.DataFrame({
+        "person_id": _ids("AR-", np.arange(1, n + 1), 3),
+        "name": _concat(rng.choice(first, size=n), " ", rng.choice(last, size=n)),
+        "role": rng.choice(roles, size=n),
+    })
 
 
-def make_trucks(n_trucks=12, warehouse=None, people=None):
+def make_trucks(n_trucks=12, warehouse=None, people=None, rng=None):
+    rng = _as_rng(rng)
     wh = warehouse or {"lat": -6.200, "lon": 106.816}
-    pids = list(people["person_id"]) if people is not None else [f"AR-{i+1:03d}" for i in range(35)]
-    rows = []
-    for i in range(n_trucks):
-        tid = f"TRK-{i+1:02d}"
-        plate = f"B {random.randint(1000,9999)} {random.choice(['AR','AY','TS'])}"
-        driver_id = random.choice(pids)
-        status = random.choice(["MOVING", "IDLE", "ON-SITE"])
-        lat = wh["lat"] + np.random.normal(0, 0.03)
-        lon = wh["lon"] + np.random.normal(0, 0.03)
-        speed = max(0, int(np.random.normal(28, 15))) if status == "MOVING" else max(0, int(np.random.normal(2, 2)))
-        fuel_l = max(20, int(np.random.normal(160, 45)))
-        rows.append((tid, plate, driver_id, status, float(lat), float(lon), speed, fuel_l))
-
-    return pd.DataFrame(
-        rows,
-        columns=["truck_id", "plate", "driver_id", "status", "lat", "lon", "speed_kmh", "fuel_liters"]
-    )
-
-
-def make_inventory(equip_categories, projects):
-    rows = []
-    for cat, n in equip_categories:
-        prefix = cat[:2].upper()
-        for i in range(n):
-            asset_id = f"{prefix}-{i+1:03d}"
-            serial = f"{prefix}{random.randint(100000,999999)}"
-            status = random.choices(
-                ["AVAILABLE", "ON-RENT", "MAINTENANCE", "LOST"],
-                weights=[0.62, 0.28, 0.08, 0.02],
-                k=1
-            )[0]
-            project = random.choice(projects) if status == "ON-RENT" else "-"
-            assigned = f"AR-{random.randint(1,35):03d}" if status in ["ON-RENT", "MAINTENANCE"] else "-"
-            location = random.choice(["WAREHOUSE", "TRUCK", "SITE"]) if status != "LOST" else "UNKNOWN"
-            due = (now_local() + timedelta(hours=random.randint(-18, 48))).strftime("%Y-%m-%d %H:%M") if status == "ON-RENT" else "-"
-            qr = f"QR:{asset_id}:{serial}"
-            rows.append((asset_id, cat, serial, qr, status, project, assigned, location, due))
-
-    return pd.DataFrame(
-        rows,
-        columns=["asset_id", "category", "serial", "qr_code", "status", "project", "assigned_to", "location", "due_return"]
-    )
+    pids = people["person_id"].to_numpy() if people is not None else _ids("AR-", np.arange(1, 36), 3)
+
+    status = rng.choice(TRUCK_STATUSES, size=n_trucks)
+    moving = status == "MOVING"
+    speed = np.where(moving, rng.normal(28, 15, n_trucks), rng.normal(2, 2, n_trucks))
+
+    return pd.DataFrame({
+        "truck_id": _ids("TRK-", np.arange(1, n_trucks + 1), 2),
+        "plate": _concat("B ", rng.integers(1000, 10000, n_trucks).astype(str), " ",
+                         rng.choice(["AR", "AY", "TS"], size=n_trucks)),
+        "driver_id": rng.choice(pids, size=n_trucks),
+        "status": status,
+        "lat": wh["lat"] + rng.normal(0, 0.03, n_trucks),
+        "lon": wh["lon"] + rng.normal(0, 0.03, n_trucks),
+        "speed_kmh": np.maximum(0, speed.astype(int)),
+        "fuel_liters": np.maximum(20, rng.normal(160, 45, n_trucks).astype(int)),
+    })
+
+
+def make_inventory(equip_categories, projects, rng=None, n_people=35, start=1, compact=False):
+    """Inventory per aset.
+
+    compact=True → schema bertipe: due_return datetime64 (NaT = tidak disewa),
+    category/status/project/location/assigned_to pandas Categorical (integer codes;
+    project/assigned_to kosong = NaN, bukan sentinel "-").
+    """
+    rng = _as_rng(rng)
+    cats = [c for c, _ in equip_categories]
+    counts = np.array([n for _, n in equip_categories], dtype=np.int64)
+    n = int(counts.sum())
+
+    # nomor urut per kategori: start..start+n_cat-1, tanpa loop per-row
+    seq = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts) + start
+    prefix = np.repeat([c[:2].upper() for c in cats], counts)
+    asset_id = _concat(prefix, "-", _zfill(seq, 3))
+    serial = _concat(prefix, rng.integers(100000, 1000000, n).astype(str))
+
+    status_i = rng.choice(len(INVENTORY_STATUSES), size=n, p=INVENTORY_STATUS_WEIGHTS)
+    onrent = status_i == INVENTORY_STATUSES.index("ON-RENT")
+    lost = status_i == INVENTORY_STATUSES.index("LOST")
+    holds = onrent | (status_i == INVENTORY_STATUSES.index("MAINTENANCE"))
+    due_h = rng.integers(-18, 49, n)
+    project_i = rng.choice(len(projects), size=n)
+    person_i = rng.integers(0, n_people, n)
+    location_i = rng.choice(len(LOCATIONS), size=n)
+
+    if compact:
+        now = pd.Timestamp(now_local()).floor("min")
+        due = now + pd.to_timedelta(np.where(onrent, due_h, np.nan), unit="h")
+        return pd.DataFrame({
+            "asset_id": asset_id,
+            "category": pd.Categorical.from_codes(np.repeat(np.arange(len(cats)), counts), cats),
+            "serial": serial,
+            "qr_code": _concat("QR:", asset_id, ":", serial),
+            "status": pd.Categorical.from_codes(status_i, INVENTORY_STATUSES),
+            "project": pd.Categorical.from_codes(np.where(onrent, project_i, -1), list(projects)),
+            "assigned_to": pd.Categorical.from_codes(np.where(holds, person_i, -1),
+                                                     _ids("AR-", np.arange(1, n_people + 1), 3)),
+            "location": pd.Categorical.from_codes(np.where(lost, len(LOCATIONS), location_i),
+                                                  LOCATIONS + ["UNKNOWN"]),
+            "due_return": due,
+        })
+
+    # offset jam hanya 67 nilai unik → strftime sekali per offset, bukan per row
+    due_labels = pd.Series(pd.Timestamp(now_local()) + pd.to_timedelta(np.arange(-18, 49), unit="h"))
+    due_labels = due_labels.dt.strftime("%Y-%m-%d %H:%M").to_numpy()
+
+    return pd.DataFrame({
+        "asset_id": asset_id,
+        "category": np.repeat(cats, counts),
+        "serial": serial,
+        "qr_code": _concat("QR:", asset_id, ":", serial),
+        "status": np.asarray(INVENTORY_STATUSES)[status_i],
+        "project": np.where(onrent, np.asarray(projects)[project_i], "-"),
+        "assigned_to": np.where(holds, _ids("AR-", person_i + 1, 3), "-"),
+        "location": np.where(lost, "UNKNOWN", np.asarray(LOCATIONS)[location_i]),
+        "due_return": np.where(onrent, due_labels[due_h + 18], "-"),
+    })
 
 
 def make_fuel_tanks():
@@ -89,62 +177,57 @@ def make_fuel_tanks():
     return pd.DataFrame(rows, columns=["tank_id", "tank_name", "capacity_l", "level_l", "burn_l_per_day", "reorder_point_l"])
 
 
-def make_transactions(inv, people, n=140, projects=None):
+def make_tank_readings(tanks: pd.DataFrame, hours: int = 72, rng=None) -> pd.DataFrame:
+    """Hourly level history per tank (oldest → newest, berakhir di level_l sekarang).
+
+    Konsumsi per jam = burn_l_per_day/24 × profil siang/malam × noise lognormal;
+    mundur ke belakang level naik sampai ~95% kapasitas lalu "refill" (sawtooth).
+    """
+    rng = _as_rng(rng)
+    n = len(tanks)
+    now = pd.Timestamp(now_local()).floor("h")
+    times = now - pd.to_timedelta(np.arange(hours - 1, -1, -1), unit="h")
+    day = np.asarray((times.hour >= 7) & (times.hour <= 19))
+    profile = np.where(day, 1.4, 0.6)
+    base = tanks["burn_l_per_day"].to_numpy(dtype=float)[:, None] / 24.0
+    use = base * (profile / profile.mean())[None, :] * rng.lognormal(0.0, 0.25, (n, hours))
+
+    # level di jam k = level sekarang + konsumsi setelah jam k
+    after = np.cumsum(use[:, ::-1], axis=1)[:, ::-1] - use
+    level = tanks["level_l"].to_numpy(dtype=float)[:, None] + after
+    top = tanks["capacity_l"].to_numpy(dtype=float)[:, None] * 0.95
+    low = np.minimum(tanks["reorder_point_l"].to_numpy(dtype=float)[:, None] * 0.8, top * 0.5)
+    level = np.where(level > top, low + (level - low) % (top - low), level)
+
+    return pd.DataFrame({
+        "tank_id": np.repeat(tanks["tank_id"].to_numpy(), hours),
+        "time": np.tile(times.to_numpy(), n),
+        "level_l": level.round(1).ravel(),
+    })
+
+
+def make_transactions(inv, people, n=140, projects=None, rng=None):
+    rng = _as_rng(rng)
     projects = projects or ["FILM-A", "FILM-B", "ADS-X", "DOCU-Z"]
-    base = now_local() - timedelta(days=3)
-    rows = []
-    for _ in range(n):
-        ts = base + timedelta(minutes=random.randint(0, 3 * 24 * 60))
-        a = inv.sample(1).iloc[0]
-        p = people.sample(1).iloc[0]
-        action = random.choices(["CHECKOUT", "RETURN", "TRANSFER"], weights=[0.45, 0.35, 0.20], k=1)[0]
-        project = random.choice(projects)
-        note = random.choice(["OK condition", "Needs inspection", "Battery set included", "Packed in hardcase", "Cable count verified"])
-        rows.append((ts, action, a["asset_id"], a["category"], p["person_id"], p["name"], project, note))
+    base = pd.Timestamp(now_local() - timedelta(days=3))
+
+    minutes = rng.integers(0, 3 * 24 * 60 + 1, n)
+    order = np.argsort(-minutes, kind="stable")          # terbaru dulu, tanpa sort_values
+    a_idx = rng.integers(0, len(inv), n)[order]
+    p_idx = rng.integers(0, len(people), n)[order]
 
-    df = pd.DataFrame(rows, columns=["time", "action", "asset_id", "category", "person_id", "person_name", "project", "note"])
-    return df.sort_values("time", ascending=False).reset_index(drop=True)
+    return pd.DataFrame({
+        "time": base + pd.to_timedelta(minutes[order], unit="m"),
+        "action": rng.choice(TX_ACTIONS, size=n, p=TX_ACTION_WEIGHTS)[order],
+        "asset_id": inv["asset_id"].to_numpy()[a_idx],
+        "category": inv["category"].to_numpy()[a_idx],
+        "person_id": people["person_id"].to_numpy()[p_idx],
+        "person_name": people["name"].to_numpy()[p_idx],
+        "project": rng.choice(projects, size=n)[order],
+        "note": rng.choice(TX_NOTES, size=n)[order],
+    })
 
 
 def make_alerts(trucks, inv, tanks):
-    alerts = []
-    now = now_local()
-
-    # Fuel low
-    for _, t in tanks.iterrows():
-        if t["level_l"] <= t["reorder_point_l"]:
-            alerts.append((now, "WARN", f"Fuel low: {t['tank_name']} ({int(t['level_l'])}L) below reorder point."))
-
-    # Overdue returns
-    onrent = inv[(inv["status"] == "ON-RENT") & (inv["due_return"] != "-")].copy()
-
-    def parse_due(x):
-        try:
-            return datetime.strptime(x, "%Y-%m-%d %H:%M")
-        except Exception:
-            return None
-
-    if len(onrent) > 0:
-        onrent["due_dt"] = onrent["due_return"].apply(parse_due)
-        od = onrent[(onrent["due_dt"].notna()) & (onrent["due_dt"] < now)]
-        if len(od) > 0:
-            for _, r in od.sample(min(4, len(od))).iterrows():
-                alerts.append((now, "DANGER", f"Overdue return: {r['asset_id']} ({r['category']}) due {r['due_return']} (Project {r['project']})."))
-
-    # Truck moving with low fuel
-    lf = trucks[(trucks["status"] == "MOVING") & (trucks["fuel_liters"] < 45)]
-    for _, tr in lf.iterrows():
-        alerts.append((now, "WARN", f"{tr['truck_id']} moving with low fuel ({tr['fuel_liters']}L). Suggest refuel plan."))
-
-    # Random geofence breach (demo)
-    if random.random() < 0.55:
-        tr = trucks.sample(1).iloc[0]
-        alerts.append((now, "DANGER", f"Geofence alert: {tr['truck_id']} exited Set perimeter (demo). Verify route / authorization."))
-
-    # Lost asset
-    lost = inv[inv["status"] == "LOST"]
-    if len(lost) > 0:
-        r = lost.sample(1).iloc[0]
-        alerts.append((now, "DANGER", f"Asset flagged LOST: {r['asset_id']} ({r['category']}). Initiate audit log + last handler lookup."))
-
-    return pd.DataFrame(alerts, columns=["time", "severity", "message"]).sort_values("time", ascending=False)
+    """One-shot evaluation (stateless). Dashboard memakai AlertEngine yang persisten."""
+    return AlertEngine().evaluate(trucks=trucks, inventory=inv, tanks=tanks)[["time", "severity", "message"]]
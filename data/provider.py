@@ -0,0 +1,414 @@
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from config import (
+    PROJECTS, EQUIP_CATEGORIES, PEOPLE_ROLES, WAREHOUSE, STORAGE_DIR, DASHBOARD_MAX_SF,
+)
+from data import scale
+from data.mock_data import (
+    seed_everything, make_people, make_trucks, make_inventory,
+    make_fuel_tanks, make_transactions, make_tank_readings,
+)
+from data.alerts import AlertEngine
+from data.geofence import GeofenceTracker
+from data.telemetry import TelemetryPipeline, replay_source
+from data.kpi import compute_kpis
+from data.forecast import with_forecast
+from data.snapshot import SnapshotScheduler, make_snapshot, warm_indexes
+from data.store import Store, MEMORY
+from data.audit_log import AuditLog
+from data.timeseries import FuelHistory
+
+# ─────────────────────────────────────────────────────────────
+# Data provider — memoized mock datasets
+# Setiap autorefresh (4 detik) cukup baca cache; dataset hanya
+# dibangun ulang kalau key-nya (seed / config) berubah atau TTL habis.
+# ─────────────────────────────────────────────────────────────
+DATA_TTL_S = 15 * 60      # people / trucks / inventory / tanks / transactions
+ENGINE_TTL_S = 12 * 3600  # alert engine menyimpan state/ack → umur panjang
+MAX_ENTRIES = 64
+
+N_PEOPLE = 35
+N_TRANSACTIONS = 160
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and explicit invalidation."""
+
+    def __init__(self, maxsize: int = MAX_ENTRIES, ttl: float = DATA_TTL_S, on_evict=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict            # dipanggil (di luar lock) untuk value yang dibuang
+        self._data = OrderedDict()          # key -> (expires_at, value)
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+    def _evicted(self, values):
+        if self.on_evict is not None:
+            for v in values:
+                self.on_evict(v)
+
+    def _lock_for(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _drop_lock(self, key):
+        """Buang key lock entry yang dihapus (dipanggil di bawah self._lock); lock yang sedang
+        dipegang builder dibiarkan → tidak ada dua build paralel untuk key yang sama."""
+        lock = self._key_locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._key_locks[key]
+
+    def get(self, key, default=None):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return default
+            expires_at, value = hit
+            if expires_at >= time.monotonic():
+                self._data.move_to_end(key)
+                return value
+            del self._data[key]
+            self._drop_lock(key)
+        self._evicted([value])
+        return default
+
+    def set(self, key, value, ttl: float | None = None):
+        dropped = []
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                old_key, (_, old) = self._data.popitem(last=False)
+                self._drop_lock(old_key)
+                dropped.append(old)
+        self._evicted(dropped)
+
+    def get_or_create(self, key, factory, ttl: float | None = None):
+        """Return cached value or build it once (concurrent sessions wait, not rebuild)."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock_for(key):
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = factory()
+                self.set(key, value, ttl=ttl)
+            return value
+
+    def invalidate(self, predicate=None) -> int:
+        """Drop entries whose key matches ``predicate`` (all entries if None)."""
+        with self._lock:
+            keys = [k for k in self._data if predicate is None or predicate(k)]
+            dropped = [self._data.pop(k)[1] for k in keys]
+            for k in keys:
+                self._drop_lock(k)
+        self._evicted(dropped)
+        return len(keys)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+_MISSING = object()
+_cache = TTLCache()
+_engines = TTLCache(maxsize=32, ttl=ENGINE_TTL_S)
+_streams = TTLCache(maxsize=8, ttl=ENGINE_TTL_S, on_evict=lambda p: p.close())   # telemetry threads
+_schedulers = TTLCache(maxsize=8, ttl=ENGINE_TTL_S, on_evict=lambda s: s.close())
+_stores = TTLCache(maxsize=8, ttl=ENGINE_TTL_S, on_evict=lambda s: s.close())
+_audit_logs = TTLCache(maxsize=8, ttl=ENGINE_TTL_S, on_evict=lambda a: a.close())
+TANK_HISTORY_H = 72      # jam riwayat level tank untuk fit burn rate
+FORECAST_TTL_S = 5 * 60   # hours_to_reorder relatif ke now → refresh berkala
+FUEL_HISTORY_D = 90       # hari riwayat level tank di FuelHistory
+RETENTION_EVERY = 30      # enforce retention tiap N snapshot
+TRAIL_N = 30              # telemetry pings per truck di snapshot
+_rng_lock = threading.Lock()   # tanks masih pakai global RNG → serialisasi seed+generate
+
+
+def _dataset_seed(seed: int, dataset: str) -> int:
+    """Independent, stable seed per dataset so one dataset can be rebuilt alone."""
+    return (int(seed) + zlib.crc32(dataset.encode())) % (2**32)
+
+
+def _seeded(seed: int, dataset: str, fn):
+    with _rng_lock:
+        seed_everything(_dataset_seed(seed, dataset))
+        return fn()
+
+
+def _config_key(projects, equip_categories):
+    return tuple(projects), tuple(tuple(c) for c in equip_categories)
+
+
+# ─────────────────────────────────────────────────────────────
+# Cached dataset accessors
+# Frame yang dikembalikan dipakai bersama (shared) — JANGAN dimutasi.
+# ─────────────────────────────────────────────────────────────
+def get_people(seed: int, n: int = N_PEOPLE, roles=None):
+    roles = tuple(roles or PEOPLE_ROLES)
+
+    def build():
+        return make_people(n, roles=list(roles), rng=_dataset_seed(seed, "people"))
+
+    return _cache.get_or_create(("people", int(seed), n, roles), build)
+
+
+def get_trucks(seed: int, n_trucks: int = 12, warehouse=None):
+    wh = warehouse or WAREHOUSE
+    people = get_people(seed)
+
+    def build():
+        df = make_trucks(n_trucks=int(n_trucks), warehouse=wh, people=people,
+                         rng=_dataset_seed(seed, "trucks"))
+        pmap = dict(zip(people["person_id"], people["name"]))
+        df["driver_name"] = df["driver_id"].map(lambda x: pmap.get(x, x))
+        return df
+
+    key = ("trucks", int(seed), int(n_trucks), (wh["lat"], wh["lon"]))
+    return _cache.get_or_create(key, build)
+
+
+def get_inventory(seed: int, equip_categories=None, projects=None):
+    projects = projects or PROJECTS
+    equip_categories = equip_categories or EQUIP_CATEGORIES
+
+    def build():
+        return make_inventory(equip_categories, projects, rng=_dataset_seed(seed, "inventory"), compact=True)
+
+    key = ("inventory", int(seed)) + _config_key(projects, equip_categories)
+    return _cache.get_or_create(key, build)
+
+
+def get_tanks(seed: int):
+    def build():
+        return _seeded(seed, "tanks", make_fuel_tanks)
+
+    return _cache.get_or_create(("tanks", int(seed)), build)
+
+
+def _tank_history(seed: int):
+    """FUEL_HISTORY_D hari reading per jam; get_tank_readings / FuelHistory sama-sama memotong dari sini."""
+    tanks = get_tanks(seed)
+
+    def build():
+        return make_tank_readings(tanks, hours=FUEL_HISTORY_D * 24, rng=_dataset_seed(seed, "tank_readings"))
+
+    return _cache.get_or_create(("tank_history", int(seed)), build)
+
+
+def get_tank_readings(seed: int, hours: int = TANK_HISTORY_H):
+    history = _tank_history(seed)
+
+    def build():
+        cut = history["time"].max() - pd.Timedelta(hours=hours - 1)
+        return history[history["time"] >= cut].reset_index(drop=True)
+
+    return _cache.get_or_create(("tank_readings", int(seed), int(hours)), build)
+
+
+def get_tank_forecast(seed: int) -> tuple:
+    """(tanks + burn_l_per_h / hours_to_reorder / hours_to_empty, Forecast) — burn di-fit dari readings."""
+    tanks, readings = get_tanks(seed), get_tank_readings(seed)
+    return _cache.get_or_create(("tank_forecast", int(seed)), lambda: with_forecast(tanks, readings),
+                                ttl=FORECAST_TTL_S)
+
+
+def get_transactions(seed: int, n: int = N_TRANSACTIONS, equip_categories=None, projects=None):
+    projects = projects or PROJECTS
+    equip_categories = equip_categories or EQUIP_CATEGORIES
+    inventory = get_inventory(seed, equip_categories, projects)
+    people = get_people(seed)
+
+    def build():
+        return make_transactions(inventory, people, n=n, projects=list(projects),
+                                 rng=_dataset_seed(seed, "transactions"))
+
+    key = ("transactions", int(seed), n) + _config_key(projects, equip_categories)
+    return _cache.get_or_create(key, build)
+
+
+def get_alert_engine(seed: int, n_trucks: int = 12, sf: int = 1, telemetry: bool = False) -> AlertEngine:
+    """Process-wide engine per dataset config — ack berlaku untuk semua layar.
+
+    telemetry ikut di key: scheduler telemetry on / off masing-masing punya frame truck sendiri,
+    jadi state-nya tidak boleh dicampur (frame bergantian → event flicker).
+    """
+    return _engines.get_or_create((int(seed), int(n_trucks), int(sf), bool(telemetry)), AlertEngine)
+
+
+def get_geofence_tracker(seed: int, n_trucks: int = 12, sf: int = 1, telemetry: bool = False) -> GeofenceTracker:
+    """Process-wide truck geofence state per dataset config (enter/exit log dibagi antar layar)."""
+    return _engines.get_or_create((int(seed), int(n_trucks), int(sf), bool(telemetry), "geofence"),
+                                  GeofenceTracker)
+
+
+def get_telemetry(seed: int, n_trucks: int = 12, sf: int = 1, trucks=None, hz: float = 1.0) -> TelemetryPipeline:
+    """Process-wide ingest pipeline per dataset config, fed by a replay of the truck fleet."""
+    def build():
+        base = trucks if trucks is not None else get_trucks(seed, n_trucks)
+        pipe = TelemetryPipeline()
+        pipe.attach(replay_source(base, hz=hz, seed=_dataset_seed(seed, "telemetry")), name="telemetry-replay")
+        return pipe
+
+    return _streams.get_or_create((int(seed), int(n_trucks), int(sf)), build)
+
+
+def get_store(seed: int, n_trucks: int = 12, sf: int = 1) -> Store:
+    """Process-wide embedded database per dataset config.
+
+    Database kosong di-seed sekali dari dataset yang di-generate; file yang sudah
+    berisi (STORAGE_DIR) dipakai apa adanya. Tiap snapshot meng-upsert trucks / inventory
+    dan meng-append alert history (Store.sync).
+    """
+    key = (int(seed), int(n_trucks), int(sf))
+
+    def build():
+        path = MEMORY
+        if STORAGE_DIR:
+            Path(STORAGE_DIR).mkdir(parents=True, exist_ok=True)
+            path = str(Path(STORAGE_DIR) / f"allanray_{key[0]}_{key[1]}_sf{key[2]}.db")
+        store = Store(path)
+        if store.count("inventory") == 0:
+            store.load(load_dashboard_data(*key))
+            store.write("transactions", get_audit_log(*key).read_range())     # seluruh history, bukan tail
+        return store
+
+    return _stores.get_or_create(key, build)
+
+
+def get_audit_log(seed: int, n_trucks: int = 12, sf: int = 1) -> AuditLog:
+    """Process-wide Parquet audit log per dataset config.
+
+    Log kosong di-seed dari generator transaksi (SF > 1: per chunk, tanpa satu frame penuh);
+    STORAGE_DIR → segmen disimpan permanen dan dibuka ulang apa adanya.
+    """
+    key = (int(seed), int(n_trucks), int(sf))
+
+    def build():
+        root = Path(STORAGE_DIR) / f"audit_{key[0]}_{key[1]}_sf{key[2]}" if STORAGE_DIR else None
+        log = AuditLog(root)
+        if log.rows == 0:
+            if key[2] > 1:
+                scaled = get_scaled(*key)
+                log.extend(scale.iter_transactions(scaled["plan"], scaled["people"], seed=key[0]))
+            else:
+                log.append(get_transactions(seed))
+        return log
+
+    return _audit_logs.get_or_create(key, build)
+
+
+def get_fuel_history(seed: int, n_trucks: int = 12, sf: int = 1, telemetry: bool = False) -> FuelHistory:
+    """Process-wide fuel series per dataset config: tank di-seed dari riwayat, truck dari ping telemetry."""
+    def build():
+        history = FuelHistory()
+        history.append_frame("tank", _tank_history(seed), "tank_id", "level_l")
+        history.enforce_retention()
+        return history
+
+    return _engines.get_or_create((int(seed), int(n_trucks), int(sf), bool(telemetry), "fuel_history"), build)
+
+
+def get_alerts(seed: int, n_trucks: int = 12, sf: int = 1, trucks=None, inventory=None, tanks=None,
+               telemetry: bool = False):
+    """Evaluate alerts incrementally (frame identik dari cache → hampir tanpa biaya)."""
+    if trucks is None:
+        trucks, inventory, tanks = get_trucks(seed, n_trucks), get_inventory(seed), get_tanks(seed)
+    return get_alert_engine(seed, n_trucks, sf, telemetry).evaluate(trucks=trucks, inventory=inventory, tanks=tanks)
+
+
+def get_scaled(seed: int, n_trucks: int = 12, sf: int = 1) -> dict:
+    """Scale-factor datasets (load test), referentially consistent, cached as one entry.
+
+    Di-materialize penuh → hanya sampai DASHBOARD_MAX_SF; SF lebih besar pakai scale.iter_* (bench).
+    """
+    if int(sf) > DASHBOARD_MAX_SF:
+        raise ValueError(f"sf={sf} > DASHBOARD_MAX_SF={DASHBOARD_MAX_SF}: pakai scale.iter_* (bench), bukan provider")
+    key = ("scaled", int(seed), int(n_trucks), int(sf)) + _config_key(PROJECTS, EQUIP_CATEGORIES)
+
+    def build():                         # audit log tidak ikut di-materialize → get_audit_log
+        return scale.materialize(sf, seed=int(seed), n_trucks=int(n_trucks), transactions=False)
+
+    return _cache.get_or_create(key, build)
+
+
+def load_dashboard_data(seed: int, n_trucks: int = 12, sf: int = 1, telemetry: bool = False) -> dict:
+    """All datasets one dashboard rerun needs, served from the cache.
+
+    telemetry=True → posisi / fuel truck diambil dari ping terakhir (get_telemetry).
+    """
+    if int(sf) > 1:
+        scaled = get_scaled(seed, n_trucks, sf)
+        people, trucks, inventory = scaled["people"], scaled["trucks"], scaled["inventory"]
+    else:
+        people, trucks, inventory = get_people(seed), get_trucks(seed, n_trucks), get_inventory(seed)
+    tx = get_audit_log(seed, n_trucks, sf).tail()          # latest N, newest first (bukan seluruh history)
+    tanks = get_tank_forecast(seed)[0]
+    if telemetry:
+        trucks = get_telemetry(seed, n_trucks, sf, trucks).apply(trucks)
+
+    return {
+        "people": people,
+        "trucks": trucks,
+        "inventory": inventory,
+        "tanks": tanks,
+        "tx": tx,
+        "alerts": get_alerts(seed, n_trucks, sf, trucks, inventory, tanks, telemetry),
+    }
+
+
+def build_snapshot(seed: int, n_trucks: int = 12, sf: int = 1, telemetry: bool = False, version: int = 0):
+    """One full dashboard state: datasets + alerts + KPIs (+ trails, geofence tick)."""
+    t0 = time.perf_counter()
+    data = load_dashboard_data(seed, n_trucks, sf, telemetry=telemetry)
+    get_geofence_tracker(seed, n_trucks, sf, telemetry).update(data["trucks"])
+    trails = get_telemetry(seed, n_trucks, sf).trails(TRAIL_N) if telemetry else None
+    kpis = compute_kpis(data["inventory"], data["trucks"], data["tanks"], PROJECTS)
+    history = get_fuel_history(seed, n_trucks, sf, telemetry)
+    if telemetry:
+        # seluruh ring buffer, bukan latest(): ping di antara dua snapshot ikut tercatat, duplikat dibuang
+        history.append_new("truck", get_telemetry(seed, n_trucks, sf).trails(), "truck_id", "fuel_liters")
+    if version % RETENTION_EVERY == 0:
+        history.enforce_retention()
+    extras = {"forecast": get_tank_forecast(seed)[1], "tank_readings": get_tank_readings(seed),
+              "fuel_history": history}
+    warm_indexes(data)
+    store = _stores.get((int(seed), int(n_trucks), int(sf)))
+    if store is not None:
+        store.sync(data)
+    return make_snapshot(version, data, kpis, trails=trails, extras=extras, t0=t0)
+
+
+def get_scheduler(seed: int, n_trucks: int = 12, sf: int = 1, telemetry: bool = False) -> SnapshotScheduler:
+    """Process-wide background scheduler per dataset config — semua session baca snapshot yang sama."""
+    key = (int(seed), int(n_trucks), int(sf), bool(telemetry))
+    return _schedulers.get_or_create(key, lambda: SnapshotScheduler(
+        lambda v: build_snapshot(*key, version=v), name=f"snapshot-{key[0]}-{key[2]}"))
+
+
+def invalidate(dataset: str | None = None, seed: int | None = None) -> int:
+    """Explicitly drop cached datasets (by name and/or seed). Returns count dropped."""
+    def match(key):
+        return (dataset is None or key[0] == dataset) and (seed is None or key[1] == int(seed))
+
+    if dataset in (None, "alerts"):
+        _engines.invalidate(lambda k: seed is None or k[0] == int(seed))
+    if dataset in (None, "trucks"):
+        _streams.invalidate(lambda k: seed is None or k[0] == int(seed))
+    if dataset is None:                  # scheduler membaca dataset dari _cache tiap tick
+        _schedulers.invalidate(lambda k: seed is None or k[0] == int(seed))
+    if dataset in (None, "people", "trucks", "inventory", "transactions"):     # tabel di Store
+        _stores.invalidate(lambda k: seed is None or k[0] == int(seed))
+    if dataset in (None, "transactions"):
+        _audit_logs.invalidate(lambda k: seed is None or k[0] == int(seed))
+    return _cache.invalidate(match)
+
+
+def cache_info() -> dict:
+    return {"entries": len(_cache), "maxsize": _cache.maxsize, "ttl_s": _cache.ttl}
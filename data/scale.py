@@ -0,0 +1,156 @@
+import zlib
+from dataclasses import dataclass
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from config import PROJECTS, EQUIP_CATEGORIES, PEOPLE_ROLES, WAREHOUSE
+from data.mock_data import (
+    now_local, make_people, make_trucks, make_inventory,
+    TX_ACTIONS, TX_ACTION_WEIGHTS, TX_NOTES, _zfill, _concat,
+)
+
+# ─────────────────────────────────────────────────────────────
+# Scale-factor generator (load testing)
+# SF1 = ukuran demo. SF-N mengalikan semua dimensi secara proporsional;
+# inventory & transaksi di-stream per chunk supaya memori generator tetap
+# terbatas (≈ chunk_rows), people & trucks tetap materialized (dimensi kecil).
+# ─────────────────────────────────────────────────────────────
+BASE_PEOPLE = 35
+BASE_TRUCKS = 12
+BASE_TRANSACTIONS = 160
+TX_WINDOW_MIN = 3 * 24 * 60
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+@dataclass(frozen=True)
+class ScalePlan:
+    sf: int
+    n_people: int
+    n_trucks: int
+    categories: tuple          # ((category, n_assets), ...)
+    n_transactions: int
+
+    @property
+    def n_assets(self) -> int:
+        return sum(n for _, n in self.categories)
+
+
+def plan(sf: int = 1, n_trucks: int = BASE_TRUCKS, equip_categories=None) -> ScalePlan:
+    sf = max(1, int(sf))
+    equip_categories = equip_categories or EQUIP_CATEGORIES
+    return ScalePlan(
+        sf=sf,
+        n_people=BASE_PEOPLE * sf,
+        n_trucks=int(n_trucks) * sf,
+        categories=tuple((c, int(n) * sf) for c, n in equip_categories),
+        n_transactions=BASE_TRANSACTIONS * sf,
+    )
+
+
+def _chunk_rng(seed: int, stream: str, k: int) -> np.random.Generator:
+    # stream independen per (seed, dataset, chunk) → deterministik per chunk_rows
+    return np.random.default_rng([int(seed), zlib.crc32(stream.encode()), k])
+
+
+# ─────────────────────────────────────────────────────────────
+# Materialized dimensions
+# ─────────────────────────────────────────────────────────────
+def scaled_people(p: ScalePlan, seed: int = 42, roles=None) -> pd.DataFrame:
+    return make_people(p.n_people, roles=roles or PEOPLE_ROLES, rng=_chunk_rng(seed, "people", 0))
+
+
+def scaled_trucks(p: ScalePlan, people: pd.DataFrame, seed: int = 42, warehouse=None) -> pd.DataFrame:
+    df = make_trucks(p.n_trucks, warehouse=warehouse or WAREHOUSE, people=people,
+                     rng=_chunk_rng(seed, "trucks", 0))
+    names = people.set_index("person_id")["name"]
+    df["driver_name"] = names.reindex(df["driver_id"]).to_numpy()
+    return df
+
+
+# ─────────────────────────────────────────────────────────────
+# Streamed facts
+# ─────────────────────────────────────────────────────────────
+def iter_inventory(p: ScalePlan, seed: int = 42, projects=None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   compact: bool = True):
+    """Yield inventory chunks (≤ chunk_rows), asset_id unik & berurutan per kategori."""
+    projects = projects or PROJECTS
+    all_cats = [c for c, _ in p.categories]
+    k = 0
+    for cat, n in p.categories:
+        for start in range(1, n + 1, chunk_rows):
+            size = min(chunk_rows, n - start + 1)
+            chunk = make_inventory([(cat, size)], projects, rng=_chunk_rng(seed, "inventory", k),
+                                   n_people=p.n_people, start=start, compact=compact)
+            if compact:
+                # kategori seragam antar chunk → concat tetap Categorical
+                chunk["category"] = chunk["category"].cat.set_categories(all_cats)
+            yield chunk
+            k += 1
+
+
+def _asset_lookup(p: ScalePlan):
+    cats = np.array([c for c, _ in p.categories])
+    prefixes = np.array([c[:2].upper() for c, _ in p.categories])
+    ends = np.cumsum([n for _, n in p.categories])
+    return cats, prefixes, ends
+
+
+def iter_transactions(p: ScalePlan, people: pd.DataFrame, seed: int = 42, projects=None,
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """Yield audit-log chunks, newest first across chunks (tiap chunk = satu jendela waktu).
+
+    Aset dipilih dari indeks global → asset_id/category dihitung langsung dari plan,
+    jadi inventory tidak perlu dimuat untuk menjaga referential consistency.
+    """
+    projects = projects or PROJECTS
+    cats, prefixes, ends = _asset_lookup(p)
+    starts = ends - np.array([n for _, n in p.categories])
+    pids = people["person_id"].to_numpy()
+    pnames = people["name"].to_numpy()
+    base = pd.Timestamp(now_local() - timedelta(days=3))
+
+    n_chunks = max(1, -(-p.n_transactions // chunk_rows))
+    for k in range(n_chunks):
+        n = min(chunk_rows, p.n_transactions - k * chunk_rows)
+        if n <= 0:
+            break
+        rng = _chunk_rng(seed, "transactions", k)
+        hi = TX_WINDOW_MIN * (n_chunks - k) / n_chunks
+        lo = TX_WINDOW_MIN * (n_chunks - k - 1) / n_chunks
+        minutes = np.sort(rng.integers(int(lo), int(hi) + 1, n))[::-1]
+
+        g = rng.integers(0, p.n_assets, n)
+        ci = np.searchsorted(ends, g, side="right")
+        p_idx = rng.integers(0, len(pids), n)
+
+        yield pd.DataFrame({
+            "time": base + pd.to_timedelta(minutes, unit="m"),
+            "action": rng.choice(TX_ACTIONS, size=n, p=TX_ACTION_WEIGHTS),
+            "asset_id": _concat(prefixes[ci], "-", _zfill(g - starts[ci] + 1, 3)),
+            "category": cats[ci],
+            "person_id": pids[p_idx],
+            "person_name": pnames[p_idx],
+            "project": rng.choice(projects, size=n),
+            "note": rng.choice(TX_NOTES, size=n),
+        })
+
+
+def materialize(sf: int = 1, seed: int = 42, n_trucks: int = BASE_TRUCKS, projects=None,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS, transactions: bool = True) -> dict:
+    """Concatenate all streams (pakai untuk SF kecil/menengah; SF besar → konsumsi iterator).
+
+    transactions=False → audit log tidak di-concat (dashboard membacanya dari AuditLog).
+    """
+    p = plan(sf, n_trucks)
+    people = scaled_people(p, seed)
+    out = {
+        "plan": p,
+        "people": people,
+        "trucks": scaled_trucks(p, people, seed),
+        "inventory": pd.concat(list(iter_inventory(p, seed, projects, chunk_rows)), ignore_index=True),
+    }
+    if transactions:
+        out["tx"] = pd.concat(list(iter_transactions(p, people, seed, projects, chunk_rows)), ignore_index=True)
+    return out
@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import pandas as pd
+
+from data.filter_index import index_for, project_positions
+
+# ─────────────────────────────────────────────────────────────
+# Background snapshot scheduler
+# Satu thread per konfigurasi dataset membangun state dashboard
+# (data, alerts, KPI, …) dengan cadence sendiri lalu mem-publish
+# Snapshot immutable lewat satu assignment referensi. Rerun Streamlit
+# cukup membaca snapshot terakhir → latency rerun tidak ikut ukuran data.
+# Frame di dalam snapshot dipakai bersama: jangan di-mutate (pandas CoW
+# membuat perubahan di sisi pembaca menjadi salinan lokal).
+# ─────────────────────────────────────────────────────────────
+REFRESH_S = 2.0
+IDLE_STOP_S = 300.0       # tidak ada pembaca selama ini → thread berhenti, start lagi saat dibaca
+ALL = "ALL"
+_VIEW_CACHE_MAX = 32
+
+# (id(inventory), id(tx), project) -> SessionView; frame ikut ditahan di view → id tidak dipakai ulang.
+# Snapshot baru dengan frame yang sama (cache provider hit) memakai ulang proyeksi yang sudah ada.
+_view_cache = OrderedDict()
+_view_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class SessionView:
+    """Per-session projection of a snapshot (project filter); frames shared, never copied per session."""
+
+    project: str
+    inventory: pd.DataFrame
+    tx: pd.DataFrame
+    source: tuple = field(default=(), repr=False, compare=False)   # frame kanonik asal proyeksi
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    built_at: datetime
+    build_ms: float
+    data: Mapping[str, pd.DataFrame]
+    kpis: Any
+    trails: pd.DataFrame | None = None
+    extras: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    @property
+    def age_s(self) -> float:
+        return (datetime.now() - self.built_at).total_seconds()
+
+    def view(self, project: str = ALL) -> SessionView:
+        """Filtered view, built once per (frames, project) and shared by every session."""
+        inv, tx = self.data["inventory"], self.data["tx"]
+        if project == ALL:
+            return SessionView(project, inv, tx)      # tanpa copy: frame kanonik apa adanya
+        key = (id(inv), id(tx), project)
+        with _view_lock:
+            v = _view_cache.get(key)
+            if v is not None and v.source[0] is inv and v.source[1] is tx:
+                _view_cache.move_to_end(key)
+                return v
+        v = _project_view(inv, tx, project)
+        with _view_lock:
+            _view_cache[key] = v
+            while len(_view_cache) > _VIEW_CACHE_MAX:
+                _view_cache.popitem(last=False)
+        return v
+
+
+def _project_view(inv: pd.DataFrame, tx: pd.DataFrame, project: str) -> SessionView:
+    # lookup FilterIndex → take posisi hasil saja (tanpa mask + copy atas frame penuh)
+    inv_pos = project_positions(inv, project, include_unassigned=True)
+    tx_pos = project_positions(tx, project)
+    return SessionView(project, inv.take(inv_pos), tx.take(tx_pos), source=(inv, tx))
+
+
+def warm_indexes(data: dict, columns=("project", "status", "category", "location", "action")):
+    """Build FilterIndex groups for the canonical frames (dipanggil di thread builder)."""
+    for name in ("inventory", "tx"):
+        df = data.get(name)
+        if df is None:
+            continue
+        idx = index_for(df)
+        for col in columns:
+            if col in df.columns:
+                idx.counts(col)
+
+
+def make_snapshot(version: int, data: dict, kpis, trails=None, extras=None, t0: float | None = None) -> Snapshot:
+    return Snapshot(
+        version=version,
+        built_at=datetime.now(),
+        build_ms=round((time.perf_counter() - t0) * 1000, 2) if t0 is not None else 0.0,
+        data=MappingProxyType(dict(data)),
+        kpis=kpis,
+        trails=trails,
+        extras=MappingProxyType(dict(extras or {})),
+    )
+
+
+class SnapshotScheduler:
+    """Rebuilds a Snapshot every ``interval_s`` on a daemon thread; readers get the latest one.
+
+    build(version) → Snapshot. Thread dimulai saat pertama dibaca dan berhenti sendiri
+    kalau tidak ada pembaca selama ``idle_stop_s``.
+    """
+
+    def __init__(self, build, interval_s: float = REFRESH_S, idle_stop_s: float = IDLE_STOP_S,
+                 name: str = "snapshot"):
+        self._build = build
+        self.interval_s = interval_s
+        self.idle_stop_s = idle_stop_s
+        self.name = name
+        self._snap = None
+        self._version = 0
+        self._build_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_read = time.monotonic()
+        self.last_error = None
+        self.builds = 0
+
+    def refresh(self) -> Snapshot:
+        """Build and publish now (synchronous); concurrent callers share one build."""
+        with self._build_lock:
+            version = self._version + 1
+            snap = self._build(version)
+            self._version = version
+            self._snap = snap                 # publish: satu assignment referensi
+            self.builds += 1
+            return snap
+
+    def latest(self) -> Snapshot:
+        """Snapshot terbaru; pembacaan pertama setelah idle stop membangun ulang secara sinkron."""
+        self._last_read = time.monotonic()
+        restarted = self._ensure_running()
+        snap = self._snap
+        if snap is None:
+            return self.refresh()
+        if restarted and snap.age_s > self.interval_s:      # thread sempat berhenti → snapshot basi
+            try:
+                return self.refresh()
+            except Exception as e:             # snapshot lama tetap dipakai
+                self.last_error = repr(e)
+        return snap
+
+    def request_refresh(self):
+        """Wake the worker for an early rebuild (mis. setelah ack alert)."""
+        self._wake.set()
+
+    def _ensure_running(self) -> bool:
+        """Start the worker kalau belum / sudah berhenti. True = thread baru saja di-(re)start."""
+        with self._state_lock:
+            if self._stop.is_set() or (self._thread is not None and self._thread.is_alive()):
+                return False
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-scheduler", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            if self._stop.is_set() or time.monotonic() - self._last_read > self.idle_stop_s:
+                return
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:             # snapshot lama tetap dipakai
+                self.last_error = repr(e)
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def stats(self) -> dict:
+        snap = self._snap
+        return {
+            "version": snap.version if snap else 0,
+            "age_s": round(snap.age_s, 2) if snap else None,
+            "build_ms": snap.build_ms if snap else None,
+            "builds": self.builds,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "last_error": self.last_error,
+        }
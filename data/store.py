@@ -0,0 +1,224 @@
+import sqlite3
+import threading
+
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# Storage layer — embedded database (SQLite)
+# people / trucks / inventory / transactions / alert_history dengan
+# index pada asset_id, project, status, time. Panel membaca lewat query
+# per panel (filter + LIMIT/OFFSET di database), bukan reload frame penuh.
+# trucks / inventory di-upsert dari tiap snapshot (sync) → tidak basi.
+# ─────────────────────────────────────────────────────────────
+MEMORY = ":memory:"
+
+TABLES = {
+    "people": [("person_id", "TEXT"), ("name", "TEXT"), ("role", "TEXT")],
+    "trucks": [("truck_id", "TEXT"), ("plate", "TEXT"), ("driver_id", "TEXT"), ("driver_name", "TEXT"),
+               ("status", "TEXT"), ("lat", "DOUBLE"), ("lon", "DOUBLE"),
+               ("speed_kmh", "INTEGER"), ("fuel_liters", "INTEGER")],
+    "inventory": [("asset_id", "TEXT"), ("category", "TEXT"), ("serial", "TEXT"), ("qr_code", "TEXT"),
+                  ("status", "TEXT"), ("project", "TEXT"), ("assigned_to", "TEXT"), ("location", "TEXT"),
+                  ("due_return", "TIMESTAMP")],
+    "transactions": [("time", "TIMESTAMP"), ("action", "TEXT"), ("asset_id", "TEXT"), ("category", "TEXT"),
+                     ("person_id", "TEXT"), ("person_name", "TEXT"), ("project", "TEXT"), ("note", "TEXT")],
+    "alert_history": [("time", "TIMESTAMP"), ("severity", "TEXT"), ("message", "TEXT"),
+                      ("rule", "TEXT"), ("entity", "TEXT")],
+}
+
+INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_people_id ON people (person_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_trucks_id ON trucks (truck_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_inv_asset ON inventory (asset_id)",
+    "CREATE INDEX IF NOT EXISTS ix_inv_project_status ON inventory (project, status)",
+    "CREATE INDEX IF NOT EXISTS ix_inv_status ON inventory (status)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_time ON transactions (time)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_asset_time ON transactions (asset_id, time)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_project_time ON transactions (project, time)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_action ON transactions (action)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_alert_key ON alert_history (rule, entity, time)",
+    "CREATE INDEX IF NOT EXISTS ix_alert_time ON alert_history (time)",
+]
+
+_TIME_COLS = {t: [c for c, typ in cols if typ == "TIMESTAMP"] for t, cols in TABLES.items()}
+_COLUMNS = {t: [c for c, _ in cols] for t, cols in TABLES.items()}
+
+
+class Store:
+    """Embedded database for the dashboard datasets; satu koneksi, diserialisasi dengan lock."""
+
+    def __init__(self, path: str = MEMORY):
+        self.path = path
+        self._lock = threading.Lock()
+        self._synced = {}                                     # table -> frame terakhir yang di-upsert
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock:
+            for table, cols in TABLES.items():
+                ddl = ", ".join(f"{c} {typ}" for c, typ in cols)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({ddl})")
+            for stmt in INDEXES:
+                self._conn.execute(stmt)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ── write ────────────────────────────────────────────────
+    def _rows(self, table: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Frame → kolom tabel; categorical/NaN → None, timestamp → ISO text."""
+        out = {}
+        for col in _COLUMNS[table]:
+            s = df[col] if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+            if col in _TIME_COLS[table]:
+                s = pd.to_datetime(s, errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+            out[col] = s.astype(object).where(s.notna(), None)
+        return pd.DataFrame(out)
+
+    def write(self, table: str, df: pd.DataFrame, replace: bool = True, ignore_duplicates: bool = False,
+              upsert: bool = False) -> int:
+        """Bulk insert (replace=True → kosongkan tabel dulu; upsert=True → baris dengan key unik sama
+        diganti). Returns rows written."""
+        rows = self._rows(table, df)
+        cols = ", ".join(_COLUMNS[table])
+        verb = "INSERT OR REPLACE" if upsert else "INSERT OR IGNORE" if ignore_duplicates else "INSERT"
+        marks = ", ".join("?" * len(_COLUMNS[table]))
+        with self._lock:
+            if replace:
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.executemany(f"{verb} INTO {table} ({cols}) VALUES ({marks})",
+                                   rows.itertuples(index=False, name=None))
+            self._conn.commit()
+        return len(rows)
+
+    def load(self, data: dict):
+        """Seed every table from dashboard frames (keys: people/trucks/inventory/tx/alerts)."""
+        for table, name in (("people", "people"), ("trucks", "trucks"), ("inventory", "inventory"),
+                            ("transactions", "tx")):
+            if name in data:
+                self.write(table, data[name])
+        if "alerts" in data:
+            self.record_alerts(data["alerts"])
+        self._synced = {t: data[t] for t in ("trucks", "inventory") if t in data}
+
+    def sync(self, data: dict) -> int:
+        """Upsert trucks / inventory dari snapshot baru (frame yang sama dengan sync terakhir di-skip)
+        + append alert baru. Returns rows written."""
+        n = 0
+        for table in ("trucks", "inventory"):
+            df = data.get(table)
+            if df is not None and df is not self._synced.get(table):
+                n += self.write(table, df, replace=False, upsert=True)
+                self._synced[table] = df
+        return n + self.record_alerts(data.get("alerts"))
+
+    def record_alerts(self, alerts: pd.DataFrame) -> int:
+        """Append alerts ke history; (rule, entity, time) yang sudah ada di-skip."""
+        if alerts is None or alerts.empty:
+            return 0
+        return self.write("alert_history", alerts, replace=False, ignore_duplicates=True)
+
+    # ── read ─────────────────────────────────────────────────
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=list(params))
+        for col in df.columns:
+            if col in ("time", "due_return"):
+                df[col] = pd.to_datetime(df[col])
+        return df
+
+    def scalar(self, sql: str, params=()):
+        with self._lock:
+            row = self._conn.execute(sql, list(params)).fetchone()
+        return row[0] if row else None
+
+    def count(self, table: str, project=None, include_unassigned: bool = False) -> int:
+        where, params = self._where(table, project=project, include_unassigned=include_unassigned)
+        return int(self.scalar(f"SELECT COUNT(*) FROM {table}{where}", params))
+
+    def _where(self, table: str, filters=None, search: str = "", search_cols=(), project=None,
+               include_unassigned: bool = False):
+        clauses, params = [], []
+        if project is not None:
+            clauses.append("(project = ? OR project IS NULL OR project = '-')" if include_unassigned
+                           else "project = ?")
+            params.append(project)
+        for col, value in (filters or {}).items():
+            if col not in _COLUMNS[table]:
+                raise ValueError(f"unknown column {col!r} for {table}")
+            clauses.append(f"{col} = ?")
+            params.append(value)
+        if search:
+            cols = [c for c in search_cols if c in _COLUMNS[table]]
+            if cols:                                      # LIKE SQLite: case-insensitive (ASCII)
+                clauses.append("(" + " OR ".join(f"{c} LIKE ?" for c in cols) + ")")
+                params.extend([f"%{search}%"] * len(cols))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page(self, table: str, filters=None, search: str = "", search_cols=(), sort_by: str | None = None,
+             descending: bool = False, limit: int = 50, offset: int = 0, project=None,
+             include_unassigned: bool = False) -> tuple:
+        """One page of ``table`` → (frame, n_match). Filter, sort dan LIMIT/OFFSET di database."""
+        where, params = self._where(table, filters, search, search_cols, project, include_unassigned)
+        order = ""
+        if sort_by:
+            if sort_by not in _COLUMNS[table]:
+                raise ValueError(f"unknown column {sort_by!r} for {table}")
+            order = f" ORDER BY {sort_by} IS NULL, {sort_by} {'DESC' if descending else 'ASC'}"
+        n = int(self.scalar(f"SELECT COUNT(*) FROM {table}{where}", params))
+        df = self.query(f"SELECT {', '.join(_COLUMNS[table])} FROM {table}{where}{order} LIMIT ? OFFSET ?",
+                        params + [int(limit), int(offset)])
+        return df, n
+
+    def distinct(self, table: str, col: str) -> list:
+        if col not in _COLUMNS[table]:
+            raise ValueError(f"unknown column {col!r} for {table}")
+        df = self.query(f"SELECT DISTINCT {col} FROM {table} WHERE {col} IS NOT NULL AND {col} <> '-' ORDER BY 1")
+        return df[col].astype(str).tolist()
+
+    # ── per-panel queries ────────────────────────────────────
+    def inventory(self, project=None, status=None, limit: int | None = None) -> pd.DataFrame:
+        where, params = self._where("inventory", {"status": status} if status else None,
+                                    project=project, include_unassigned=True)
+        sql = f"SELECT * FROM inventory{where}" + (" LIMIT ?" if limit else "")
+        return self.query(sql, params + ([int(limit)] if limit else []))
+
+    def status_counts(self, by: str = "project", project=None) -> pd.DataFrame:
+        """Asset counts per ``by`` × status (sama dengan kpi.status_breakdown, dihitung di database)."""
+        if by not in _COLUMNS["inventory"]:
+            raise ValueError(f"unknown column {by!r} for inventory")
+        where, params = self._where("inventory", project=project)
+        where = (where + " AND" if where else " WHERE") + f" {by} IS NOT NULL AND {by} <> '-'"
+        df = self.query(f"SELECT {by}, status, COUNT(*) AS n FROM inventory{where} GROUP BY {by}, status", params)
+        out = df.pivot(index=by, columns="status", values="n").fillna(0).astype(int)
+        out.columns.name = "status"
+        return out
+
+    def asset_history(self, asset_id: str, limit: int = 100) -> pd.DataFrame:
+        return self.query("SELECT * FROM transactions WHERE asset_id = ? ORDER BY time DESC LIMIT ?",
+                          [asset_id, int(limit)])
+
+    def transactions(self, project=None, since=None, until=None, limit: int = 200) -> pd.DataFrame:
+        """Terbaru dulu; time range memakai index (project, time) / (time)."""
+        where, params = self._where("transactions", project=project)
+        for op, ts in ((">=", since), ("<", until)):
+            if ts is not None:
+                where = (where + " AND" if where else " WHERE") + f" time {op} ?"
+                params.append(pd.Timestamp(ts).strftime("%Y-%m-%d %H:%M:%S"))
+        return self.query(f"SELECT * FROM transactions{where} ORDER BY time DESC LIMIT ?", params + [int(limit)])
+
+    def alert_history(self, since=None, entity=None, limit: int = 500) -> pd.DataFrame:
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("time >= ?")
+            params.append(pd.Timestamp(since).strftime("%Y-%m-%d %H:%M:%S"))
+        if entity is not None:
+            clauses.append("entity = ?")
+            params.append(entity)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return self.query(f"SELECT * FROM alert_history{where} ORDER BY time DESC LIMIT ?", params + [int(limit)])
+
+    def stats(self) -> dict:
+        return {"path": self.path, **{t: self.count(t) for t in TABLES}}
+
@@ -0,0 +1,290 @@
+import json
+import queue
+import socket
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# Telemetry ingestion — ping posisi / fuel per truck
+# Source (replay / file / socket) → bounded queue (backpressure) →
+# consumer thread → ring buffer numpy per truck. Streamlit rerun hanya
+# membaca latest() / trails(); ingest berjalan di thread sendiri.
+# ─────────────────────────────────────────────────────────────
+PING_FIELDS = ["ts", "lat", "lon", "speed_kmh", "fuel_liters"]
+PING_COLUMNS = ["truck_id"] + PING_FIELDS
+DEFAULT_TRAIL = 120          # ping per truck yang disimpan
+DEFAULT_QUEUE_BATCHES = 256
+
+
+class RingBuffers:
+    """Fixed-size per-entity ring buffers in one (slots, capacity, fields) float array."""
+
+    def __init__(self, capacity: int = DEFAULT_TRAIL, slots: int = 64):
+        self.capacity = capacity
+        self._data = np.full((slots, capacity, len(PING_FIELDS)), np.nan)
+        self._head = np.zeros(slots, dtype=np.int64)      # posisi tulis berikutnya
+        self._count = np.zeros(slots, dtype=np.int64)
+        self._slot = {}                                   # entity id -> slot
+        self._ids = []
+
+    def _slots_for(self, ids: np.ndarray) -> np.ndarray:
+        uniq, inv = np.unique(ids, return_inverse=True)
+        for u in uniq:
+            if u not in self._slot:
+                self._slot[u] = len(self._ids)
+                self._ids.append(u)
+        if len(self._ids) > len(self._head):
+            grow = max(len(self._ids), 2 * len(self._head)) - len(self._head)
+            self._data = np.concatenate([self._data, np.full((grow,) + self._data.shape[1:], np.nan)])
+            self._head = np.concatenate([self._head, np.zeros(grow, dtype=np.int64)])
+            self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.int64)])
+        return np.array([self._slot[u] for u in uniq], dtype=np.int64)[inv]
+
+    def append(self, ids: np.ndarray, values: np.ndarray):
+        """Append pings (ids[i], values[i, :]) in arrival order, vectorized per batch."""
+        if len(ids) == 0:
+            return
+        slot = self._slots_for(ids)
+        order = np.argsort(slot, kind="stable")
+        slot, values = slot[order], values[order]
+        uniq, start, counts = np.unique(slot, return_index=True, return_counts=True)
+        rank = np.arange(len(slot)) - np.repeat(start, counts)
+        # batch lebih panjang dari capacity → hanya `capacity` terakhir yang relevan
+        keep = rank >= np.repeat(counts, counts) - self.capacity
+        slot, values, rank = slot[keep], values[keep], rank[keep]
+        pos = (self._head[slot] + rank - np.repeat(np.maximum(counts - self.capacity, 0), counts)[keep]) % self.capacity
+        self._data[slot, pos] = values
+        n = np.minimum(counts, self.capacity)
+        self._head[uniq] = (self._head[uniq] + n) % self.capacity
+        self._count[uniq] = np.minimum(self._count[uniq] + n, self.capacity)
+
+    def latest(self) -> pd.DataFrame:
+        n = len(self._ids)
+        if n == 0:
+            return pd.DataFrame(columns=PING_COLUMNS)
+        last = self._data[np.arange(n), (self._head[:n] - 1) % self.capacity]
+        df = pd.DataFrame(last, columns=PING_FIELDS)
+        df.insert(0, "truck_id", self._ids)
+        return df
+
+    def trail(self, entity, n: int | None = None) -> np.ndarray:
+        """Oldest → newest pings for one entity, shape (k, fields)."""
+        s = self._slot.get(entity)
+        if s is None:
+            return np.empty((0, len(PING_FIELDS)))
+        k = int(min(self._count[s], n or self.capacity))
+        idx = (self._head[s] - k + np.arange(k)) % self.capacity
+        return self._data[s, idx].copy()
+
+    def trails(self, n: int | None = None) -> pd.DataFrame:
+        """Long frame (truck_id + ping fields), oldest → newest per truck."""
+        parts = [(e, self.trail(e, n)) for e in self._ids]
+        if not parts:
+            return pd.DataFrame(columns=PING_COLUMNS)
+        df = pd.DataFrame(np.concatenate([p for _, p in parts]), columns=PING_FIELDS)
+        df.insert(0, "truck_id", np.repeat([e for e, _ in parts], [len(p) for _, p in parts]))
+        return df
+
+
+def _as_batch(batch) -> tuple:
+    """Ping batch (DataFrame / list of dicts) → (ids, values[n, fields])."""
+    df = batch if isinstance(batch, pd.DataFrame) else pd.DataFrame(list(batch))
+    if "ts" not in df:
+        df = df.assign(ts=time.time())
+    values = df.reindex(columns=PING_FIELDS).to_numpy(dtype=float)
+    return df["truck_id"].astype(str).to_numpy(), values
+
+
+class TelemetryPipeline:
+    """Bounded ingest queue + consumer thread feeding per-truck ring buffers.
+
+    policy="block"       → producer menunggu kalau queue penuh (backpressure ke source);
+    policy="drop_oldest" → batch tertua dibuang, producer tidak pernah tertahan.
+    """
+
+    def __init__(self, trail: int = DEFAULT_TRAIL, max_batches: int = DEFAULT_QUEUE_BATCHES,
+                 policy: str = "block"):
+        self.buffers = RingBuffers(capacity=trail)
+        self.policy = policy
+        self._queue = queue.Queue(maxsize=max_batches)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self.version = 0
+        self._applied = (None, None, None)               # (version, trucks, hasil apply)
+        self.stats = {"pings": 0, "batches": 0, "dropped_batches": 0, "backpressure": 0, "errors": 0}
+        self._consumer = threading.Thread(target=self._consume, name="telemetry-consumer", daemon=True)
+        self._consumer.start()
+
+    # ── producer side ────────────────────────────────────────
+    def submit(self, batch, timeout: float | None = None) -> bool:
+        if self._stop.is_set():
+            return False
+        if self.policy == "drop_oldest":
+            while True:
+                try:
+                    self._queue.put_nowait(batch)
+                    return True
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self.stats["dropped_batches"] += 1
+                    except queue.Empty:
+                        pass
+        try:
+            self._queue.put(batch, timeout=timeout)
+            return True
+        except queue.Full:
+            self.stats["backpressure"] += 1               # caller memutuskan retry / buang
+            return False
+
+    def attach(self, source, name: str = "telemetry-source"):
+        """Run an iterable of ping batches on its own producer thread."""
+        def run():
+            try:
+                for batch in source:
+                    if self._stop.is_set():
+                        break
+                    while not self.submit(batch, timeout=0.5):
+                        if self._stop.is_set():
+                            return
+            except Exception:
+                self.stats["errors"] += 1
+
+        t = threading.Thread(target=run, name=name, daemon=True)
+        t.start()
+        self._threads.append(t)
+        return t
+
+    # ── consumer side ────────────────────────────────────────
+    def _consume(self):
+        while not self._stop.is_set():
+            try:
+                batches = [self._queue.get(timeout=0.25)]
+            except queue.Empty:
+                continue
+            while len(batches) < 64:                      # coalesce yang sudah antre
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                parts = [_as_batch(b) for b in batches]
+                ids = np.concatenate([p[0] for p in parts])
+                values = np.concatenate([p[1] for p in parts])
+                with self._lock:
+                    self.buffers.append(ids, values)
+                    self.version += 1
+                self.stats["pings"] += len(ids)
+                self.stats["batches"] += len(batches)
+            except Exception:
+                self.stats["errors"] += 1
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until queued batches are consumed (tests / benchmarks)."""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+    def close(self):
+        self._stop.set()
+        self._consumer.join(timeout=1.0)
+
+    # ── read side (dipanggil dari rerun Streamlit) ───────────
+    def latest(self) -> pd.DataFrame:
+        with self._lock:
+            return self.buffers.latest()
+
+    def trails(self, n: int | None = None) -> pd.DataFrame:
+        with self._lock:
+            return self.buffers.trails(n)
+
+    def apply(self, trucks: pd.DataFrame) -> pd.DataFrame:
+        """trucks dengan lat/lon/speed/fuel dari ping terakhir (truck tanpa ping tidak berubah).
+
+        Hasil di-cache per version → frame identik antar rerun selama tidak ada ping baru.
+        """
+        version, base, out = self._applied
+        if version == self.version and base is trucks:
+            return out
+        version = self.version
+        last = self.latest()
+        if last.empty:
+            return trucks
+        last = last.set_index("truck_id")
+        pos = last.index.get_indexer(trucks["truck_id"].astype(str))
+        has = pos >= 0
+        out = trucks.copy()
+        for col in ("lat", "lon", "speed_kmh", "fuel_liters"):
+            vals = last[col].to_numpy()[pos[has]]
+            if col in ("speed_kmh", "fuel_liters"):
+                vals = np.round(vals).astype(out[col].dtype)
+            out.loc[has, col] = vals
+        self._applied = (version, trucks, out)
+        return out
+
+
+# ─────────────────────────────────────────────────────────────
+# Sources — iterables of ping batches
+# ─────────────────────────────────────────────────────────────
+def replay_source(trucks: pd.DataFrame, hz: float = 1.0, seed: int = 0, ticks: int | None = None,
+                  burn_l_per_km: float = 0.35):
+    """Simulated pings: MOVING trucks drift along a heading, fuel drops with distance."""
+    rng = np.random.default_rng(seed)
+    ids = trucks["truck_id"].astype(str).to_numpy()
+    lat = trucks["lat"].to_numpy(dtype=float).copy()
+    lon = trucks["lon"].to_numpy(dtype=float).copy()
+    speed = trucks["speed_kmh"].to_numpy(dtype=float).copy()
+    fuel = trucks["fuel_liters"].to_numpy(dtype=float).copy()
+    moving = (trucks["status"].astype(str) == "MOVING").to_numpy()
+    heading = rng.uniform(0, 2 * np.pi, len(ids))
+    dt = 1.0 / hz
+    k = 0
+    while ticks is None or k < ticks:
+        heading += rng.normal(0, 0.25, len(ids))
+        km = np.where(moving, speed * dt / 3600.0, 0.0)
+        lat += km / 111.32 * np.cos(heading)
+        lon += km / (111.32 * np.cos(np.radians(lat))) * np.sin(heading)
+        speed = np.where(moving, np.clip(speed + rng.normal(0, 3, len(ids)), 10, 80), 0.0)
+        fuel = np.maximum(fuel - km * burn_l_per_km, 0.0)
+        yield pd.DataFrame({"truck_id": ids, "ts": time.time(), "lat": lat, "lon": lon,
+                            "speed_kmh": speed, "fuel_liters": fuel})
+        k += 1
+        if ticks is None:
+            time.sleep(dt)
+
+
+def file_source(path, batch_rows: int = 5_000):
+    """CSV (kolom PING_COLUMNS) atau JSON lines, dibaca per chunk."""
+    path = Path(path)
+    if path.suffix in (".jsonl", ".ndjson"):
+        yield from pd.read_json(path, lines=True, chunksize=batch_rows)
+    else:
+        yield from pd.read_csv(path, chunksize=batch_rows)
+
+
+def socket_source(host: str, port: int, batch_rows: int = 1_000, max_wait_s: float = 0.2):
+    """Newline-delimited JSON pings over TCP; batch dikirim per ``batch_rows`` atau ``max_wait_s``."""
+    with socket.create_connection((host, port)) as conn:
+        conn.settimeout(max_wait_s)
+        buf, rows, t0 = b"", [], time.monotonic()
+        while True:
+            try:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+            except socket.timeout:
+                pass
+            *lines, buf = buf.split(b"\n")
+            rows.extend(json.loads(l) for l in lines if l.strip())
+            if rows and (len(rows) >= batch_rows or time.monotonic() - t0 >= max_wait_s):
+                yield rows
+                rows, t0 = [], time.monotonic()
+        if rows:
+            yield rows
@@ -0,0 +1,220 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────────
+# Fuel history store — reading tank / truck per entity
+# raw → rollup 5min / 1h / 1D (min, max, sum, count, last). Append hanya
+# meng-agregasi batch baru sebagai chunk (O(batch)); bucket yang sama di
+# beberapa chunk di-merge saat dibaca / compaction. Tiap resolusi punya
+# retention sendiri.
+# Query memilih resolusi terkasar yang masih cukup detail lalu
+# downsample (LTTB + min/max band) → jumlah titik ke Plotly terbatas.
+# ─────────────────────────────────────────────────────────────
+RESOLUTIONS = {"5min": pd.Timedelta("5min"), "1h": pd.Timedelta("1h"), "1D": pd.Timedelta("1D")}
+RETENTION = {"raw": pd.Timedelta("2h"), "5min": pd.Timedelta("14D"), "1h": pd.Timedelta("180D"),
+             "1D": pd.Timedelta("1095D")}
+MAX_POINTS = 400
+_RAW_CHUNKS_MAX = 64
+_LOCAL_TZ = datetime.now().astimezone().tzinfo      # mock data memakai waktu lokal naive
+_AGG = {"min": "min", "max": "max", "sum": "sum", "count": "sum", "last": "last"}
+
+
+def _merge(chunks: list) -> pd.DataFrame:
+    """Rollup chunks (urut kedatangan) → satu frame, bucket duplikat digabung per _AGG."""
+    df = pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+    return df.groupby(level=[0, 1]).agg(_AGG) if df.index.has_duplicates else df
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``n_out`` points preserving the visual shape."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)      # bucket tengah: [edges[i], edges[i+1])
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()             # rata-rata bucket berikutnya
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        out[i + 1] = a
+    return out
+
+
+class SeriesStore:
+    """Multi-resolution per-entity series for one metric kind (mis. "tank" / "truck")."""
+
+    def __init__(self, retention: dict | None = None):
+        self.retention = {**RETENTION, **(retention or {})}
+        self._raw = []                                          # chunks (entity, time, value)
+        self._rollups = {r: [] for r in RESOLUTIONS}             # chunks (entity, bucket) → _AGG
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def append(self, entity, time, value):
+        """Append readings (array-like, satu batch); biaya O(batch), tidak menyentuh rollup lama."""
+        batch = pd.DataFrame({"entity": np.asarray(entity).astype(str), "time": pd.to_datetime(np.asarray(time)),
+                              "value": np.asarray(value, dtype=float)}).dropna(subset=["value"])
+        if batch.empty:
+            return 0
+        batch = batch.sort_values("time", kind="stable")
+        with self._lock:
+            self._raw.append(batch)
+            if len(self._raw) > _RAW_CHUNKS_MAX:
+                self._raw = [pd.concat(self._raw, ignore_index=True)]
+            for res, width in RESOLUTIONS.items():
+                chunks = self._rollups[res]
+                chunks.append(batch.assign(bucket=batch["time"].dt.floor(width))
+                              .groupby(["entity", "bucket"])["value"].agg(["min", "max", "sum", "count", "last"]))
+                if len(chunks) > _RAW_CHUNKS_MAX:
+                    self._rollups[res] = [_merge(chunks)]
+            self.version += 1
+        return len(batch)
+
+    def enforce_retention(self, now=None) -> dict:
+        """Drop data older than each resolution's retention. Returns rows dropped per level."""
+        now = pd.Timestamp(now or datetime.now())
+        dropped = {}
+        with self._lock:
+            raw = pd.concat(self._raw, ignore_index=True) if self._raw else None
+            if raw is not None:
+                keep = raw["time"] >= now - self.retention["raw"]
+                dropped["raw"] = int((~keep).sum())
+                self._raw = [raw[keep]] if keep.any() else []
+            for res, chunks in self._rollups.items():
+                kept = []
+                for df in chunks:
+                    keep = df.index.get_level_values(1) >= now - self.retention[res]
+                    dropped[res] = dropped.get(res, 0) + int((~keep).sum())
+                    if keep.any():
+                        kept.append(df[keep])
+                self._rollups[res] = kept
+            self.version += 1
+        return dropped
+
+    def entities(self) -> list:
+        return sorted(set().union(*(df.index.get_level_values(0).unique() for df in self._rollups["1D"])))
+
+    def _level(self, res: str, entities, start, end) -> pd.DataFrame:
+        """One resolution as (entity, time, mean, min, max, last) rows."""
+        if res == "raw":
+            raw = pd.concat(self._raw, ignore_index=True) if self._raw else pd.DataFrame(columns=["entity", "time", "value"])
+            rows = raw[raw["entity"].isin(entities) & (raw["time"] >= start) & (raw["time"] < end)]
+            v = rows["value"]
+            return pd.DataFrame({"entity": rows["entity"], "time": rows["time"], "mean": v, "min": v, "max": v,
+                                 "last": v}).sort_values(["entity", "time"], kind="stable")
+        parts = []
+        for df in self._rollups[res]:
+            ent, t = df.index.get_level_values(0), df.index.get_level_values(1)
+            part = df[ent.isin(entities) & (t >= start) & (t < end)]
+            if len(part):
+                parts.append(part)
+        if not parts:
+            return pd.DataFrame(columns=["entity", "time", "mean", "min", "max", "last"])
+        rows = _merge(parts).sort_index()
+        return pd.DataFrame({"entity": rows.index.get_level_values(0), "time": rows.index.get_level_values(1),
+                             "mean": (rows["sum"] / rows["count"]).to_numpy(), "min": rows["min"].to_numpy(),
+                             "max": rows["max"].to_numpy(), "last": rows["last"].to_numpy()})
+
+    def pick_resolution(self, start, end, max_points: int = MAX_POINTS, now=None) -> str:
+        """Resolusi paling detail yang masih ≤ 8×max_points bucket dan masih dalam retention."""
+        now = pd.Timestamp(now or datetime.now())
+        span = pd.Timestamp(end) - pd.Timestamp(start)
+        if pd.Timestamp(start) >= now - self.retention["raw"] and self._raw:
+            return "raw"
+        for res, width in RESOLUTIONS.items():
+            if span / width <= 8 * max_points and pd.Timestamp(start) >= now - self.retention[res]:
+                return res
+        return "1D"
+
+    def series(self, entities, start=None, end=None, resolution: str = "auto",
+               max_points: int = MAX_POINTS) -> pd.DataFrame:
+        """(entity, time, mean, min, max) per entity, ≤ max_points rows each.
+
+        Titik dipilih LTTB atas mean; min/max tiap titik = envelope seluruh bucket yang
+        diwakilinya → spike / dip tetap terlihat sebagai band walau titiknya dibuang.
+        """
+        now = pd.Timestamp(datetime.now())
+        end = pd.Timestamp(end) if end is not None else now
+        start = pd.Timestamp(start) if start is not None else end - pd.Timedelta("7D")
+        entities = [str(e) for e in ([entities] if isinstance(entities, str) else entities)]
+        res = self.pick_resolution(start, end, max_points, now) if resolution == "auto" else resolution
+        with self._lock:
+            rows = self._level(res, entities, start, end)
+        parts = []
+        for ent, g in rows.groupby("entity", sort=False):
+            if len(g) > max_points:
+                x = g["time"].to_numpy().astype("datetime64[ns]").astype(np.int64)
+                keep = lttb(x, g["mean"].to_numpy(dtype=float), max_points)
+                lo = np.minimum.reduceat(g["min"].to_numpy(dtype=float), keep)
+                hi = np.maximum.reduceat(g["max"].to_numpy(dtype=float), keep)
+                g = g.iloc[keep].assign(min=lo, max=hi)
+            parts.append(g)
+        out = pd.concat(parts, ignore_index=True) if parts else rows.iloc[:0]
+        out.attrs["resolution"] = res
+        return out
+
+    def window(self, start, end=None, resolution: str = "1h") -> pd.DataFrame:
+        """Semua entity, satu resolusi tanpa downsampling (long: entity, time, last)."""
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp(datetime.now())
+        with self._lock:
+            return self._level(resolution, self.entities(), pd.Timestamp(start), end)
+
+    def stats(self) -> dict:
+        with self._lock:
+            for res, chunks in self._rollups.items():
+                if len(chunks) > 1:
+                    self._rollups[res] = [_merge(chunks)]
+            return {"raw": sum(len(c) for c in self._raw),
+                    **{r: sum(len(df) for df in c) for r, c in self._rollups.items()},
+                    "entities": len(self.entities()), "version": self.version}
+
+
+class FuelHistory:
+    """Tank + truck fuel series (satu SeriesStore per kind)."""
+
+    KINDS = ("tank", "truck")
+
+    def __init__(self, retention: dict | None = None):
+        self.stores = {k: SeriesStore(retention) for k in self.KINDS}
+        self._seen = {k: {} for k in self.KINDS}                # entity -> waktu reading terakhir
+        self._lock = threading.Lock()
+
+    def __getitem__(self, kind: str) -> SeriesStore:
+        return self.stores[kind]
+
+    def append_frame(self, kind: str, df: pd.DataFrame, id_col: str, value_col: str, time_col: str = "time"):
+        """Append a frame of readings; ``time_col`` numerik = epoch detik (ping telemetry) → waktu lokal."""
+        times = df[time_col] if time_col in df else pd.Series(pd.Timestamp(datetime.now()), index=df.index)
+        if pd.api.types.is_numeric_dtype(times):
+            times = pd.to_datetime(times, unit="s", utc=True).dt.tz_convert(_LOCAL_TZ).dt.tz_localize(None)
+        return self.stores[kind].append(df[id_col].to_numpy(), times.to_numpy(), df[value_col].to_numpy())
+
+    def append_new(self, kind: str, df: pd.DataFrame, id_col: str, value_col: str, time_col: str = "ts"):
+        """Append hanya reading yang lebih baru dari reading terakhir per entity (unik per timestamp).
+
+        Dipakai untuk ring buffer telemetry: frame yang sama boleh dikirim ulang tiap snapshot.
+        """
+        df = df.dropna(subset=[time_col]).drop_duplicates([id_col, time_col], keep="last")
+        with self._lock:
+            seen = self._seen[kind]
+            last = df[id_col].map(seen)
+            df = df[last.isna() | (df[time_col] > last)]
+            if df.empty:
+                return 0
+            seen.update(df.groupby(id_col)[time_col].max().to_dict())
+            return self.append_frame(kind, df, id_col, value_col, time_col)
+
+    def enforce_retention(self, now=None) -> dict:
+        return {k: s.enforce_retention(now) for k, s in self.stores.items()}
+
+    def stats(self) -> dict:
+        return {k: s.stats() for k, s in self.stores.items()}
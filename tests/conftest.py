@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# modul app (config, data, components) di-import dari root repo
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from data.alerts import AlertEngine, LostAssetRule, OverdueRule, Rule, TruckLowFuelRule
+
+NOW = datetime(2025, 1, 10, 12, 0)
+
+
+def _inventory(**status):
+    return pd.DataFrame({
+        "asset_id": list(status),
+        "status": list(status.values()),
+        "category": "Camera",
+        "project": "FILM-A",
+        "due_return": (NOW - timedelta(days=1)).strftime("%Y-%m-%d %H:%M"),
+    })
+
+
+def _trucks(**fuel):
+    return pd.DataFrame({"truck_id": list(fuel), "status": "MOVING", "fuel_liters": list(fuel.values())})
+
+
+@pytest.fixture
+def engine():
+    return AlertEngine(rules=[LostAssetRule(), OverdueRule(), TruckLowFuelRule()])
+
+
+def _keys(df):
+    return set(zip(df["rule"], df["entity"]))
+
+
+def test_rule_is_abstract():
+    with pytest.raises(TypeError):
+        Rule()
+
+
+def test_evaluate_fires_per_rule_and_entity(engine):
+    out = engine.evaluate(inventory=_inventory(A1="LOST", A2="ON-RENT", A3="AVAILABLE"),
+                          trucks=_trucks(T1=20, T2=120), now=NOW)
+    assert _keys(out) == {("lost", "A1"), ("overdue", "A2"), ("truck_low_fuel", "T1")}
+    assert out["severity"].iloc[0] == "DANGER"                 # DANGER diurutkan sebelum WARN
+
+
+def test_unchanged_input_keeps_alerts_and_time(engine):
+    inv = _inventory(A1="LOST")
+    first = engine.evaluate(inventory=inv, now=NOW)
+    again = engine.evaluate(inventory=inv.copy(), now=NOW + timedelta(minutes=5))
+    assert _keys(again) == _keys(first)
+    assert again["time"].tolist() == first["time"].tolist()     # dedup: alert yang sama tidak dibuat ulang
+
+
+def test_changed_row_resolves_alert(engine):
+    engine.evaluate(inventory=_inventory(A1="LOST", A2="LOST"), now=NOW)
+    out = engine.evaluate(inventory=_inventory(A1="AVAILABLE", A2="LOST"), now=NOW + timedelta(minutes=1))
+    assert _keys(out) == {("lost", "A2")}
+    hist = engine.history_frame()
+    assert hist[["rule", "entity"]].values.tolist() == [["lost", "A1"]]
+    assert hist["resolved"].iloc[0] == NOW + timedelta(minutes=1)
+
+
+def test_removed_entity_resolves_alert(engine):
+    engine.evaluate(trucks=_trucks(T1=10, T2=10), now=NOW)
+    out = engine.evaluate(trucks=_trucks(T2=10), now=NOW)
+    assert _keys(out) == {("truck_low_fuel", "T2")}
+
+
+def test_time_based_rule_fires_only_after_due():
+    engine = AlertEngine(rules=[OverdueRule()])
+    inv = _inventory(A1="ON-RENT")
+    assert engine.evaluate(inventory=inv, now=NOW - timedelta(days=2)).empty
+    assert _keys(engine.evaluate(inventory=inv, now=NOW)) == {("overdue", "A1")}
+
+
+def test_acknowledge_hides_until_resolved(engine):
+    engine.evaluate(inventory=_inventory(A1="LOST", A2="LOST"), now=NOW)
+    assert engine.acknowledge([("lost", "A1"), ("lost", "missing")]) == 1
+    assert _keys(engine.frame()) == {("lost", "A2")}
+    assert _keys(engine.frame(include_acked=True)) == {("lost", "A1"), ("lost", "A2")}
+
+    # resolve lalu firing lagi → alert baru, tidak ter-ack
+    engine.evaluate(inventory=_inventory(A1="AVAILABLE", A2="LOST"), now=NOW)
+    out = engine.evaluate(inventory=_inventory(A1="LOST", A2="LOST"), now=NOW)
+    assert _keys(out) == {("lost", "A1"), ("lost", "A2")}
+
+
+def test_acknowledge_all(engine):
+    engine.evaluate(inventory=_inventory(A1="LOST", A2="LOST"), now=NOW)
+    assert engine.acknowledge() == 2
+    assert engine.frame().empty
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from data.geofence import Fence, FenceIndex, GeofenceTracker, haversine_km, points_in_polygon
+
+FENCES = [
+    Fence("Depot", lat=-6.20, lon=106.80, radius_km=2.0),
+    Fence("Site", lat=-6.21, lon=106.81, radius_km=1.0),           # overlap dengan Depot
+    Fence("Yard", lat=0, lon=0, polygon=((-6.40, 106.90), (-6.40, 107.00), (-6.30, 107.00), (-6.30, 106.90))),
+]
+
+
+def _brute_force(lat, lon):
+    out = np.zeros((len(lat), len(FENCES)), dtype=bool)
+    for j, f in enumerate(FENCES):
+        if f.polygon:
+            out[:, j] = points_in_polygon(lat, lon, f.polygon)
+        else:
+            out[:, j] = haversine_km(lat, lon, f.lat, f.lon) <= f.radius_km
+    return out
+
+
+def test_contains_matches_brute_force():
+    rng = np.random.default_rng(7)
+    lat = rng.uniform(-6.45, -6.15, 2000)
+    lon = rng.uniform(106.75, 107.05, 2000)
+    index = FenceIndex(FENCES)
+    assert np.array_equal(index.membership(lat, lon), _brute_force(lat, lon))
+    assert np.array_equal(index.inside_any(lat, lon), _brute_force(lat, lon).any(axis=1))
+
+
+def test_point_in_overlap_belongs_to_both_fences():
+    index = FenceIndex(FENCES)
+    row = index.membership([-6.205], [106.805])[0]
+    assert row.tolist() == [True, True, False]
+
+
+def _positions(*points):
+    return pd.DataFrame(points, columns=["truck_id", "lat", "lon"])
+
+
+def test_tracker_emits_enter_and_exit():
+    tracker = GeofenceTracker(FenceIndex(FENCES))
+    ev = tracker.update(_positions(("T1", -6.205, 106.805), ("T2", -6.35, 106.95)))
+    assert set(zip(ev["entity"], ev["fence"], ev["event"])) == {
+        ("T1", "Depot", "ENTER"), ("T1", "Site", "ENTER"), ("T2", "Yard", "ENTER")}
+
+    # T1 pindah keluar Site tapi tetap di Depot; T2 keluar Yard
+    ev = tracker.update(_positions(("T1", -6.19, 106.79), ("T2", -6.00, 106.50)))
+    assert set(zip(ev["entity"], ev["fence"], ev["event"])) == {("T1", "Site", "EXIT"), ("T2", "Yard", "EXIT")}
+    assert tracker.inside().values.tolist() == [["T1", "Depot"]]
+    assert len(tracker.events_frame()) == 5
+
+
+def test_tracker_skips_identical_frame():
+    tracker = GeofenceTracker(FenceIndex(FENCES))
+    pos = _positions(("T1", -6.205, 106.805))
+    assert len(tracker.update(pos)) == 2
+    assert tracker.update(pos).empty
+    assert tracker.update(pos.copy()).empty                # frame baru, posisi sama → tanpa event
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from components import maps
+
+
+def _trucks():
+    return pd.DataFrame({"truck_id": ["TRK-01", "TRK-02"], "status": ["MOVING", "IDLE"],
+                         "lat": [-6.20, -6.21], "lon": [106.80, 106.81]})
+
+
+def _trails():
+    return pd.DataFrame({"truck_id": ["TRK-01", "TRK-01", "TRK-02"],
+                         "lat": [-6.19, -6.20, -6.21], "lon": [106.79, 106.80, 106.81]})
+
+
+def test_truck_layer_reused_for_equal_content():
+    maps._truck_layers.clear()
+    fg = maps._truck_layer(_trucks(), -6.2, 106.8)
+    assert maps._truck_layer(_trucks().copy(), -6.2, 106.8) is fg
+    assert len(maps._truck_layers) == 1
+
+
+def test_truck_layer_rebuilt_on_change():
+    maps._truck_layers.clear()
+    fg = maps._truck_layer(_trucks(), -6.2, 106.8)
+    assert maps._truck_layer(_trucks().assign(status=["IDLE", "IDLE"]), -6.2, 106.8) is not fg
+    assert maps._truck_layer(_trucks().assign(lat=[-6.20, -6.22]), -6.2, 106.8) is not fg
+    assert maps._truck_layer(_trucks(), -6.2, 106.8) is fg
+
+
+def test_truck_layer_keyed_on_trails():
+    maps._truck_layers.clear()
+    fg = maps._truck_layer(_trucks(), -6.2, 106.8, trails=_trails())
+    assert maps._truck_layer(_trucks(), -6.2, 106.8, trails=_trails().copy()) is fg
+    assert maps._truck_layer(_trucks(), -6.2, 106.8, trails=_trails().assign(truck_id="TRK-02")) is not fg
+    assert maps._truck_layer(_trucks(), -6.2, 106.8) is not fg
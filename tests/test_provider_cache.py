@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from data import provider
+from data.provider import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.monotonic untuk TTLCache; clock["t"] dimajukan manual."""
+    state = {"t": 1000.0}
+    monkeypatch.setattr(provider.time, "monotonic", lambda: state["t"])
+    return state
+
+
+def test_get_or_create_builds_once():
+    cache = TTLCache(maxsize=4, ttl=60)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_create("k", lambda: calls.append(1) or "v") == "v"
+    assert len(calls) == 1
+
+
+def test_expired_entry_is_rebuilt_and_released(clock):
+    evicted = []
+    cache = TTLCache(maxsize=4, ttl=10, on_evict=evicted.append)
+    cache.get_or_create("k", lambda: "old")
+    clock["t"] += 11
+    assert cache.get("k") is None
+    assert evicted == ["old"]
+    assert "k" not in cache._key_locks
+    assert cache.get_or_create("k", lambda: "new") == "new"
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+    clock["t"] += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_lru_eviction_drops_least_recently_used():
+    evicted = []
+    cache = TTLCache(maxsize=2, ttl=60, on_evict=evicted.append)
+    cache.get_or_create("a", lambda: "A")
+    cache.get_or_create("b", lambda: "B")
+    cache.get("a")                                   # a jadi most recently used
+    cache.get_or_create("c", lambda: "C")
+    assert evicted == ["B"]
+    assert cache.get("b") is None and cache.get("a") == "A" and cache.get("c") == "C"
+    assert sorted(cache._key_locks) == ["a", "c"]
+
+
+def test_invalidate_by_predicate():
+    evicted = []
+    cache = TTLCache(maxsize=8, ttl=60, on_evict=evicted.append)
+    for key in (("x", 1), ("x", 2), ("y", 1)):
+        cache.get_or_create(key, lambda key=key: key)
+    assert cache.invalidate(lambda k: k[0] == "x") == 2
+    assert len(cache) == 1 and sorted(evicted) == [("x", 1), ("x", 2)]
+    assert list(cache._key_locks) == [("y", 1)]
+    assert cache.invalidate() == 1 and not cache._key_locks
+
+
+def test_concurrent_get_or_create_builds_once():
+    cache = TTLCache(maxsize=4, ttl=60)
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_create("k", build))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len({id(r) for r in results}) == 1
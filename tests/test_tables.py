@@ -0,0 +1,24 @@
+import pandas as pd
+
+from components.tables import frame_fingerprint
+
+
+def _frame():
+    return pd.DataFrame({"asset_id": ["A1", "A2", "A3"], "status": ["LOST", "ON-RENT", "AVAILABLE"], "n": [1, 2, 3]})
+
+
+def test_fingerprint_equal_for_equal_content():
+    assert frame_fingerprint(_frame()) == frame_fingerprint(_frame().copy())
+
+
+def test_fingerprint_sensitive_to_row_order():
+    df = _frame()
+    assert frame_fingerprint(df) != frame_fingerprint(df.iloc[::-1])
+    assert frame_fingerprint(df) != frame_fingerprint(df.sort_values("status"))
+
+
+def test_fingerprint_sensitive_to_values_and_columns():
+    df = _frame()
+    assert frame_fingerprint(df) != frame_fingerprint(df.assign(n=[1, 2, 4]))
+    assert frame_fingerprint(df) != frame_fingerprint(df.rename(columns={"n": "m"}))
+    assert frame_fingerprint(df.iloc[:0]) != frame_fingerprint(df.iloc[:0, :2])
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data import timeseries
+from data.timeseries import FuelHistory, SeriesStore, lttb
+
+START = pd.Timestamp("2025-01-01")
+
+
+def _readings(days=3, freq="7min", entities=("A", "B"), seed=0):
+    rng = np.random.default_rng(seed)
+    t = pd.date_range(START, START + pd.Timedelta(days=days), freq=freq, inclusive="left")
+    return pd.DataFrame({"entity": np.repeat(entities, len(t)), "time": np.tile(t, len(entities)),
+                         "value": rng.uniform(0, 100, len(t) * len(entities))})
+
+
+def _expected(df, width):
+    g = df.assign(time=df["time"].dt.floor(width)).groupby(["entity", "time"])["value"]
+    return pd.DataFrame({"mean": g.mean(), "min": g.min(), "max": g.max(), "last": g.last()}).reset_index()
+
+
+def _store():
+    return SeriesStore(retention={r: pd.Timedelta("10000D") for r in timeseries.RETENTION})
+
+
+@pytest.mark.parametrize("res", list(timeseries.RESOLUTIONS))
+def test_rollup_matches_groupby_across_batches(res):
+    df = _readings()
+    store = _store()
+    # batch berurutan waktu, dipotong di tengah bucket → bucket yang sama tersebar di beberapa chunk
+    df = df.sort_values("time", kind="stable")
+    for pos in np.array_split(np.arange(len(df)), 9):
+        part = df.iloc[pos]
+        store.append(part["entity"], part["time"], part["value"])
+    got = store.window(START, START + pd.Timedelta(days=3), resolution=res)
+    exp = _expected(df, timeseries.RESOLUTIONS[res])
+    assert got[["entity", "time"]].values.tolist() == exp[["entity", "time"]].values.tolist()
+    for col in ("mean", "min", "max", "last"):
+        np.testing.assert_allclose(got[col].to_numpy(dtype=float), exp[col].to_numpy(), err_msg=col)
+
+
+def test_rollup_survives_compaction(monkeypatch):
+    monkeypatch.setattr(timeseries, "_RAW_CHUNKS_MAX", 4)
+    df = _readings(days=1)
+    store = _store()
+    df = df.sort_values("time", kind="stable")
+    for pos in np.array_split(np.arange(len(df)), 30):
+        part = df.iloc[pos]
+        store.append(part["entity"], part["time"], part["value"])
+    assert all(len(chunks) <= 5 for chunks in store._rollups.values())
+    got = store.window(START, START + pd.Timedelta(days=1), resolution="1h")
+    exp = _expected(df, pd.Timedelta("1h"))
+    np.testing.assert_allclose(got["mean"].to_numpy(dtype=float), exp["mean"].to_numpy())
+    assert store.stats()["1h"] == len(exp)
+
+
+def test_series_downsamples_but_keeps_envelope():
+    df = _readings(days=3, freq="1min", entities=("A",))
+    df.loc[1234, "value"] = 1000.0                              # spike tunggal
+    store = _store()
+    store.append(df["entity"], df["time"], df["value"])
+    out = store.series("A", START, START + pd.Timedelta(days=3), resolution="5min", max_points=100)
+    assert len(out) == 100
+    assert out.attrs["resolution"] == "5min"
+    assert out["max"].max() == 1000.0
+    assert out["min"].min() == pytest.approx(df["value"].min())
+
+
+def test_retention_drops_old_buckets():
+    store = SeriesStore(retention={"raw": pd.Timedelta("1h"), "5min": pd.Timedelta("1D")})
+    df = _readings(days=3)
+    store.append(df["entity"], df["time"], df["value"])
+    dropped = store.enforce_retention(now=START + pd.Timedelta(days=3))
+    assert dropped["5min"] > 0 and dropped.get("1D", 0) == 0
+    assert store.window(START, START + pd.Timedelta(days=2), resolution="5min").empty
+    assert not store.window(START, START + pd.Timedelta(days=3), resolution="1D").empty
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 50)
+    y[500] = 10
+    idx = lttb(x, y, 50)
+    assert len(idx) == 50 and idx[0] == 0 and idx[-1] == 999
+    assert 500 in idx
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_append_new_skips_seen_readings():
+    history = FuelHistory()
+    pings = pd.DataFrame({"truck_id": ["T1", "T1", "T2"], "ts": [1e9, 1e9 + 60, 1e9], "fuel_liters": [10, 9, 50.0]})
+    assert history.append_new("truck", pings, "truck_id", "fuel_liters") == 3
+    assert history.append_new("truck", pings, "truck_id", "fuel_liters") == 0
+    more = pd.concat([pings, pings.assign(ts=pings["ts"] + 120)])
+    assert history.append_new("truck", more, "truck_id", "fuel_liters") == 3
+    assert history["truck"].stats()["raw"] == 6
@@ -0,0 +1,205 @@
+import contextlib
+import copy
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as st_components
+
+import components.maps as maps_mod
+
+log = logging.getLogger("allanray.profiling")
+
+# ─────────────────────────────────────────────────────────────
+# Payload sizing — byte yang akan dikirim ke browser per call
+# ─────────────────────────────────────────────────────────────
+def _size_plotly(fig, *a, **k):
+    return len(fig.to_json()) if hasattr(fig, "to_json") else len(json.dumps(fig, default=str))
+
+
+def _size_text(body="", *a, **k):
+    return len(str(body).encode())
+
+
+def _size_dataframe(df=None, *a, **k):
+    from streamlit.dataframe_util import convert_anything_to_arrow_bytes
+    return len(convert_anything_to_arrow_bytes(df)) if df is not None else 0
+
+
+def _size_pydeck(deck, *a, **k):
+    return len(deck.to_json())
+
+
+def _size_folium(fig, *a, feature_group_to_add=None, **k):
+    # render folium menambah script ke figure → ukur salinan, bukan map yang akan dikirim
+    m = copy.deepcopy(fig)
+    groups = feature_group_to_add or []
+    for fg in groups if isinstance(groups, (list, tuple)) else [groups]:
+        copy.deepcopy(fg).add_to(m)
+    return len(m.get_root().render().encode())
+
+
+def _size_download(label="", data=b"", *a, **k):
+    data = k.get("data", data)
+    if hasattr(data, "getvalue"):
+        return len(data.getvalue())
+    return len(data) if isinstance(data, (bytes, str)) else 0
+
+
+_TARGETS = [
+    (st, "plotly_chart", _size_plotly),
+    (st, "markdown", _size_text),
+    (st, "caption", _size_text),
+    (st, "subheader", _size_text),
+    (st, "dataframe", _size_dataframe),
+    (st, "pydeck_chart", _size_pydeck),
+    (st, "download_button", _size_download),
+    (st_components, "html", _size_text),
+    (maps_mod, "st_folium", _size_folium),
+]
+
+_active = threading.local()       # meter aktif per script thread (per session)
+_install_lock = threading.Lock()
+_installed = [False]
+
+
+def _install():
+    """Wrap Streamlit entry points once per process; no-op kalau tidak ada meter aktif."""
+    with _install_lock:
+        if _installed[0]:
+            return
+        for mod, attr, sizer in _TARGETS:
+            fn = getattr(mod, attr)
+
+            def wrapper(*args, _fn=fn, _sizer=sizer, _name=attr, **kwargs):
+                meter = getattr(_active, "meter", None)
+                if meter is None:
+                    return _fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    n = _sizer(*args, **kwargs)
+                except Exception:
+                    n = 0
+                meter.sizer_s += time.perf_counter() - t0       # dikurangkan dari timing section
+                meter.bytes += n
+                meter.calls[_name] = meter.calls.get(_name, 0) + 1
+                return _fn(*args, **kwargs) if meter.passthrough else None
+
+            setattr(mod, attr, wrapper)
+        _installed[0] = True
+
+
+class PayloadMeter:
+    """Accumulates bytes per Streamlit call on the current thread while active.
+
+    passthrough=False → call asli di-skip (headless benchmark, tanpa runtime).
+    sizer_s = waktu yang dipakai mengukur byte (serialize figure, render folium) — bukan waktu panel.
+    """
+
+    def __init__(self, passthrough: bool = True):
+        self.passthrough = passthrough
+        self.bytes = 0
+        self.calls = {}
+        self.sizer_s = 0.0
+
+    def reset(self):
+        self.bytes = 0
+        self.calls = {}
+        self.sizer_s = 0.0
+
+    @contextlib.contextmanager
+    def patch(self):
+        _install()
+        prev = getattr(_active, "meter", None)
+        _active.meter = self
+        try:
+            yield self
+        finally:
+            _active.meter = prev
+
+
+# ─────────────────────────────────────────────────────────────
+# Render profiler — timer + byte counter per panel
+# ─────────────────────────────────────────────────────────────
+def profiling_default() -> bool:
+    return os.environ.get("ALLANRAY_PROFILE", "").lower() in ("1", "true", "yes")
+
+
+def _enable_logging():
+    """INFO + handler sendiri (stderr, satu JSON per baris) — tanpa ini level efektif WARNING."""
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+        log.propagate = False
+    log.setLevel(logging.INFO)
+
+
+class RenderProfiler:
+    """Opt-in per-section timing; disabled → section() is a bare passthrough."""
+
+    def __init__(self, enabled: bool = False, session: str | None = None):
+        self.enabled = enabled
+        self.session = session
+        self.records = []
+        self.meter = PayloadMeter(passthrough=True)
+        self._t0 = time.perf_counter()
+        self._patch = None
+
+    def start(self):
+        if self.enabled:
+            _enable_logging()
+            self._patch = self.meter.patch()
+            self._patch.__enter__()
+        return self
+
+    def stop(self):
+        if self._patch is not None:
+            self._patch.__exit__(None, None, None)
+            self._patch = None
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        b0, c0, s0 = self.meter.bytes, sum(self.meter.calls.values()), self.meter.sizer_s
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            sizer_s = self.meter.sizer_s - s0
+            rec = {
+                "section": name,
+                "ms": round((time.perf_counter() - t0 - sizer_s) * 1000, 2),
+                "sizer_ms": round(sizer_s * 1000, 2),
+                "bytes": self.meter.bytes - b0,
+                "st_calls": sum(self.meter.calls.values()) - c0,
+            }
+            self.records.append(rec)
+            log.info(json.dumps({"event": "render_section", "session": self.session, **rec}))
+
+    def summary(self) -> dict:
+        return {
+            "total_ms": round((time.perf_counter() - self._t0 - self.meter.sizer_s) * 1000, 2),
+            "sections_ms": round(sum(r["ms"] for r in self.records), 2),
+            "bytes": sum(r["bytes"] for r in self.records),
+            "sizer_ms": round(self.meter.sizer_s * 1000, 2),
+        }
+
+    def render_sidebar(self):
+        """Collapsible debug panel (panggil di akhir script supaya semua section tercatat)."""
+        if not self.enabled:
+            return
+        self.stop()
+        s = self.summary()
+        log.info(json.dumps({"event": "render_rerun", "session": self.session, **s}))
+        with st.sidebar.expander("⏱ Render profiling", expanded=False):
+            st.caption(f"Rerun {s['total_ms']:.0f} ms · sections {s['sections_ms']:.0f} ms · "
+                       f"{s['bytes'] / 1024:.1f} KB ke browser · ukur byte {s['sizer_ms']:.0f} ms (tidak dihitung)")
+            df = pd.DataFrame(self.records, columns=["section", "ms", "bytes", "st_calls", "sizer_ms"])
+            st.dataframe(df.sort_values("ms", ascending=False), hide_index=True)